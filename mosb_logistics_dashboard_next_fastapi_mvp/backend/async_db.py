@@ -0,0 +1,73 @@
+import asyncio
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from db import Database
+
+T = TypeVar("T")
+
+
+class AsyncDatabase:
+    """
+    KR: `Database` 호출을 전용 스레드 풀에서 실행하는 비동기 래퍼입니다.
+    EN: Async facade over `Database`. Every call runs on a dedicated, bounded executor
+    so DuckDB work never blocks the event loop.
+
+    `max_workers` caps concurrent DB calls (defaults to the cursor pool size) and
+    `max_pending` caps calls queued or running; further callers wait on the loop
+    instead of piling up in the executor queue.
+
+        adb = AsyncDatabase(db)
+        locations = await adb.get_locations()
+        await adb.run(some_sync_function, arg)
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ):
+        self.db = db
+        self.max_workers = max(1, max_workers or db.pool_size)
+        self.max_pending = max(self.max_workers, max_pending or self.max_workers * 8)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="duckdb",
+        )
+        # asyncio primitives are bound to one loop; keep one semaphore per running loop.
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _slots_for(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.max_pending)
+        return slots
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """KR: 동기 함수를 DB 실행기에서 실행합니다. EN: Run `func` on the DB executor."""
+        loop = asyncio.get_running_loop()
+        async with self._slots_for(loop):
+            return await loop.run_in_executor(
+                self._executor,
+                functools.partial(func, *args, **kwargs),
+            )
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.db, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self.run(attr, *args, **kwargs)
+
+        return call
+
+    def close(self, wait: bool = True) -> None:
+        """KR: 실행기를 종료합니다. EN: Shut down the executor (the `Database` stays open)."""
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,84 @@
+"""
+KR: `/api/events` 캐시 적중 경로의 지연 시간을 비교합니다(모델 목록 vs 인코딩된 바이트).
+EN: Compare `/api/events` cache-hit latency: cached model lists vs. pre-encoded bytes.
+
+"models" caches the list of `Event` models, so every hit is re-validated against
+`response_model` and re-serialized by FastAPI. "bytes" caches a `CachedJson` and
+returns it as a raw `Response`, so a hit does no per-row work.
+
+Usage:
+    python benchmarks/bench_cache_hit.py --events 50000 --repeat 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_events_json import seed_events  # noqa: E402
+from cache import CachedJson, CacheManager  # noqa: E402
+from db import Database  # noqa: E402
+from models import Event  # noqa: E402
+
+
+def build_app(db: Database) -> FastAPI:
+    app = FastAPI()
+    cache = CacheManager()
+
+    @app.get("/models", response_model=list[Event])
+    def models_hit():
+        cached = cache.get("events", "models")
+        if cached is None:
+            cached = db.get_events()
+            cache.set("events", "models", cached)
+        return cached
+
+    @app.get("/bytes", response_model=list[Event])
+    def bytes_hit():
+        cached = cache.get("events", "bytes")
+        if cached is None:
+            cached = CachedJson.from_bytes(db.get_events_json())
+            cache.set("events", "bytes", cached)
+        return Response(
+            content=cached.body,
+            media_type="application/json",
+            headers={"ETag": f'"{cached.etag}"'},
+        )
+
+    return app
+
+
+def best_ms(client: TestClient, path: str, repeat: int) -> tuple[float, int]:
+    size = len(client.get(path).content)  # warm the cache
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    db = Database(":memory:", load_csv=False)
+    seed_events(db, args.events)
+    client = TestClient(build_app(db))
+    print(f"events={args.events}")
+    print(f"{'cache hit path':<28} {'best ms':>10} {'bytes':>10}")
+    for label, path in (("models + response_model", "/models"), ("pre-encoded bytes", "/bytes")):
+        ms, size = best_ms(client, path, args.repeat)
+        print(f"{label:<28} {ms:>10.1f} {size:>10}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+KR: 워커 스레드 수에 따른 DB 읽기 처리량을 측정합니다.
+EN: Measure DB read throughput as the number of worker threads grows.
+
+Usage:
+    python benchmarks/bench_db_concurrency.py --events 200000 --seconds 3
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db import Database  # noqa: E402
+
+
+def seed_events(db: Database, count: int) -> None:
+    db.conn.execute(
+        """
+        INSERT INTO events (event_id, ts, shpt_no, status, location_id, lat, lon, remark)
+        SELECT
+            'EV-' || i,
+            strftime(TIMESTAMP '2026-01-01' + to_seconds(i), '%Y-%m-%dT%H:%M:%S'),
+            'SHPT-' || (i % 500),
+            'IN_TRANSIT',
+            'LOC-' || (i % 20),
+            24.0,
+            54.0,
+            ''
+        FROM range(?) t(i)
+        """,
+        [count],
+    )
+
+
+def run_readers(db: Database, workers: int, seconds: float) -> int:
+    stop = time.perf_counter() + seconds
+    counts = [0] * workers
+
+    def reader(slot: int) -> None:
+        while time.perf_counter() < stop:
+            db.get_location_metrics()
+            counts[slot] += 1
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"events={args.events} seconds={args.seconds}")
+    print(f"{'workers':>8} {'shared conn q/s':>16} {'cursor pool q/s':>16}")
+    for workers in args.workers:
+        results = []
+        # pool_size=1 reproduces the old single shared connection behaviour.
+        for pool_size in (1, workers):
+            db = Database(":memory:", load_csv=False, pool_size=pool_size)
+            seed_events(db, args.events)
+            total = run_readers(db, workers, args.seconds)
+            results.append(total / args.seconds)
+            db.close()
+        print(f"{workers:>8} {results[0]:>16.1f} {results[1]:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+KR: 이벤트 단건 커밋과 그룹 커밋(EventWriter)의 처리량을 비교합니다.
+EN: Compare event append throughput: one transaction per event vs. group commit.
+
+Usage:
+    python benchmarks/bench_event_writer.py --events 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db import Database  # noqa: E402
+from models import Event  # noqa: E402
+from writer import EventWriter  # noqa: E402
+
+
+def make_events(prefix: str, count: int) -> list[Event]:
+    return [
+        Event(
+            event_id=f"{prefix}-{i}",
+            ts="2026-01-08T09:00:00Z",
+            shpt_no=f"SHPT-{i % 500}",
+            status="IN_TRANSIT",
+            location_id=f"LOC-{i % 20}",
+            lat=24.0,
+            lon=54.0,
+            remark="",
+        )
+        for i in range(count)
+    ]
+
+
+async def run_clients(submit, events: list[Event], concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def client(event: Event) -> None:
+        async with semaphore:
+            await submit(event)
+
+    await asyncio.gather(*(client(event) for event in events))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    db = Database(":memory:", load_csv=False)
+
+    async def per_event(event: Event) -> None:
+        await asyncio.to_thread(db.append_events, [event])
+
+    commits = []
+
+    def commit(events: list[Event]) -> None:
+        commits.append(len(events))
+        db.append_events(events)
+
+    writer = EventWriter(commit, max_batch=args.batch_size, max_delay=args.window_ms / 1000)
+
+    async def grouped() -> None:
+        await run_clients(writer.submit, make_events("EV-G", args.events), args.concurrency)
+        await writer.close()
+
+    start = time.perf_counter()
+    asyncio.run(run_clients(per_event, make_events("EV-S", args.events), args.concurrency))
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    asyncio.run(grouped())
+    grouped_s = time.perf_counter() - start
+
+    print(f"events={args.events} concurrency={args.concurrency}")
+    print(f"{'path':<22} {'seconds':>10} {'events/s':>10} {'commits':>8}")
+    for path, seconds, commit_count in (
+        ("per-event commit", single_s, args.events),
+        ("group commit", grouped_s, len(commits)),
+    ):
+        print(f"{path:<22} {seconds:>10.2f} {args.events / seconds:>10.0f} {commit_count:>8}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
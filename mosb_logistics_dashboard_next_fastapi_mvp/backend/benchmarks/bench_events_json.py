@@ -0,0 +1,79 @@
+"""
+KR: `/api/events` 직렬화 경로(모델 생성 vs DuckDB JSON)의 지연 시간을 비교합니다.
+EN: Compare `/api/events` serialization latency: per-row models vs. DuckDB-side JSON.
+
+Usage:
+    python benchmarks/bench_events_json.py --events 100000 --repeat 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db import Database, epoch_us_sql  # noqa: E402
+from models import Event  # noqa: E402
+
+
+def seed_events(db: Database, count: int) -> None:
+    db.conn.execute(
+        f"""
+        INSERT INTO events BY NAME
+        SELECT *, {epoch_us_sql("ts")} AS ts_epoch_us
+        FROM (
+            SELECT
+                'EV-' || i AS event_id,
+                strftime(TIMESTAMP '2026-01-01' + to_seconds(i), '%Y-%m-%dT%H:%M:%S')
+                    || '+00:00' AS ts,
+                'SHPT-' || (i % 500) AS shpt_no,
+                'IN_TRANSIT' AS status,
+                'LOC-' || (i % 20) AS location_id,
+                24.328853 AS lat,
+                54.45857 AS lon,
+                'GPS ping' AS remark
+            FROM range(?) t(i)
+        )
+        """,
+        [count],
+    )
+
+
+def best_of(fn, repeat: int) -> tuple[float, int]:
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(fn())
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db = Database(":memory:", load_csv=False)
+    seed_events(db, args.events)
+    adapter = TypeAdapter(list[Event])
+
+    def model_path() -> bytes:
+        # What FastAPI did before: build models, re-validate via response_model, dump JSON.
+        return adapter.dump_json(adapter.validate_python(db.get_events()))
+
+    model_ms, model_bytes = best_of(model_path, args.repeat)
+    json_ms, json_bytes = best_of(db.get_events_json, args.repeat)
+    print(f"events={args.events}")
+    print(f"{'path':<28} {'best ms':>10} {'bytes':>10}")
+    print(f"{'models + response_model':<28} {model_ms:>10.1f} {model_bytes:>10}")
+    print(f"{'DuckDB to_json bytes':<28} {json_ms:>10.1f} {json_bytes:>10}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+KR: VARCHAR `ts` 문자열 비교와 정규화된 `ts_epoch_us` 조건의 `since` 필터 성능을 비교합니다.
+EN: Compare `since` filtering on the VARCHAR `ts` column against the typed `ts_epoch_us` column.
+
+Usage:
+    python benchmarks/bench_events_since.py --events 5000000 --repeat 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db import Database, epoch_us_sql, to_epoch_us  # noqa: E402
+
+
+def seed_events(db: Database, count: int) -> None:
+    # Events arrive roughly in time order, one per second, alternating naive and +00:00 strings.
+    db.conn.execute(
+        f"""
+        INSERT INTO events BY NAME
+        SELECT *, {epoch_us_sql("ts")} AS ts_epoch_us
+        FROM (
+            SELECT
+                'EV-' || i AS event_id,
+                strftime(TIMESTAMP '2026-01-01' + to_seconds(i), '%Y-%m-%dT%H:%M:%S')
+                    || CASE WHEN i % 2 = 0 THEN '+00:00' ELSE '' END AS ts,
+                'SHPT-' || (i % 500) AS shpt_no,
+                'IN_TRANSIT' AS status,
+                'LOC-' || (i % 20) AS location_id,
+                24.0 AS lat,
+                54.0 AS lon,
+                '' AS remark
+            FROM range(?) t(i)
+        )
+        """,
+        [count],
+    )
+
+
+def best_of(db: Database, query: str, params: list, repeat: int) -> tuple[float, int]:
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = db.conn.execute(query, params).fetchone()[0]
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--since", default="2026-01-31T00:00:00Z")
+    args = parser.parse_args()
+
+    db = Database(":memory:", load_csv=False)
+    start = time.perf_counter()
+    seed_events(db, args.events)
+    print(f"seeded {args.events} events in {time.perf_counter() - start:.1f}s")
+
+    varchar_ms, varchar_rows = best_of(
+        db,
+        "SELECT COUNT(*) FROM events WHERE ts >= ?",
+        [args.since],
+        args.repeat,
+    )
+    epoch_ms, epoch_rows = best_of(
+        db,
+        "SELECT COUNT(*) FROM events WHERE ts_epoch_us >= ?",
+        [to_epoch_us(args.since)],
+        args.repeat,
+    )
+    print(f"{'predicate':<24} {'best ms':>10} {'rows':>10}")
+    print(f"{'ts >= ? (VARCHAR)':<24} {varchar_ms:>10.2f} {varchar_rows:>10}")
+    print(f"{'ts_epoch_us >= ?':<24} {epoch_ms:>10.2f} {epoch_rows:>10}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+KR: 테이블 크기가 커질 때 운송/위치별 이벤트 조회 지연 시간이 일정한지 측정합니다.
+EN: Measure per-shipment and per-location event lookup latency as the events table grows.
+
+Each shipment has ~20 events and each location ~200, whatever the table size, so a
+flat latency column means the lookup is served by the index rather than a scan.
+
+Usage:
+    python benchmarks/bench_point_lookups.py --events 100000 1000000 4000000 --repeat 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db import Database, epoch_us_sql  # noqa: E402
+
+EVENTS_PER_SHIPMENT = 20
+EVENTS_PER_LOCATION = 200
+
+
+def seed(db: Database, count: int) -> None:
+    shipments = max(1, count // EVENTS_PER_SHIPMENT)
+    locations = max(1, count // EVENTS_PER_LOCATION)
+    db.conn.execute(
+        f"""
+        INSERT INTO events BY NAME
+        SELECT *, {epoch_us_sql("ts")} AS ts_epoch_us
+        FROM (
+            SELECT
+                'EV-' || i AS event_id,
+                strftime(TIMESTAMP '2026-01-01' + to_seconds(i), '%Y-%m-%dT%H:%M:%S')
+                    || '+00:00' AS ts,
+                'SHPT-' || (i % ?) AS shpt_no,
+                'IN_TRANSIT' AS status,
+                'LOC-' || (i % ?) AS location_id,
+                24.0 AS lat,
+                54.0 AS lon,
+                '' AS remark
+            FROM range(?) t(i)
+        )
+        """,
+        [shipments, locations, count],
+    )
+    db.conn.execute(
+        """
+        INSERT INTO legs (leg_id, shpt_no, from_location_id, to_location_id, mode,
+                          planned_etd, planned_eta)
+        SELECT 'LEG-' || i, 'SHPT-' || (i // 2), 'LOC-0', 'LOC-1', 'SEA',
+               '2026-01-01T00:00:00Z', '2026-01-02T00:00:00Z'
+        FROM range(?) t(i)
+        """,
+        [shipments * 2],
+    )
+
+
+def best_ms(fn, repeat: int) -> float:
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, nargs="+", default=[100_000, 1_000_000, 4_000_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'events':>10} {'shipment events ms':>19} {'location events ms':>19} "
+        f"{'shipment legs ms':>17}"
+    )
+    for count in args.events:
+        db = Database(":memory:", load_csv=False)
+        seed(db, count)
+        shipments = max(1, count // EVENTS_PER_SHIPMENT)
+        locations = max(1, count // EVENTS_PER_LOCATION)
+        shipment_ms = best_ms(
+            lambda i: db.get_shipment_events_json(f"SHPT-{(i * 7919) % shipments}"),
+            args.repeat,
+        )
+        location_ms = best_ms(
+            lambda i: db.get_location_events_json(f"LOC-{(i * 7919) % locations}", limit=50),
+            args.repeat,
+        )
+        legs_ms = best_ms(
+            lambda i: db.get_shipment_legs(f"SHPT-{(i * 7919) % shipments}"),
+            args.repeat,
+        )
+        print(f"{count:>10} {shipment_ms:>19.2f} {location_ms:>19.2f} {legs_ms:>17.2f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,128 +1,770 @@
+import asyncio
 import hashlib
 import inspect
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import wraps
-from typing import List, Optional, TypeVar
-
-from cachetools import TTLCache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    NamedTuple,
+    Optional,
+    ParamSpec,
+    Tuple,
+    TypeVar,
+)
+
+import orjson
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from cache_backend import CacheBackend
 
 T = TypeVar("T")
+P = ParamSpec("P")
 
+logger = logging.getLogger(__name__)
 
-class CacheManager:
-    def __init__(self):
-        self.locations_cache = TTLCache(maxsize=100, ttl=300)
-        self.shipments_cache = TTLCache(maxsize=100, ttl=300)
-        self.legs_cache = TTLCache(maxsize=100, ttl=300)
-        self.events_cache = TTLCache(maxsize=500, ttl=60)
-        # Cache for location status with shorter TTL (30s) due to frequent changes.
-        self.location_status_cache = TTLCache(maxsize=100, ttl=30)
-        # Cache for location metrics (events/status) with shorter TTL (30s).
-        self.location_metrics_cache = TTLCache(maxsize=100, ttl=30)
+# Reference data served stale-while-revalidate between the soft and the hard TTL.
+REFERENCE_NAMESPACES = ("locations", "legs", "shipments")
 
-    def get_cached_locations(self, key: str = "all") -> Optional[List]:
-        return self.locations_cache.get(key)
+MIB = 1024 * 1024
 
-    def set_cached_locations(self, key: str, value: List) -> None:
-        self.locations_cache[key] = value
+# "lru" evicts the least recently used entry, "fifo" the least recently written one.
+EVICTION_POLICIES = ("lru", "fifo")
 
-    def get_cached_shipments(self, key: str = "all") -> Optional[List]:
-        return self.shipments_cache.get(key)
 
-    def set_cached_shipments(self, key: str, value: List) -> None:
-        self.shipments_cache[key] = value
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
 
-    def get_cached_legs(self, key: str = "all") -> Optional[List]:
-        return self.legs_cache.get(key)
 
-    def set_cached_legs(self, key: str, value: List) -> None:
-        self.legs_cache[key] = value
+def encode_json(value: Any) -> bytes:
+    """
+    KR: 값(모델 목록 포함)을 JSON 바이트로 인코딩합니다.
+    EN: Encode `value` (models included) to JSON bytes.
+    """
+    return orjson.dumps(value, default=_encode_default)
 
-    def get_cached_events(self, key: str) -> Optional[List]:
-        return self.events_cache.get(key)
 
-    def set_cached_events(self, key: str, value: List) -> None:
-        self.events_cache[key] = value
+class CachedJson(NamedTuple):
+    """
+    KR: 최종 인코딩된 JSON 바이트와 내용 해시입니다. 캐시 적중 시 행 단위 작업이 없습니다.
+    EN: Final encoded JSON body plus its content hash. Cache hits send `body` as-is,
+    with no per-row validation or serialization.
+    """
 
-    def get_cached_location_status(self, key: str = "all") -> Optional[List]:
-        return self.location_status_cache.get(key)
+    body: bytes
+    etag: str
 
-    def set_cached_location_status(self, key: str, value: List) -> None:
-        self.location_status_cache[key] = value
+    @classmethod
+    def from_bytes(cls, body: bytes) -> "CachedJson":
+        """KR: 이미 인코딩된 JSON을 감쌉니다. EN: Wrap already-encoded JSON (e.g. from DuckDB)."""
+        return cls(body, hashlib.blake2b(body, digest_size=16).hexdigest())
 
-    def invalidate_locations(self) -> None:
-        self.locations_cache.clear()
+    @classmethod
+    def encode(cls, value: Any) -> "CachedJson":
+        """KR: 값을 인코딩해 감쌉니다. EN: Encode `value` with `encode_json` and wrap it."""
+        return cls.from_bytes(encode_json(value))
 
-    def invalidate_shipments(self) -> None:
-        self.shipments_cache.clear()
 
-    def invalidate_legs(self) -> None:
-        self.legs_cache.clear()
+def sizeof(value: Any) -> int:
+    """KR: 캐시 값의 바이트 크기를 추정합니다. EN: Estimate the size of a cached value in bytes."""
+    if isinstance(value, CachedJson):
+        return len(value.body) + len(value.etag)
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+    return sys.getsizeof(value)
 
-    def invalidate_events(self) -> None:
-        self.events_cache.clear()
 
-    def get_cached_location_status(self, key: str = "all") -> Optional[List]:
-        """Return cached location status list."""
-        return self.location_status_cache.get(key)
+class _Stripe:
+    __slots__ = (
+        "lock",
+        "entries",
+        "bytes",
+        "hits",
+        "misses",
+        "sets",
+        "evictions",
+        "expirations",
+        "rejected",
+    )
 
-    def set_cached_location_status(self, key: str, value: List) -> None:
-        """Cache location status list."""
-        self.location_status_cache[key] = value
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> (value, expires_at, size), next to evict first.
+        self.entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = self.sets = 0
+        self.evictions = self.expirations = self.rejected = 0
+
+
+class StripedTTLCache:
+    """
+    KR: 잠금 분할(lock striping) 방식의 스레드 안전 TTL/LRU 캐시입니다.
+    EN: Thread-safe TTL cache with lock striping, bounded by entry count and bytes and
+    evicting by `policy` ("lru" or "fifo").
+
+    Keys hash to one of `stripes` independent segments, each with its own lock, share
+    of `maxsize`, and statistics, so threadpool readers and event-loop invalidations
+    rarely contend. `max_bytes` bounds the whole cache: a put that overflows it evicts
+    from the fullest stripes, one stripe lock at a time. Supports the `TTLCache` subset
+    `CacheManager` uses (`get`, `[]`, `in`, `pop`, `clear`, `len`) plus an atomic `add`.
+    A value larger than `max_bytes` is not cached (counted as `rejected`).
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        max_bytes: Optional[int] = None,
+        stripes: int = 8,
+        timer: Callable[[], float] = time.monotonic,
+        policy: str = "lru",
+    ):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.timer = timer
+        self._stripes = [_Stripe() for _ in range(max(1, min(stripes, maxsize)))]
+        self._stripe_maxsize = max(1, -(-maxsize // len(self._stripes)))
+
+    def _stripe(self, key: Hashable) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def _live(self, stripe: _Stripe, key: Hashable, now: float) -> Optional[Tuple[Any, float, int]]:
+        item = stripe.entries.get(key)
+        if item is not None and item[1] <= now:
+            del stripe.entries[key]
+            stripe.bytes -= item[2]
+            stripe.expirations += 1
+            return None
+        return item
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            item = self._live(stripe, key, self.timer())
+            if item is None:
+                stripe.misses += 1
+                return default
+            if self.policy == "lru":
+                stripe.entries.move_to_end(key)
+            stripe.hits += 1
+            return item[0]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            return self._live(stripe, key, self.timer()) is not None
+
+    def _put(self, stripe: _Stripe, key: Hashable, value: Any, now: float) -> None:
+        size = sizeof(value)
+        old = stripe.entries.pop(key, None)
+        if old is not None:
+            stripe.bytes -= old[2]
+        if self.max_bytes is not None and size > self.max_bytes:
+            stripe.rejected += 1
+            return
+        stripe.entries[key] = (value, now + self.ttl, size)
+        stripe.bytes += size
+        stripe.sets += 1
+        if len(stripe.entries) <= self._stripe_maxsize:
+            return
+        self._purge_expired(stripe, now)
+        while len(stripe.entries) > self._stripe_maxsize:
+            _, (_, _, evicted) = stripe.entries.popitem(last=False)
+            stripe.bytes -= evicted
+            stripe.evictions += 1
+
+    @staticmethod
+    def _purge_expired(stripe: _Stripe, now: float) -> int:
+        expired = [k for k, item in stripe.entries.items() if item[1] <= now]
+        for key in expired:
+            stripe.bytes -= stripe.entries.pop(key)[2]
+        stripe.expirations += len(expired)
+        return len(expired)
+
+    def _over_budget(self) -> bool:
+        # Unlocked sum: at worst one extra or one missing eviction under contention.
+        return self.max_bytes is not None and sum(s.bytes for s in self._stripes) > self.max_bytes
+
+    def _shrink(self, keep: Hashable) -> None:
+        """
+        KR: 전체 바이트 한도를 넘으면 가장 큰 스트라이프부터 축출합니다.
+        EN: Evict until the whole cache fits `max_bytes`: expired entries first, then the
+        oldest entries of the fullest stripes. Called without any stripe lock held and
+        takes one at a time, so concurrent puts cannot deadlock; `keep` (the entry just
+        stored) is never evicted here.
+        """
+        now = self.timer()
+        while self._over_budget():
+            for stripe in sorted(self._stripes, key=lambda s: s.bytes, reverse=True):
+                with stripe.lock:
+                    if self._purge_expired(stripe, now):
+                        break
+                    victim = next((k for k in stripe.entries if k != keep), None)
+                    if victim is not None:
+                        stripe.bytes -= stripe.entries.pop(victim)[2]
+                        stripe.evictions += 1
+                        break
+            else:
+                return
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            self._put(stripe, key, value, self.timer())
+        self._shrink(key)
+
+    def add(self, key: Hashable, value: Any) -> bool:
+        """
+        KR: 키가 없을 때만 저장합니다.
+        EN: Store `value` only if `key` is absent; True if stored.
+        """
+        stripe = self._stripe(key)
+        with stripe.lock:
+            now = self.timer()
+            if self._live(stripe, key, now) is not None:
+                return False
+            self._put(stripe, key, value, now)
+        self._shrink(key)
+        return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            item = self._live(stripe, key, self.timer())
+            if item is None:
+                return default
+            del stripe.entries[key]
+            stripe.bytes -= item[2]
+            return item[0]
+
+    def clear(self) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.bytes = 0
+
+    def __len__(self) -> int:
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        KR: 적중/미스/저장/축출/만료/거부 횟수와 현재 항목 수, 바이트를 반환합니다.
+        EN: Return hit, miss, set, eviction, expiration and rejection counts plus the
+        current entry count and bytes, summed over stripes.
+        """
+        totals = dict.fromkeys(
+            ("hits", "misses", "sets", "evictions", "expirations", "rejected", "entries", "bytes"),
+            0,
+        )
+        for stripe in self._stripes:
+            with stripe.lock:
+                for name in ("hits", "misses", "sets", "evictions", "expirations", "rejected"):
+                    totals[name] += getattr(stripe, name)
+                totals["entries"] += len(stripe.entries)
+                totals["bytes"] += stripe.bytes
+        return totals
+
+
+class SingleFlight:
+    """
+    KR: 키별로 로더를 한 번만 실행하고 동시 호출자들이 결과를 공유합니다.
+    EN: Run at most one loader per key at a time; concurrent callers for the same key
+    wait for and share its result (or exception). Sync and async callers share flights.
+
+    `do` blocks, so call it from worker threads (e.g. FastAPI's threadpool), never from
+    the event loop thread; async code uses `do_async`.
+    """
 
-    def invalidate_location_status(self) -> None:
-        """Clear cached location status."""
-        self.location_status_cache.clear()
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = Future()
+            # Running futures cannot be cancelled by one waiter on behalf of the others.
+            call.set_running_or_notify_cancel()
+            return call, True
+
+    def _finish(self, key: Hashable, call: Future) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def do(self, key: Hashable, loader: Callable[[], T]) -> T:
+        """KR: 동기 로더를 단일 실행합니다. EN: Run or join the flight for `key`."""
+        call, leader = self._join(key)
+        if not leader:
+            return call.result()
+        try:
+            result = loader()
+        except BaseException as exc:
+            self._finish(key, call)
+            call.set_exception(exc)
+            raise
+        self._finish(key, call)
+        call.set_result(result)
+        return result
+
+    async def do_async(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        """KR: 비동기 로더를 단일 실행합니다. EN: Async `do`; `loader` returns an awaitable."""
+        call, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(call)
+        try:
+            result = await loader()
+        except BaseException as exc:
+            self._finish(key, call)
+            call.set_exception(exc)
+            raise
+        self._finish(key, call)
+        call.set_result(result)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+class NamespaceConfig(NamedTuple):
+    """
+    KR: 캐시 네임스페이스 하나의 TTL, 크기 한도, 축출 정책입니다.
+    EN: TTL, bounds and eviction policy of one `CacheManager` namespace. With
+    `soft_ttl`, `get_or_load` serves entries older than it stale while one background
+    reload replaces them (stale-while-revalidate) until `ttl` expires them.
+    """
+
+    ttl: float
+    maxsize: int = 100
+    max_bytes: Optional[int] = 16 * MIB
+    policy: str = "lru"
+    soft_ttl: Optional[float] = None
+    # Table names whose committed writes clear the namespace (see `invalidate_tags`).
+    tags: Tuple[str, ...] = ()
+
+
+def default_namespaces(
+    reference_soft_ttl: float = 300,
+    reference_hard_ttl: float = 3600,
+) -> Dict[str, NamespaceConfig]:
+    """KR: 기본 네임스페이스 설정입니다. EN: Default namespace configuration of the API cache."""
+    hard_ttl = max(reference_soft_ttl, reference_hard_ttl)
+    namespaces = {
+        namespace: NamespaceConfig(ttl=hard_ttl, soft_ttl=reference_soft_ttl, tags=(namespace,))
+        for namespace in REFERENCE_NAMESPACES
+    }
+    namespaces["events"] = NamespaceConfig(
+        ttl=60, maxsize=500, max_bytes=128 * MIB, tags=("events",)
+    )
+    # Location status and metrics change often, so they expire after 30s.
+    namespaces["location_status"] = NamespaceConfig(ttl=30, tags=("location_status",))
+    namespaces["location_metrics"] = NamespaceConfig(ttl=30, tags=("events", "location_status"))
+    return namespaces
+
+
+class _LoadStats:
+    __slots__ = ("loads", "errors", "total", "max")
 
-    def get_cached_location_metrics(self, key: str = "all") -> Optional[List]:
-        """KR: 위치 지표 캐시를 반환합니다. EN: Return cached location metrics."""
-        return self.location_metrics_cache.get(key)
+    def __init__(self):
+        self.loads = self.errors = 0
+        self.total = self.max = 0.0
 
-    def set_cached_location_metrics(self, key: str, value: List) -> None:
-        """KR: 위치 지표 캐시를 저장합니다. EN: Cache location metrics."""
-        self.location_metrics_cache[key] = value
 
-    def invalidate_location_metrics(self) -> None:
-        """KR: 위치 지표 캐시를 비웁니다. EN: Clear cached location metrics."""
-        self.location_metrics_cache.clear()
+class CacheManager:
+    """
+    KR: 네임스페이스별 API 응답 캐시입니다(TTL/크기/정책 설정, 적중·로드 통계).
+    EN: Namespaced API response cache. Each namespace ("events", "legs", ...) is a
+    `StripedTTLCache` configured by a `NamespaceConfig`; `get_or_load` fills it once per
+    key and `stats` reports hits, misses, evictions, load time and bytes per namespace.
+
+    With a `backend` (see `cache_backend`), `invalidate` is broadcast so other worker
+    processes drop the namespace too; cached values themselves stay in each worker, which
+    loads them from its own database. `on_remote_invalidation` listeners hear about the
+    other workers' invalidations.
+    """
+
+    def __init__(
+        self,
+        reference_soft_ttl: float = 300,
+        reference_hard_ttl: float = 3600,
+        namespaces: Optional[Dict[str, NamespaceConfig]] = None,
+        backend: Optional["CacheBackend"] = None,
+    ):
+        self._caches: Dict[str, StripedTTLCache] = {}
+        # Keys loaded within the soft TTL; a cached key missing here is stale.
+        self._fresh: Dict[str, StripedTTLCache] = {}
+        self._configs: Dict[str, NamespaceConfig] = {}
+        self._loads: Dict[str, _LoadStats] = {}
+        self._loads_lock = threading.Lock()
+        # tag -> namespaces cleared by `invalidate_tags(tag)`.
+        self._tags: Dict[str, set[str]] = {}
+        # Coalesces concurrent misses of one key (e.g. when a TTL expires under load).
+        self.flights = SingleFlight()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+        self._refresh_tasks: set[asyncio.Task] = set()
+        config = default_namespaces(reference_soft_ttl, reference_hard_ttl)
+        config.update(namespaces or {})
+        for namespace, namespace_config in config.items():
+            self.configure(namespace, namespace_config)
+        self._remote_listeners: list[Callable[[Tuple[str, ...]], None]] = []
+        self.backend = backend
+        if backend is not None:
+            backend.subscribe(self._on_remote_invalidation)
+
+    @property
+    def namespaces(self) -> Tuple[str, ...]:
+        return tuple(self._caches)
+
+    def configure(self, namespace: str, config: NamespaceConfig) -> None:
+        """
+        KR: 네임스페이스를 (재)설정합니다. 기존 항목은 버려집니다.
+        EN: Create or reconfigure `namespace`; its current entries and counters are dropped.
+        """
+        cache = StripedTTLCache(
+            maxsize=config.maxsize,
+            ttl=config.ttl,
+            max_bytes=config.max_bytes,
+            policy=config.policy,
+        )
+        self._configs[namespace] = config
+        self._caches[namespace] = cache
+        if config.soft_ttl is not None and config.soft_ttl < config.ttl:
+            self._fresh[namespace] = StripedTTLCache(maxsize=config.maxsize, ttl=config.soft_ttl)
+        else:
+            self._fresh.pop(namespace, None)
+        with self._loads_lock:
+            self._loads[namespace] = _LoadStats()
+        self.tag(namespace, *config.tags)
+
+    def tag(self, namespace: str, *tags: str) -> None:
+        """
+        KR: 네임스페이스에 무효화 태그를 붙입니다.
+        EN: Clear `namespace` on `invalidate_tags(tag)`.
+        """
+        if namespace not in self._caches:
+            raise KeyError(namespace)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(namespace)
+
+    def invalidate_tags(self, *tags: str) -> None:
+        """
+        KR: 태그가 붙은 네임스페이스를 비웁니다(테이블 쓰기 커밋 후 호출).
+        EN: Clear every namespace tagged with one of `tags`; wired to committed table
+        writes through `Database.on_table_write`.
+        """
+        namespaces = set()
+        for tag in tags:
+            namespaces |= self._tags.get(tag, set())
+        if namespaces:
+            self.invalidate(*namespaces)
+
+    def get(self, namespace: str, key: Hashable, default: Any = None) -> Any:
+        """KR: 캐시 값을 반환합니다. EN: Return the cached value of `key`, or `default`."""
+        return self._caches[namespace].get(key, default)
+
+    def set(self, namespace: str, key: Hashable, value: Any) -> None:
+        """KR: 값을 캐시에 저장합니다. EN: Cache `value` under `key` (fresh for its soft TTL)."""
+        self._caches[namespace][key] = value
+        fresh = self._fresh.get(namespace)
+        if fresh is not None:
+            fresh[key] = True
+
+    def invalidate(self, *namespaces: str) -> None:
+        """
+        KR: 네임스페이스를 비웁니다(인자 없으면 전체). 다른 워커에도 알립니다.
+        EN: Clear `namespaces` (all when empty) here and, with a backend, in every other
+        worker process.
+        """
+        namespaces = namespaces or self.namespaces
+        self._invalidate_local(namespaces)
+        if self.backend is not None:
+            try:
+                self.backend.publish(namespaces)
+            except Exception as exc:
+                logger.warning("Cache invalidation broadcast of %s failed: %s", namespaces, exc)
 
     def invalidate_all(self) -> None:
-        self.invalidate_locations()
-        self.invalidate_shipments()
-        self.invalidate_legs()
-        self.invalidate_events()
-        self.invalidate_location_status()
-        self.invalidate_location_metrics()
-
-
-def cache_response(ttl: int = 300):
-    def decorator(func):
-        cache = TTLCache(maxsize=1000, ttl=ttl)
-
-        def make_key(args, kwargs) -> str:
-            raw = f"{func.__name__}:{args}:{kwargs}"
-            return hashlib.md5(raw.encode("utf-8")).hexdigest()
+        """KR: 이 프로세스의 캐시만 비웁니다. EN: Clear every namespace in this process only."""
+        self._invalidate_local(self.namespaces)
+
+    def on_remote_invalidation(self, listener: Callable[[Tuple[str, ...]], None]) -> None:
+        """
+        KR: 다른 워커의 무효화를 받을 리스너를 등록합니다.
+        EN: Call `listener(namespaces)` after another worker's invalidation has cleared
+        them here (from the backend's subscriber thread).
+        """
+        self._remote_listeners.append(listener)
+
+    def _on_remote_invalidation(self, namespaces: Tuple[str, ...]) -> None:
+        self._invalidate_local(namespaces)
+        for listener in self._remote_listeners:
+            try:
+                listener(namespaces)
+            except Exception as exc:
+                logger.warning("Remote invalidation listener failed: %s", exc)
+
+    def _invalidate_local(self, namespaces: Iterable[str]) -> None:
+        for namespace in namespaces:
+            # Remote workers may run a newer release with namespaces unknown here.
+            if namespace not in self._caches:
+                continue
+            self._caches[namespace].clear()
+            fresh = self._fresh.get(namespace)
+            if fresh is not None:
+                fresh.clear()
+
+    def _claim_refresh(self, namespace: str, key: Hashable) -> bool:
+        # True for the one caller that should reload a stale entry; the claim marks it
+        # fresh so other hits keep serving the stale value meanwhile.
+        fresh = self._fresh.get(namespace)
+        return fresh is not None and fresh.add(key, True)
+
+    def _refresh_failed(self, namespace: str, key: Hashable, exc: BaseException) -> None:
+        logger.warning("Background refresh of %s:%s failed: %s", namespace, key, exc)
+        self._fresh[namespace].pop(key, None)
+
+    def _record_load(self, namespace: str, started: float, failed: bool) -> None:
+        elapsed = time.perf_counter() - started
+        with self._loads_lock:
+            loads = self._loads[namespace]
+            loads.loads += 1
+            loads.errors += failed
+            loads.total += elapsed
+            loads.max = max(loads.max, elapsed)
+
+    def _load(self, namespace: str, key: Hashable, loader: Callable[[], T]) -> T:
+        started = time.perf_counter()
+        try:
+            value = loader()
+        except BaseException:
+            self._record_load(namespace, started, True)
+            raise
+        self._record_load(namespace, started, False)
+        self.set(namespace, key, value)
+        return value
+
+    async def _load_async(
+        self,
+        namespace: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[T]],
+    ) -> T:
+        started = time.perf_counter()
+        try:
+            value = await loader()
+        except BaseException:
+            self._record_load(namespace, started, True)
+            raise
+        self._record_load(namespace, started, False)
+        self.set(namespace, key, value)
+        return value
+
+    def _reload(self, namespace: str, key: Hashable, loader: Callable[[], Any]) -> None:
+        try:
+            self.flights.do((namespace, key), lambda: self._load(namespace, key, loader))
+        except Exception as exc:
+            self._refresh_failed(namespace, key, exc)
+
+    async def _reload_async(
+        self,
+        namespace: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+    ) -> None:
+        try:
+            await self.flights.do_async(
+                (namespace, key), lambda: self._load_async(namespace, key, loader)
+            )
+        except Exception as exc:
+            self._refresh_failed(namespace, key, exc)
+
+    def get_or_load(self, namespace: str, key: Hashable, loader: Callable[[], T]) -> T:
+        """
+        KR: 캐시 값을 반환하고, 없으면 키당 한 번만 로드해 저장합니다.
+        EN: Return the cached value of `key` in `namespace` ("events", "legs", ...), or
+        run `loader` once for all concurrent callers and cache its result.
+        Namespaces with a soft TTL return stale values at once and reload them on a
+        background thread.
+        """
+        value = self.get(namespace, key)
+        if value is not None:
+            if self._claim_refresh(namespace, key):
+                self._refresher.submit(self._reload, namespace, key, loader)
+            return value
+
+        def load() -> T:
+            # The flight that just finished may already have stored it.
+            value = self._caches[namespace].get(key)
+            if value is None:
+                value = self._load(namespace, key, loader)
+            return value
+
+        return self.flights.do((namespace, key), load)
+
+    async def get_or_load_async(
+        self,
+        namespace: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[T]],
+    ) -> T:
+        """KR: `get_or_load`의 비동기 버전입니다. EN: Async `get_or_load` for coroutine loaders."""
+        value = self.get(namespace, key)
+        if value is not None:
+            if self._claim_refresh(namespace, key):
+                task = asyncio.get_running_loop().create_task(
+                    self._reload_async(namespace, key, loader),
+                )
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            return value
+
+        async def load() -> T:
+            value = self._caches[namespace].get(key)
+            if value is None:
+                value = await self._load_async(namespace, key, loader)
+            return value
+
+        return await self.flights.do_async((namespace, key), load)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        KR: 네임스페이스별 설정과 적중/미스/축출/로드 시간/메모리 통계를 반환합니다.
+        EN: Return each namespace's configuration with its hit, miss, eviction, load-time
+        (ms) and byte counters, for tuning TTLs and bounds from real traffic.
+        """
+        stats = {}
+        for namespace, cache in list(self._caches.items()):
+            config = self._configs[namespace]
+            counters = cache.stats()
+            with self._loads_lock:
+                loads = self._loads[namespace]
+                load_stats = {
+                    "loads": loads.loads,
+                    "load_errors": loads.errors,
+                    "load_time_total_ms": round(loads.total * 1000, 3),
+                    "load_time_max_ms": round(loads.max * 1000, 3),
+                }
+            lookups = counters["hits"] + counters["misses"]
+            stats[namespace] = {
+                **config._asdict(),
+                "tags": sorted(tag for tag, tagged in self._tags.items() if namespace in tagged),
+                **counters,
+                "hit_ratio": counters["hits"] / lookups if lookups else 0.0,
+                **load_stats,
+            }
+        return stats
+
+    def close(self) -> None:
+        """KR: 백그라운드 갱신과 무효화 백엔드를 중지합니다. EN: Stop the refresher and the bus."""
+        self._refresher.shutdown(wait=False, cancel_futures=True)
+        if self.backend is not None:
+            self.backend.close()
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((name, _freeze(item)) for name, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def cache_response(
+    manager: CacheManager,
+    namespace: str,
+    *,
+    key: Optional[Callable[..., Hashable]] = None,
+    tags: Tuple[str, ...] = (),
+) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """
+    KR: 함수 결과를 `manager`의 네임스페이스에 메모이즈하는 데코레이터입니다.
+    EN: Memoize a loader in `namespace` of `manager`, through `get_or_load` (sync) or
+    `get_or_load_async` (coroutine functions): concurrent misses of one key run the
+    loader once, and the namespace's TTL, bounds, soft TTL and statistics apply.
+
+    The key is structural: the function's qualified name plus its bound arguments
+    (defaults applied, so `f(1)` and `f(x=1)` share an entry); pass `key` to derive
+    it from the arguments instead, e.g. to skip unhashable ones. `tags` (table names)
+    are added to the namespace, so `invalidate_tags` clears it after writes. The
+    wrapper exposes `cache_info()` (calls and loads) and the loader as `__wrapped__`.
+    """
+
+    def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        manager.tag(namespace, *tags)
+        signature = inspect.signature(func)
+        name = func.__qualname__
+        counts = {"calls": 0, "loads": 0}
+        counts_lock = threading.Lock()
+
+        def count(counter: str) -> None:
+            with counts_lock:
+                counts[counter] += 1
+
+        def make_key(args, kwargs) -> Hashable:
+            if key is not None:
+                return (name, key(*args, **kwargs))
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return (name, *(_freeze(value) for value in bound.arguments.values()))
+
+        def cache_info() -> Dict[str, Any]:
+            with counts_lock:
+                return {"namespace": namespace, **counts}
 
         if inspect.iscoroutinefunction(func):
             @wraps(func)
-            async def async_wrapper(*args, **kwargs):
-                cache_key = make_key(args, kwargs)
-                if cache_key in cache:
-                    return cache[cache_key]
-                result = await func(*args, **kwargs)
-                cache[cache_key] = result
-                return result
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                count("calls")
+
+                async def load() -> T:
+                    count("loads")
+                    return await func(*args, **kwargs)
 
+                return await manager.get_or_load_async(namespace, make_key(args, kwargs), load)
+
+            async_wrapper.cache_info = cache_info
             return async_wrapper
 
         @wraps(func)
-        def sync_wrapper(*args, **kwargs):
-            cache_key = make_key(args, kwargs)
-            if cache_key in cache:
-                return cache[cache_key]
-            result = func(*args, **kwargs)
-            cache[cache_key] = result
-            return result
+        def sync_wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            count("calls")
+
+            def load() -> T:
+                count("loads")
+                return func(*args, **kwargs)
+
+            return manager.get_or_load(namespace, make_key(args, kwargs), load)
 
+        sync_wrapper.cache_info = cache_info
         return sync_wrapper
 
     return decorator
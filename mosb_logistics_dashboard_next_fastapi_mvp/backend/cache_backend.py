@@ -0,0 +1,158 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Callable, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Invalidation messages older than this are pruned; a subscriber further behind has
+# outlived the longest TTL anyway.
+INVALIDATION_RETENTION_S = 3600
+PRUNE_INTERVAL_S = 60
+
+InvalidationCallback = Callable[[Tuple[str, ...]], None]
+
+
+class CacheBackend(ABC):
+    """
+    KR: 워커 프로세스 간 캐시 무효화 브로드캐스트 채널의 인터페이스입니다.
+    EN: Interface of the channel that broadcasts namespace invalidations between
+    worker processes.
+
+    Only invalidations cross processes. Each worker owns its DuckDB file (DuckDB allows
+    one read-write process per file), so cached bodies and table ETags describe that
+    worker's data and stay in its `CacheManager`. `CacheManager` publishes every
+    `invalidate`; `subscribe` delivers the namespaces other processes invalidated.
+    Implement this to carry the channel on another service (e.g. Redis pub/sub).
+    """
+
+    @abstractmethod
+    def publish(self, namespaces: Sequence[str]) -> None:
+        """KR: 다른 프로세스에 무효화를 알립니다. EN: Notify other processes of an invalidation."""
+
+    @abstractmethod
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        """
+        KR: 다른 프로세스의 무효화를 받습니다.
+        EN: Call `callback(namespaces)` for remote invalidations.
+        """
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    KR: 같은 머신의 워커들이 공유하는 SQLite(WAL) 기반 무효화 채널입니다.
+    EN: `CacheBackend` for workers on one machine, in one SQLite file (WAL mode).
+
+    `publish` appends an `invalidations` row. A daemon thread polls rows from other
+    origins every `poll_interval` seconds, so remote caches are cleared within about
+    that delay.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 0.2):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.origin = uuid.uuid4().hex
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS invalidations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    origin TEXT NOT NULL,
+                    namespaces TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            row = self._conn.execute("SELECT coalesce(max(id), 0) FROM invalidations").fetchone()
+        # Only invalidations published after this process started concern it.
+        self._last_id = row[0]
+
+    def publish(self, namespaces: Sequence[str]) -> None:
+        namespaces = sorted(set(namespaces))
+        if not namespaces:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO invalidations (origin, namespaces, created_at) VALUES (?, ?, ?)",
+                [self.origin, ",".join(namespaces), time.time()],
+            )
+
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        if self._thread is not None:
+            raise RuntimeError("SQLiteCacheBackend supports one subscriber")
+        self._thread = threading.Thread(
+            target=self._poll_loop,
+            args=(callback,),
+            name="cache-invalidations",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def poll(self) -> list[Tuple[str, ...]]:
+        """
+        KR: 아직 처리하지 않은 다른 프로세스의 무효화를 읽습니다.
+        EN: Return the namespace groups other processes invalidated since the last poll.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, origin, namespaces FROM invalidations WHERE id > ? ORDER BY id",
+                [self._last_id],
+            ).fetchall()
+        if rows:
+            self._last_id = rows[-1][0]
+        return [tuple(names.split(",")) for _, origin, names in rows if origin != self.origin]
+
+    def prune(self) -> None:
+        """KR: 오래된 메시지를 지웁니다. EN: Delete messages older than the retention."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM invalidations WHERE created_at < ?",
+                [time.time() - INVALIDATION_RETENTION_S],
+            )
+
+    def _poll_loop(self, callback: InvalidationCallback) -> None:
+        next_prune = time.monotonic() + PRUNE_INTERVAL_S
+        while not self._closed.wait(self.poll_interval):
+            try:
+                for namespaces in self.poll():
+                    callback(namespaces)
+                if time.monotonic() >= next_prune:
+                    self.prune()
+                    next_prune = time.monotonic() + PRUNE_INTERVAL_S
+            except Exception as exc:
+                logger.warning("Cache invalidation poll failed: %s", exc)
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        with self._lock:
+            self._conn.close()
+
+
+def create_cache_backend(url: str, poll_interval: float = 0.2) -> Optional[CacheBackend]:
+    """
+    KR: URL로 무효화 백엔드를 만듭니다. 빈 값/`local`이면 None(프로세스 전용).
+    EN: Build the invalidation backend for `url`: "" or "local" -> None (no broadcast),
+    "sqlite:///path/to/cache.sqlite3" -> `SQLiteCacheBackend`.
+    """
+    if not url or url == "local":
+        return None
+    if url.startswith("sqlite:///"):
+        return SQLiteCacheBackend(url.removeprefix("sqlite:///"), poll_interval=poll_interval)
+    raise ValueError(f"Unsupported cache backend: {url}")
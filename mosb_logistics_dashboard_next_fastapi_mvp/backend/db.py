@@ -1,37 +1,258 @@
+import base64
+import csv
+import hashlib
+import io
+import json
 import logging
 import os
+import queue
 import shutil
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Iterator, List, Optional, Sequence
 
 import duckdb
 
-from models import Event, Leg, Location, Shipment, LocationMetric, LocationStatus
+from cache import MIB, CachedJson
+from events_window import EventsWindow
+from models import (
+    Event,
+    KpiSlice,
+    Leg,
+    Location,
+    LocationMetric,
+    LocationStatus,
+    LocationStatusHistoryPoint,
+    Shipment,
+)
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_POOL_TIMEOUT = 30.0
+HOUR_US = 3_600_000_000
+DAY_US = 24 * HOUR_US
+# Location status history rollups: name -> bucket width in µs, finest first.
+STATUS_ROLLUPS = {"1m": 60_000_000, "1h": HOUR_US, "1d": DAY_US}
+# Days each history resolution is kept (0 = forever); LOCATION_STATUS_RETENTION_<NAME>_DAYS.
+STATUS_RETENTION_DAYS = {"raw": 7, "1m": 30, "1h": 365, "1d": 0}
+# `resolution=auto` picks the finest rollup returning at most this many buckets.
+STATUS_HISTORY_MAX_POINTS = 1_000
+# Undrained KPI delta entries kept for WS push; older ones are dropped (clients refetch).
+KPI_PENDING_MAX = 1_000
+# Tables whose version is served as the ETag of their read endpoints (events: bumped
+# on every committed append, for `on_table_write` listeners).
+VERSIONED_TABLES = ("locations", "legs", "shipments", "location_status", "events")
+# Bytes read back before a checkpoint to re-hash the last ingested row.
+TAIL_VERIFY_WINDOW = 64 * 1024
+# Seconds a compacted-away or orphaned cold Parquet file stays on disk, so reads that
+# globbed it before the swap can finish (EVENTS_COLD_RETIRE_GRACE_S).
+COLD_RETIRE_GRACE_S = 600
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+EVENT_COLUMNS = [
+    "event_id",
+    "ts",
+    "shpt_no",
+    "status",
+    "location_id",
+    "lat",
+    "lon",
+    "remark",
+]
+
+SHIPMENT_STATE_COLUMNS = [
+    "shpt_no",
+    "event_id",
+    "ts",
+    "status",
+    "location_id",
+    "lat",
+    "lon",
+    "remark",
+    "current_leg_id",
+]
+_MIN_BIGINT = -(2**63)
+
+# Column types used to decode a JSON array of events server-side in one statement.
+_EVENT_JSON_SCHEMA = json.dumps(
+    [
+        {
+            "event_id": "VARCHAR",
+            "ts": "VARCHAR",
+            "shpt_no": "VARCHAR",
+            "status": "VARCHAR",
+            "location_id": "VARCHAR",
+            "lat": "DOUBLE",
+            "lon": "DOUBLE",
+            "remark": "VARCHAR",
+        }
+    ]
+)
+_LOCATION_STATUS_JSON_SCHEMA = json.dumps(
+    [
+        {
+            "location_id": "VARCHAR",
+            "occupancy_rate": "DOUBLE",
+            "status_code": "VARCHAR",
+            "last_updated": "VARCHAR",
+        }
+    ]
+)
+
+
+def epoch_us_sql(expr: str) -> str:
+    """
+    KR: ISO8601 문자열 식을 UTC epoch 마이크로초(BIGINT)로 정규화하는 SQL을 만듭니다.
+    EN: Build SQL normalizing an ISO8601 string expression to UTC epoch microseconds.
+
+    Offsets (``Z``/``+00:00``/``-05``) are honoured; naive timestamps are treated as UTC,
+    independent of the DuckDB session TimeZone. Unparseable values become NULL.
+    """
+    return (
+        # The offset must follow a time: a date-only '2026-01-05' is naive, not '-05'.
+        f"CASE WHEN regexp_matches({expr}, "
+        "'\\d\\d:\\d\\d(:\\d\\d(\\.\\d+)?)?(Z|[+-]\\d\\d(:?\\d\\d)?)$') "
+        f"THEN epoch_us(try_cast({expr} AS TIMESTAMPTZ)) "
+        f"ELSE date_diff('microsecond', TIMESTAMP '1970-01-01', try_cast({expr} AS TIMESTAMP)) "
+        "END"
+    )
+
+
+def to_epoch_us(value: Optional[str]) -> Optional[int]:
+    """KR: ISO8601 문자열을 epoch 마이크로초로 변환합니다. EN: Convert ISO8601 to epoch µs."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+
+def encode_event_cursor(ts_epoch_us: Optional[int], event_id: str) -> str:
+    """KR: 페이지 경계를 불투명 커서로 인코딩합니다. EN: Encode a page boundary as a cursor."""
+    raw = json.dumps([ts_epoch_us, event_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_event_cursor(cursor: str) -> tuple[Optional[int], str]:
+    """
+    KR: 커서를 (ts_epoch_us, event_id)로 복원합니다.
+    EN: Decode a cursor back to (ts_epoch_us, event_id); raises ValueError if malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ts_epoch_us, event_id = json.loads(raw)
+    except Exception as exc:
+        raise ValueError("Invalid events cursor") from exc
+    if not isinstance(event_id, str) or not isinstance(ts_epoch_us, (int, type(None))):
+        raise ValueError("Invalid events cursor")
+    return ts_epoch_us, event_id
+
+
+class LocationRegistry:
+    """
+    KR: 위치 id → Location 불변 스냅샷입니다. 변경 시 새 버전으로 교체됩니다.
+    EN: Immutable id → Location snapshot tagged with a version. `Database` swaps in a
+    new snapshot whenever locations change, so readers never lock or query.
+    """
+
+    __slots__ = ("version", "_by_id")
+
+    def __init__(self, locations: Sequence[Location] = (), version: int = 0):
+        self.version = version
+        self._by_id = {location.location_id: location for location in locations}
+
+    def __contains__(self, location_id: object) -> bool:
+        return location_id in self._by_id
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, location_id: str) -> Optional[Location]:
+        return self._by_id.get(location_id)
+
+    def values(self) -> List[Location]:
+        return list(self._by_id.values())
 
 
 class Database:
     """DB 접근과 초기 데이터를 관리합니다. / Manages DB access and initial data."""
 
-    def __init__(self, db_path: Optional[str] = None, load_csv: bool = True):
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        load_csv: bool = True,
+        pool_size: Optional[int] = None,
+    ):
         """DB 연결과 초기 로드를 수행합니다. / Initialize DB connection and initial load."""
+        self.data_dir = os.getenv("DATA_DIR", os.path.join(os.path.dirname(__file__), "data"))
+        self.cold_dir = os.getenv(
+            "EVENTS_COLD_DIR",
+            os.path.join(self.data_dir, "cold", "events"),
+        )
+        self._cold_lock = threading.Lock()
+        self.cold_retire_grace_s = float(
+            os.getenv("EVENTS_COLD_RETIRE_GRACE_S", str(COLD_RETIRE_GRACE_S)),
+        )
         if db_path is None:
             env_path = os.getenv("LOGISTICS_DB_PATH")
             if env_path:
                 db_path = env_path
             else:
-                data_dir = os.getenv(
-                    "DATA_DIR",
-                    os.path.join(os.path.dirname(__file__), "data"),
-                )
-                db_path = os.path.join(data_dir, "logistics.db")
+                db_path = os.path.join(self.data_dir, "logistics.db")
 
         if db_path != ":memory:":
             Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
         self.conn = self._connect_with_recovery(db_path)
+        if pool_size is None:
+            pool_size = int(os.getenv("LOGISTICS_DB_POOL_SIZE", str(DEFAULT_POOL_SIZE)))
+        self.pool_size = max(1, pool_size)
+        self.pool_timeout = float(
+            os.getenv("LOGISTICS_DB_POOL_TIMEOUT", str(DEFAULT_POOL_TIMEOUT)),
+        )
+        self._pool: queue.LifoQueue[duckdb.DuckDBPyConnection] = queue.LifoQueue()
+        self._pool_created = 0
+        self._pool_lock = threading.Lock()
+        self.status_retention_days = {
+            name: float(os.getenv(f"LOCATION_STATUS_RETENTION_{name.upper()}_DAYS", str(days)))
+            for name, days in STATUS_RETENTION_DAYS.items()
+        }
+        # DuckDB write transactions are optimistic: two concurrent upserts of the same
+        # counter row conflict at commit. Writers are serialized; readers are not.
+        self._write_lock = threading.RLock()
+        # Callbacks registered inside the current write transaction; run after it commits.
+        self._on_commit: List[Callable[[], None]] = []
+        # KPI counter deltas published per committed write, drained by the API for WS push.
+        self.kpi_version = 0
+        self._kpi_pending: deque[dict] = deque(maxlen=KPI_PENDING_MAX)
+        self._kpi_lock = threading.Lock()
+        self.table_versions = dict.fromkeys(VERSIONED_TABLES, 0)
+        self._table_listeners: List[Callable[..., None]] = []
+        self._table_writes: deque[tuple[str, ...]] = deque()
+        # Newest events pre-encoded for `/api/events`; loaded on first use, merged on commit.
+        self.events_window = EventsWindow(
+            int(os.getenv("EVENTS_WINDOW_MAX_ROWS", "100000")),
+            int(float(os.getenv("EVENTS_WINDOW_BODY_CACHE_MB", "64")) * MIB),
+        )
         self._init_schema()
+        self._refresh_cold_watermark()
         if load_csv:
             self._load_csv_data_if_needed()
+        self._ensure_location_metrics()
+        self._ensure_shipment_state()
+        self.locations = LocationRegistry()
+        self.refresh_locations()
 
     def _connect_with_recovery(self, db_path: str) -> duckdb.DuckDBPyConnection:
         recovery_policy = os.getenv("LOGISTICS_DB_RECOVERY", "fail").lower()
@@ -76,6 +297,106 @@ class Database:
         logger.info("Recreating DuckDB database at %s", db_path)
         return duckdb.connect(db_path)
 
+    def _acquire_cursor(self) -> duckdb.DuckDBPyConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._pool_lock:
+            if self._pool_created < self.pool_size:
+                self._pool_created += 1
+                return self.conn.cursor()
+        try:
+            return self._pool.get(timeout=self.pool_timeout)
+        except queue.Empty as exc:
+            raise TimeoutError(
+                f"No DuckDB cursor available within {self.pool_timeout}s "
+                f"(pool_size={self.pool_size})",
+            ) from exc
+
+    @contextmanager
+    def cursor(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """
+        KR: 풀에서 스레드 전용 커서를 빌려줍니다.
+        EN: Borrow a cursor from the pool for exclusive use by the calling thread.
+        """
+        cur = self._acquire_cursor()
+        try:
+            yield cur
+        finally:
+            self._pool.put(cur)
+
+    @contextmanager
+    def transaction(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """
+        KR: 풀 커서를 빌려 블록 전체를 하나의 트랜잭션으로 실행합니다.
+        EN: Borrow a pooled cursor and run the whole block as one write transaction.
+        Write transactions run one at a time.
+        """
+        with self._write_lock, self.cursor() as cur:
+            cur.begin()
+            try:
+                yield cur
+            except BaseException:
+                cur.rollback()
+                self._on_commit.clear()
+                raise
+            cur.commit()
+            callbacks, self._on_commit = self._on_commit, []
+            for callback in callbacks:
+                callback()
+        self._notify_table_writes()
+
+    def bump_table_versions(self, *tables: str) -> None:
+        """
+        KR: 테이블 버전을 올립니다(쓰기 커밋 후 호출).
+        EN: Bump the version of each table after a committed write, so ETags derived
+        from `table_version` change and pollers refetch.
+        """
+        self._bump_table_versions(*tables)
+        self._notify_table_writes()
+
+    def _bump_table_versions(self, *tables: str) -> None:
+        # Listeners are queued, not called: they may block (e.g. publishing to a shared
+        # cache bus), so they run once the caller releases the write lock.
+        with self._write_lock:
+            for table in tables:
+                self.table_versions[table] += 1
+            self._table_writes.append(tables)
+
+    def _notify_table_writes(self) -> None:
+        """
+        KR: 대기 중인 테이블 쓰기를 리스너에 전달합니다(쓰기 잠금 밖에서).
+        EN: Deliver queued table writes to the listeners. Called after the write lock is
+        released; whichever writer gets here first delivers everyone's queued writes.
+        """
+        while True:
+            try:
+                tables = self._table_writes.popleft()
+            except IndexError:
+                return
+            for listener in self._table_listeners:
+                try:
+                    listener(*tables)
+                except Exception as exc:
+                    logger.warning("Table write listener failed for %s: %s", tables, exc)
+
+    def on_table_write(self, listener: Callable[..., None]) -> None:
+        """
+        KR: 테이블 쓰기 커밋 후 호출할 리스너를 등록합니다.
+        EN: Call `listener(*tables)` after each committed write bumps table versions,
+        e.g. `CacheManager.invalidate_tags` to retire cached reads of those tables.
+        Listeners run after the write lock is released, so they may block.
+        """
+        self._table_listeners.append(listener)
+
+    def table_version(self, table: str) -> int:
+        """
+        KR: 테이블의 현재 버전을 반환합니다(프로세스 내 단조 증가).
+        EN: Return the table's current version; it only increases within a process.
+        """
+        return self.table_versions[table]
+
     def _init_schema(self) -> None:
         self.conn.execute(
             """
@@ -121,7 +442,9 @@ class Database:
                 to_location_id VARCHAR NOT NULL,
                 mode VARCHAR NOT NULL,
                 planned_etd VARCHAR NOT NULL,
-                planned_eta VARCHAR NOT NULL
+                planned_eta VARCHAR NOT NULL,
+                planned_etd_epoch_us BIGINT,
+                planned_eta_epoch_us BIGINT
             )
             """
         )
@@ -135,10 +458,158 @@ class Database:
                 location_id VARCHAR NOT NULL,
                 lat DOUBLE NOT NULL,
                 lon DOUBLE NOT NULL,
-                remark VARCHAR
+                remark VARCHAR,
+                ts_epoch_us BIGINT
+            )
+            """
+        )
+        # Byte-offset checkpoints for incremental (tail) ingestion of append-only CSV files.
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingest_checkpoints (
+                source VARCHAR PRIMARY KEY,
+                byte_offset BIGINT NOT NULL,
+                row_hash VARCHAR NOT NULL,
+                updated_at VARCHAR NOT NULL
+            )
+            """
+        )
+        # Manifest of the cold-tier Parquet files. Reads only see files listed here with
+        # retired_at NULL, so publishing/retiring a file commits with the hot-table change.
+        cold_manifest_exists = self.conn.execute(
+            "SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = 'cold_files'"
+        ).fetchone()[0]
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cold_files (
+                name VARCHAR PRIMARY KEY,
+                partition VARCHAR NOT NULL,
+                retired_at DOUBLE
+            )
+            """
+        )
+        legacy_cold_files = [[name, partition] for partition, name in self._cold_files_on_disk()]
+        if not cold_manifest_exists and legacy_cold_files:
+            # Adopt files archived before the manifest existed.
+            self.conn.executemany("INSERT INTO cold_files VALUES (?, ?, NULL)", legacy_cold_files)
+        # Incrementally maintained per-location event counters (all time + hourly buckets).
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS location_metrics_mv (
+                location_id VARCHAR PRIMARY KEY,
+                event_count BIGINT NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS location_event_buckets (
+                location_id VARCHAR NOT NULL,
+                bucket_start_us BIGINT NOT NULL,
+                event_count BIGINT NOT NULL,
+                PRIMARY KEY (location_id, bucket_start_us)
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS shipment_state (
+                shpt_no VARCHAR PRIMARY KEY,
+                event_id VARCHAR NOT NULL,
+                ts VARCHAR NOT NULL,
+                ts_epoch_us BIGINT,
+                status VARCHAR NOT NULL,
+                location_id VARCHAR NOT NULL,
+                lat DOUBLE NOT NULL,
+                lon DOUBLE NOT NULL,
+                remark VARCHAR,
+                current_leg_id VARCHAR
             )
             """
         )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS kpi_counters (
+                dimension VARCHAR NOT NULL,
+                slice VARCHAR NOT NULL,
+                status VARCHAR NOT NULL,
+                shipment_count BIGINT NOT NULL,
+                PRIMARY KEY (dimension, slice, status)
+            )
+            """
+        )
+        self.conn.execute("CREATE SEQUENCE IF NOT EXISTS location_status_history_seq")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS location_status_history (
+                seq BIGINT NOT NULL DEFAULT nextval('location_status_history_seq'),
+                location_id VARCHAR NOT NULL,
+                occupancy_rate DOUBLE NOT NULL,
+                status_code VARCHAR NOT NULL,
+                last_updated VARCHAR NOT NULL,
+                ts_epoch_us BIGINT
+            )
+            """
+        )
+        for name in STATUS_ROLLUPS:
+            self.conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS location_status_rollup_{name} (
+                    location_id VARCHAR NOT NULL,
+                    bucket_start_us BIGINT NOT NULL,
+                    sample_count BIGINT NOT NULL,
+                    occupancy_sum DOUBLE NOT NULL,
+                    occupancy_min DOUBLE NOT NULL,
+                    occupancy_max DOUBLE NOT NULL,
+                    PRIMARY KEY (location_id, bucket_start_us)
+                )
+                """
+            )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rollup_watermarks (
+                name VARCHAR PRIMARY KEY,
+                last_seq BIGINT NOT NULL
+            )
+            """
+        )
+        self._migrate_schema()
+        # Keyset pages are served by a TOP_N over a scan; DuckDB never chose this range
+        # index for them, so databases that still carry it drop it.
+        self.conn.execute("DROP INDEX IF EXISTS idx_events_ts_event")
+        # Point lookups per shipment/location. DuckDB only scans single-column ART indexes
+        # for equality predicates, so the time order is applied after the lookup.
+        for statement in (
+            "CREATE INDEX IF NOT EXISTS idx_events_shpt_no ON events (shpt_no)",
+            "CREATE INDEX IF NOT EXISTS idx_events_location_id ON events (location_id)",
+            "CREATE INDEX IF NOT EXISTS idx_legs_shpt_no ON legs (shpt_no)",
+        ):
+            self.conn.execute(statement)
+
+    def _migrate_schema(self) -> None:
+        """
+        KR: 기존 DB에 정규화된 epoch 컬럼을 추가하고 채웁니다.
+        EN: Add and backfill normalized epoch columns on databases created before they existed.
+        """
+        migrations = {
+            "events": {"ts_epoch_us": "ts"},
+            "legs": {
+                "planned_etd_epoch_us": "planned_etd",
+                "planned_eta_epoch_us": "planned_eta",
+            },
+        }
+        for table, columns in migrations.items():
+            for epoch_column, source_column in columns.items():
+                self.conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {epoch_column} BIGINT",
+                )
+                self.conn.execute(
+                    f"""
+                    UPDATE {table}
+                    SET {epoch_column} = {epoch_us_sql(source_column)}
+                    WHERE {epoch_column} IS NULL
+                    """
+                )
 
     def _load_csv_table(self, table: str, csv_path: str, select_sql: str) -> None:
         if not os.path.exists(csv_path):
@@ -146,10 +617,10 @@ class Database:
         count = self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
         if count:
             return
-        self.conn.execute(f"INSERT INTO {table} {select_sql}", [csv_path])
+        self.conn.execute(f"INSERT INTO {table} BY NAME {select_sql}", [csv_path])
 
     def _load_csv_data_if_needed(self) -> None:
-        data_dir = os.getenv("DATA_DIR", os.path.join(os.path.dirname(__file__), "data"))
+        data_dir = self.data_dir
         read_csv_base = (
             "read_csv(?, delim=',', header=true, all_varchar=true, "
             "strict_mode=false, ignore_errors=true, null_padding=true)"
@@ -158,7 +629,8 @@ class Database:
             "locations",
             os.path.join(data_dir, "locations.csv"),
             f"""
-            SELECT location_id, type, name, CAST(lat AS DOUBLE), CAST(lon AS DOUBLE)
+            SELECT location_id, type, name,
+                   CAST(lat AS DOUBLE) AS lat, CAST(lon AS DOUBLE) AS lon
             FROM {read_csv_base}
             """,
         )
@@ -170,22 +642,69 @@ class Database:
         self._load_csv_table(
             "legs",
             os.path.join(data_dir, "legs.csv"),
-            f"SELECT * FROM {read_csv_base}",
+            f"""
+            SELECT *,
+                   {epoch_us_sql("planned_etd")} AS planned_etd_epoch_us,
+                   {epoch_us_sql("planned_eta")} AS planned_eta_epoch_us
+            FROM {read_csv_base}
+            """,
         )
+        events_csv = os.path.join(data_dir, "events.csv")
+        # Decided before the bulk load, which makes the table non-empty on a fresh DB.
+        bulk_checkpoint = None
+        if os.path.exists(events_csv) and self._get_checkpoint(events_csv) is None:
+            if not self.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]:
+                # Taken before the load: rows appended meanwhile are re-read by the tail
+                # pass, which skips the event_ids the bulk load already stored.
+                bulk_checkpoint = self._complete_prefix(events_csv)
         self._load_csv_table(
             "events",
-            os.path.join(data_dir, "events.csv"),
+            events_csv,
             f"""
             SELECT event_id, ts, shpt_no, status, location_id,
-                   CAST(lat AS DOUBLE), CAST(lon AS DOUBLE), remark
+                   CAST(lat AS DOUBLE) AS lat, CAST(lon AS DOUBLE) AS lon, remark,
+                   {epoch_us_sql("ts")} AS ts_epoch_us
             FROM {read_csv_base}
             """,
         )
+        if bulk_checkpoint is not None:
+            # Fresh bulk load: mark the complete lines as ingested.
+            self._save_checkpoint(self.conn, events_csv, *bulk_checkpoint)
+        elif os.path.exists(events_csv) and self._get_checkpoint(events_csv) is None:
+            # Legacy DBs without a checkpoint are reconciled by a full tail pass that
+            # skips known event_ids.
+            self.ingest_events_tail(events_csv)
 
     def _fetch_models(self, query: str, columns: list[str], model, params=None):
-        rows = self.conn.execute(query, params or []).fetchall()
+        with self.cursor() as cur:
+            rows = cur.execute(query, params or []).fetchall()
         return [model(**dict(zip(columns, row))) for row in rows]
 
+    def _fetch_json(
+        self,
+        query: str,
+        columns: list[str],
+        order_by: str,
+        params=None,
+    ) -> bytes:
+        """
+        KR: 쿼리 결과를 DuckDB 안에서 JSON 배열로 직렬화해 바이트로 반환합니다.
+        EN: Serialize query rows to a JSON array inside DuckDB and return the encoded bytes.
+
+        Rows come from our own tables, so no per-row Python objects or pydantic models are
+        built. `order_by` may reference any column selected by `query`.
+        """
+        fields = ", ".join(f"'{column}': q.{column}" for column in columns)
+        with self.cursor() as cur:
+            body = cur.execute(
+                f"""
+                SELECT CAST(to_json(list({{{fields}}} ORDER BY {order_by})) AS VARCHAR)
+                FROM ({query}) AS q
+                """,
+                params or [],
+            ).fetchone()[0]
+        return (body or "[]").encode("utf-8")
+
     def get_location_status(self) -> List[LocationStatus]:
         """
         Returns the list of LocationStatus objects representing the latest status for each location.
@@ -201,21 +720,183 @@ class Database:
         Inserts or updates a LocationStatus record.
         If a record for the same location_id exists, it is updated; otherwise inserted.
         """
-        self.conn.execute(
+        self.upsert_location_statuses([status])
+
+    def upsert_location_statuses(self, statuses: Sequence[LocationStatus]) -> None:
+        """
+        KR: 여러 위치 상태를 하나의 트랜잭션으로 upsert합니다. 같은 id는 마지막 값이 남습니다.
+        EN: Upsert many location statuses in one transaction; for a repeated location_id
+        the last entry wins.
+        """
+        latest = {status.location_id: status for status in statuses}
+        if not latest:
+            return
+        payload = json.dumps([status.model_dump() for status in latest.values()])
+        incoming = (
+            f"(SELECT unnest(from_json(?, '{_LOCATION_STATUS_JSON_SCHEMA}'), recursive := true))"
+        )
+        with self.transaction() as cur:
+            cur.execute(
+                f"""
+                INSERT INTO location_status (location_id, occupancy_rate, status_code, last_updated)
+                SELECT location_id, occupancy_rate, status_code, last_updated
+                FROM {incoming}
+                ON CONFLICT(location_id) DO UPDATE SET
+                  occupancy_rate=excluded.occupancy_rate,
+                  status_code=excluded.status_code,
+                  last_updated=excluded.last_updated
+                """,
+                [payload],
+            )
+            # Append-only history, rolled up in the background by rollup_location_status_history.
+            cur.execute(
+                f"""
+                INSERT INTO location_status_history
+                    (location_id, occupancy_rate, status_code, last_updated, ts_epoch_us)
+                SELECT location_id, occupancy_rate, status_code, last_updated,
+                       {epoch_us_sql("last_updated")}
+                FROM {incoming}
+                """,
+                [payload],
+            )
+            self._on_commit.append(lambda: self._bump_table_versions("location_status"))
+
+    def rollup_location_status_history(self) -> int:
+        """
+        KR: 아직 집계되지 않은 상태 이력을 1분/1시간/1일 min/avg/max 집계에 병합합니다.
+        EN: Merge history rows added since the last run into the 1m/1h/1d rollups and
+        return how many rows were rolled up.
+
+        Rollups store count/sum/min/max, so new rows (including late ones for old
+        buckets) merge with ON CONFLICT without re-reading raw history. A `seq`
+        watermark tracks progress; writers are serialized, so seq order is commit order.
+        """
+        with self.transaction() as cur:
+            row = cur.execute(
+                "SELECT last_seq FROM rollup_watermarks WHERE name = 'location_status'"
+            ).fetchone()
+            last_seq = row[0] if row else 0
+            high_seq, pending = cur.execute(
+                "SELECT max(seq), COUNT(*) FROM location_status_history WHERE seq > ?",
+                [last_seq],
+            ).fetchone()
+            if not pending:
+                return 0
+            for name, width in STATUS_ROLLUPS.items():
+                table = f"location_status_rollup_{name}"
+                cur.execute(
+                    f"""
+                    INSERT INTO {table}
+                        (location_id, bucket_start_us, sample_count,
+                         occupancy_sum, occupancy_min, occupancy_max)
+                    SELECT location_id, ts_epoch_us - ts_epoch_us % {width}, COUNT(*),
+                           sum(occupancy_rate), min(occupancy_rate), max(occupancy_rate)
+                    FROM location_status_history
+                    WHERE seq > ? AND seq <= ? AND ts_epoch_us IS NOT NULL
+                    GROUP BY ALL
+                    ON CONFLICT (location_id, bucket_start_us) DO UPDATE SET
+                      sample_count = {table}.sample_count + excluded.sample_count,
+                      occupancy_sum = {table}.occupancy_sum + excluded.occupancy_sum,
+                      occupancy_min = least({table}.occupancy_min, excluded.occupancy_min),
+                      occupancy_max = greatest({table}.occupancy_max, excluded.occupancy_max)
+                    """,
+                    [last_seq, high_seq],
+                )
+            cur.execute(
+                """
+                INSERT INTO rollup_watermarks (name, last_seq) VALUES ('location_status', ?)
+                ON CONFLICT (name) DO UPDATE SET last_seq = excluded.last_seq
+                """,
+                [high_seq],
+            )
+        return pending
+
+    def prune_location_status_history(self, now: Optional[datetime] = None) -> int:
+        """
+        KR: 보존 기간이 지난 상태 이력/집계 행을 삭제합니다.
+        EN: Delete history and rollup rows older than their retention; raw rows are only
+        deleted once rolled up. Returns the number of rows deleted.
+        """
+        now_us = to_epoch_us((now or datetime.now(timezone.utc)).isoformat())
+        deleted = 0
+        with self.transaction() as cur:
+            raw_days = self.status_retention_days["raw"]
+            if raw_days > 0:
+                deleted += cur.execute(
+                    """
+                    DELETE FROM location_status_history
+                    WHERE ts_epoch_us < ?
+                      AND seq <= COALESCE(
+                          (SELECT last_seq FROM rollup_watermarks WHERE name = 'location_status'),
+                          0
+                      )
+                    """,
+                    [now_us - int(raw_days * DAY_US)],
+                ).fetchone()[0]
+            for name in STATUS_ROLLUPS:
+                days = self.status_retention_days[name]
+                if days > 0:
+                    deleted += cur.execute(
+                        f"DELETE FROM location_status_rollup_{name} WHERE bucket_start_us < ?",
+                        [now_us - int(days * DAY_US)],
+                    ).fetchone()[0]
+        return deleted
+
+    def pick_status_resolution(self, since_us: int, until_us: int, now_us: int) -> str:
+        """
+        KR: 범위를 만족하는 집계 해상도를 고릅니다.
+        EN: Pick the rollup for [since, until): the finest one that returns at most
+        STATUS_HISTORY_MAX_POINTS buckets and whose retention still reaches `since`;
+        longer ranges therefore land on coarser tables. Falls back to "1d".
+        """
+        for name, width in STATUS_ROLLUPS.items():
+            days = self.status_retention_days[name]
+            covered = days <= 0 or since_us >= now_us - int(days * DAY_US)
+            if covered and (until_us - since_us) / width <= STATUS_HISTORY_MAX_POINTS:
+                return name
+        return "1d"
+
+    def get_location_status_history(
+        self,
+        location_id: str,
+        since_us: int,
+        until_us: int,
+        resolution: str,
+    ) -> List[LocationStatusHistoryPoint]:
+        """
+        KR: 한 위치의 점유율 이력을 해상도별 (min, avg, max)로 반환합니다.
+        EN: Return one location's occupancy history in [since, until) at `resolution`
+        ("raw" or a STATUS_ROLLUPS name), oldest first.
+        """
+        if resolution == "raw":
+            query = """
+                SELECT ts_epoch_us AS bucket_start_us, 1 AS samples,
+                       occupancy_rate AS occupancy_min, occupancy_rate AS occupancy_avg,
+                       occupancy_rate AS occupancy_max
+                FROM location_status_history
+                WHERE location_id = ? AND ts_epoch_us >= ? AND ts_epoch_us < ?
             """
-            INSERT INTO location_status (location_id, occupancy_rate, status_code, last_updated)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(location_id) DO UPDATE SET
-              occupancy_rate=excluded.occupancy_rate,
-              status_code=excluded.status_code,
-              last_updated=excluded.last_updated
+            params = [location_id, since_us, until_us]
+        else:
+            width = STATUS_ROLLUPS[resolution]
+            query = f"""
+                SELECT bucket_start_us, sample_count AS samples, occupancy_min,
+                       occupancy_sum / sample_count AS occupancy_avg, occupancy_max
+                FROM location_status_rollup_{resolution}
+                WHERE location_id = ? AND bucket_start_us >= ? AND bucket_start_us < ?
+            """
+            # Include the bucket that contains `since`.
+            params = [location_id, since_us - since_us % width, until_us]
+        return self._fetch_models(
+            f"""
+            SELECT strftime(make_timestamp(bucket_start_us), '%Y-%m-%dT%H:%M:%SZ') AS ts,
+                   samples, occupancy_min, occupancy_avg, occupancy_max
+            FROM ({query})
+            ORDER BY bucket_start_us
             """,
-            [
-                status.location_id,
-                status.occupancy_rate,
-                status.status_code,
-                status.last_updated,
-            ],
+            ["ts", "samples", "occupancy_min", "occupancy_avg", "occupancy_max"],
+            LocationStatusHistoryPoint,
+            params,
         )
 
     def get_locations(self) -> List[Location]:
@@ -226,6 +907,41 @@ class Database:
             Location,
         )
 
+    def refresh_locations(self) -> LocationRegistry:
+        """
+        KR: locations 테이블을 다시 읽어 위치 레지스트리를 새 버전으로 교체합니다.
+        EN: Reload the locations table into a new registry version and return it.
+        """
+        with self._write_lock:
+            self.locations = LocationRegistry(self.get_locations(), self.locations.version + 1)
+            # Bumped after the swap: a reader never sees the new version with the old registry.
+            self._bump_table_versions("locations")
+        self._notify_table_writes()
+        return self.locations
+
+    def upsert_locations(self, locations: Sequence[Location]) -> LocationRegistry:
+        """
+        KR: 위치를 추가/수정하고 레지스트리를 갱신합니다.
+        EN: Insert or update locations, then refresh the registry.
+        """
+        with self.transaction() as cur:
+            cur.executemany(
+                """
+                INSERT INTO locations (location_id, type, name, lat, lon)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (location_id) DO UPDATE SET
+                  type = excluded.type,
+                  name = excluded.name,
+                  lat = excluded.lat,
+                  lon = excluded.lon
+                """,
+                [
+                    [loc.location_id, loc.type, loc.name, loc.lat, loc.lon]
+                    for loc in locations
+                ],
+            )
+        return self.refresh_locations()
+
     def get_shipments(self) -> List[Shipment]:
         """운송 목록을 반환합니다. / Return the list of shipments."""
         return self._fetch_models(
@@ -236,59 +952,274 @@ class Database:
 
     def get_legs(self) -> List[Leg]:
         """운송 구간 목록을 반환합니다. / Return the list of legs."""
+        columns = [
+            "leg_id",
+            "shpt_no",
+            "from_location_id",
+            "to_location_id",
+            "mode",
+            "planned_etd",
+            "planned_eta",
+        ]
         return self._fetch_models(
-            "SELECT * FROM legs",
-            [
-                "leg_id",
-                "shpt_no",
-                "from_location_id",
-                "to_location_id",
-                "mode",
-                "planned_etd",
-                "planned_eta",
-            ],
+            f"SELECT {', '.join(columns)} FROM legs",
+            columns,
             Leg,
         )
 
-    def get_events(self, since: Optional[str] = None) -> List[Event]:
-        """이벤트 목록을 반환합니다. / Return the list of events."""
+    def get_shipment_legs(self, shpt_no: str) -> List[Leg]:
+        """KR: 한 운송의 구간 목록을 반환합니다. EN: Return the legs of one shipment."""
         columns = [
-            "event_id",
-            "ts",
+            "leg_id",
             "shpt_no",
-            "status",
-            "location_id",
-            "lat",
-            "lon",
-            "remark",
+            "from_location_id",
+            "to_location_id",
+            "mode",
+            "planned_etd",
+            "planned_eta",
         ]
-        if since:
-            return self._fetch_models(
-                "SELECT * FROM events WHERE ts >= ? ORDER BY ts DESC",
-                columns,
-                Event,
-                [since],
-            )
         return self._fetch_models(
-            "SELECT * FROM events ORDER BY ts DESC",
+            f"""
+            SELECT {', '.join(columns)} FROM legs
+            WHERE shpt_no = ?
+            ORDER BY planned_etd_epoch_us NULLS LAST, leg_id
+            """,
             columns,
+            Leg,
+            [shpt_no],
+        )
+
+    def _get_events_by_json(
+        self,
+        column: str,
+        value: str,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> bytes:
+        """
+        KR: `column = value`인 이벤트를 인덱스 조회 후 최신순 JSON 바이트로 반환합니다.
+        EN: Return events where `column = value`, newest first, as JSON bytes.
+
+        The equality lookup runs in a MATERIALIZED CTE so it stays a bare `column = ?`
+        predicate the ART index can serve; `since`, ordering and `limit` apply to the
+        matched rows only.
+        """
+        since_us = to_epoch_us(since)
+        source, params = self._events_source(since_us)
+        where = "WHERE ts_epoch_us >= ?" if since_us is not None else ""
+        limit_sql = "LIMIT ?" if limit is not None else ""
+        return self._fetch_json(
+            f"""
+            WITH matched AS MATERIALIZED (
+                SELECT event_id, ts, shpt_no, status, location_id, lat, lon,
+                       COALESCE(remark, '') AS remark, ts_epoch_us
+                FROM {source}
+                WHERE {column} = ?
+            )
+            SELECT * FROM matched
+            {where}
+            ORDER BY ts_epoch_us DESC NULLS LAST, event_id DESC
+            {limit_sql}
+            """,
+            EVENT_COLUMNS,
+            "q.ts_epoch_us DESC NULLS LAST, q.event_id DESC",
+            params
+            + [value]
+            + ([since_us] if since_us is not None else [])
+            + ([limit] if limit is not None else []),
+        )
+
+    def get_shipment_events_json(self, shpt_no: str, since: Optional[str] = None) -> bytes:
+        """KR: 한 운송의 이벤트를 반환합니다. EN: Return one shipment's events as JSON bytes."""
+        return self._get_events_by_json("shpt_no", shpt_no, since)
+
+    def get_location_events_json(
+        self,
+        location_id: str,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> bytes:
+        """
+        KR: 한 위치의 최신 이벤트를 반환합니다.
+        EN: Return one location's events as JSON bytes, newest first, optionally capped.
+        """
+        return self._get_events_by_json("location_id", location_id, since, limit)
+
+    def get_events(self, since: Optional[str] = None) -> List[Event]:
+        """
+        KR: 이벤트 목록을 반환합니다. `since`는 정규화된 epoch 컬럼으로 필터링합니다.
+        EN: Return the list of events. `since` is pushed down as a typed epoch predicate;
+        an unparseable `since` is ignored, matching the CSV fallback in main.py.
+        """
+        since_us = to_epoch_us(since)
+        source, params = self._events_source(since_us)
+        where = "WHERE ts_epoch_us >= ?" if since_us is not None else ""
+        return self._fetch_models(
+            f"""
+            SELECT {', '.join(EVENT_COLUMNS)}
+            FROM {source}
+            {where}
+            ORDER BY ts_epoch_us DESC NULLS LAST, event_id DESC
+            """,
+            EVENT_COLUMNS,
             Event,
+            params + ([since_us] if since_us is not None else []),
         )
 
+    def get_events_json(self, since: Optional[str] = None) -> bytes:
+        """
+        KR: `get_events`와 같은 결과를 JSON 바이트로 반환합니다.
+        EN: Same rows as `get_events`, encoded as a JSON array without model construction.
+        """
+        since_us = to_epoch_us(since)
+        source, params = self._events_source(since_us)
+        where = "WHERE ts_epoch_us >= ?" if since_us is not None else ""
+        return self._fetch_json(
+            f"""
+            SELECT event_id, ts, shpt_no, status, location_id, lat, lon,
+                   COALESCE(remark, '') AS remark, ts_epoch_us
+            FROM {source}
+            {where}
+            """,
+            EVENT_COLUMNS,
+            "q.ts_epoch_us DESC NULLS LAST, q.event_id DESC",
+            params + ([since_us] if since_us is not None else []),
+        )
+
+    def _event_window_rows(
+        self,
+        cur: duckdb.DuckDBPyConnection,
+        source: str,
+        params: Optional[list] = None,
+        limit: Optional[int] = None,
+    ) -> list:
+        # One JSON object per row, encoded exactly like the elements of get_events_json.
+        fields = ", ".join(f"'{column}': {column}" for column in EVENT_COLUMNS)
+        return cur.execute(
+            f"""
+            SELECT ts_epoch_us, event_id, CAST(to_json({{{fields}}}) AS VARCHAR)
+            FROM (
+                SELECT event_id, ts, shpt_no, status, location_id, lat, lon,
+                       COALESCE(remark, '') AS remark, ts_epoch_us
+                FROM {source}
+            )
+            ORDER BY ts_epoch_us DESC NULLS LAST, event_id DESC
+            {"LIMIT ?" if limit is not None else ""}
+            """,
+            (params or []) + ([limit] if limit is not None else []),
+        ).fetchall()
+
+    def get_events_window_json(self, since: Optional[str] = None) -> Optional[CachedJson]:
+        """
+        KR: 메모리 이벤트 창에서 `get_events_json`과 같은 결과를 반환합니다. 범위 밖이면 None.
+        EN: Serve the same rows as `get_events_json` from the in-memory events window,
+        which appends merge into instead of invalidating. Returns None when `since`
+        reaches below the window; callers then fall back to `get_events_json`.
+        """
+        if not self.events_window.loaded:
+            # Loaded under the write lock, so no commit lands between the read and the
+            # window going live (commits merge into it from then on).
+            with self._write_lock:
+                if not self.events_window.loaded:
+                    source, params = self._events_source()
+                    with self.cursor() as cur:
+                        rows = self._event_window_rows(
+                            cur, source, params, self.events_window.max_rows + 1
+                        )
+                    self.events_window.load(rows)
+        return self.events_window.query(to_epoch_us(since))
+
+    def get_events_page_json(
+        self,
+        since: Optional[str] = None,
+        limit: int = 500,
+        cursor: Optional[str] = None,
+    ) -> tuple[bytes, Optional[str]]:
+        """
+        KR: (ts, event_id) 키셋 페이지를 JSON 바이트와 다음 커서로 반환합니다.
+        EN: Return one keyset page ordered by (ts_epoch_us, event_id) DESC as JSON bytes,
+        plus the cursor for the next page (None on the last page).
+        """
+        filters: list[str] = []
+        since_us = to_epoch_us(since)
+        source, params = self._events_source(since_us)
+        if since_us is not None:
+            filters.append("ts_epoch_us >= ?")
+            params.append(since_us)
+        if cursor:
+            after_ts, after_id = decode_event_cursor(cursor)
+            if after_ts is None:
+                filters.append("(ts_epoch_us IS NULL AND event_id < ?)")
+                params.append(after_id)
+            else:
+                filters.append(
+                    "(ts_epoch_us < ? OR (ts_epoch_us = ? AND event_id < ?) "
+                    "OR ts_epoch_us IS NULL)"
+                )
+                params.extend([after_ts, after_ts, after_id])
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+        fields = ", ".join(f"'{column}': {column}" for column in EVENT_COLUMNS)
+        with self.cursor() as cur:
+            body, has_more, last_ts, last_id = cur.execute(
+                f"""
+                WITH page AS (
+                    SELECT *, row_number() OVER (
+                        ORDER BY ts_epoch_us DESC NULLS LAST, event_id DESC
+                    ) AS rn
+                    FROM (
+                        SELECT event_id, ts, shpt_no, status, location_id, lat, lon,
+                               COALESCE(remark, '') AS remark, ts_epoch_us
+                        FROM {source}
+                        {where}
+                        ORDER BY ts_epoch_us DESC NULLS LAST, event_id DESC
+                        LIMIT ?
+                    )
+                )
+                SELECT
+                    CAST(to_json(list({{{fields}}} ORDER BY rn) FILTER (WHERE rn <= ?))
+                        AS VARCHAR),
+                    COUNT(*) > ?,
+                    max_by(ts_epoch_us, rn) FILTER (WHERE rn <= ?),
+                    max_by(event_id, rn) FILTER (WHERE rn <= ?)
+                FROM page
+                """,
+                [*params, limit + 1, limit, limit, limit, limit],
+            ).fetchone()
+        next_cursor = encode_event_cursor(last_ts, last_id) if has_more else None
+        return (body or "[]").encode("utf-8"), next_cursor
+
     def get_location_metrics(self, since: Optional[str] = None) -> List[LocationMetric]:
-        """KR: 위치별 이벤트/상태 지표를 반환합니다. EN: Return per-location metrics."""
-        event_filter = ""
-        params: list[str] = []
-        if since:
-            event_filter = "WHERE ts >= ?"
-            params = [since]
-        query = f"""
-            WITH event_counts AS (
-                SELECT location_id, COUNT(*) AS event_count
-                FROM events
-                {event_filter}
+        """
+        KR: 위치별 이벤트/상태 지표를 반환합니다.
+        EN: Return per-location metrics from the maintained counters, O(locations).
+
+        With `since`, whole hours come from `location_event_buckets`; only the partial
+        hour between `since` and the next hour boundary is counted from raw events.
+        """
+        since_us = to_epoch_us(since)
+        if since_us is None:
+            counts_sql = "SELECT location_id, event_count FROM location_metrics_mv"
+            params: list = []
+        else:
+            boundary_us = -(-since_us // HOUR_US) * HOUR_US
+            source, params = self._events_source(since_us)
+            counts_sql = f"""
+                SELECT location_id, SUM(event_count) AS event_count
+                FROM (
+                    SELECT location_id, event_count
+                    FROM location_event_buckets
+                    WHERE bucket_start_us >= ?
+                    UNION ALL
+                    SELECT location_id, COUNT(*) AS event_count
+                    FROM {source}
+                    WHERE ts_epoch_us >= ? AND ts_epoch_us < ?
+                    GROUP BY location_id
+                )
                 GROUP BY location_id
-            )
+            """
+            params = [boundary_us, *params, since_us, boundary_us]
+        query = f"""
+            WITH event_counts AS ({counts_sql})
             SELECT
                 locations.location_id,
                 location_status.occupancy_rate,
@@ -315,25 +1246,707 @@ class Database:
             params,
         )
 
+    def _apply_location_metrics(self, cur: duckdb.DuckDBPyConnection, source: str) -> None:
+        """Add the events in `source` (a table or subquery) to the metric counters."""
+        cur.execute(
+            f"""
+            INSERT INTO location_metrics_mv (location_id, event_count)
+            SELECT location_id, COUNT(*) FROM {source} GROUP BY location_id
+            ON CONFLICT (location_id) DO UPDATE SET
+              event_count = location_metrics_mv.event_count + excluded.event_count
+            """
+        )
+        cur.execute(
+            f"""
+            INSERT INTO location_event_buckets (location_id, bucket_start_us, event_count)
+            SELECT location_id, ts_epoch_us - ts_epoch_us % {HOUR_US}, COUNT(*)
+            FROM {source}
+            WHERE ts_epoch_us IS NOT NULL
+            GROUP BY ALL
+            ON CONFLICT (location_id, bucket_start_us) DO UPDATE SET
+              event_count = location_event_buckets.event_count + excluded.event_count
+            """
+        )
+
+    def rebuild_location_metrics(self) -> None:
+        """
+        KR: 이벤트 전체(hot+cold)로부터 위치 지표 카운터를 다시 만듭니다.
+        EN: Rebuild the location metric counters from all hot and cold events in one pass.
+        """
+        source, params = self._events_source()
+        with self.transaction() as cur:
+            cur.execute("DELETE FROM location_metrics_mv")
+            cur.execute("DELETE FROM location_event_buckets")
+            cur.execute(
+                f"""
+                CREATE OR REPLACE TEMP TABLE _all_events AS
+                SELECT location_id, ts_epoch_us FROM {source}
+                """,
+                params,
+            )
+            self._apply_location_metrics(cur, "_all_events")
+            cur.execute("DROP TABLE _all_events")
+
+    def _ensure_location_metrics(self) -> None:
+        # Cheap consistency check at startup; covers DBs written before the counters existed.
+        source, params = self._events_source()
+        with self.cursor() as cur:
+            expected = cur.execute(f"SELECT COUNT(*) FROM {source}", params).fetchone()[0]
+            counted = cur.execute(
+                "SELECT COALESCE(SUM(event_count), 0) FROM location_metrics_mv",
+            ).fetchone()[0]
+        if expected != counted:
+            logger.info("Rebuilding location metrics (%d events, %d counted)", expected, counted)
+            self.rebuild_location_metrics()
+
+    def _apply_shipment_state(
+        self,
+        cur: duckdb.DuckDBPyConnection,
+        source: str,
+        publish: bool = True,
+    ) -> None:
+        """
+        KR: `source`의 운송별 최신 이벤트를 shipment_state에 반영하고 현재 구간을 갱신합니다.
+        EN: Fold the newest event per shipment in `source` into shipment_state (only if it
+        is newer than the stored one) and recompute current_leg_id for those shipments.
+
+        "Newest" follows the events ordering: ts_epoch_us DESC NULLS LAST, event_id DESC.
+        The current leg is the shipment's leg touching the last location: the leg ending
+        there when the status is ARRIVED, otherwise the leg starting there; ties go to the
+        earliest planned ETD.
+        """
+        columns = "shpt_no, event_id, ts, ts_epoch_us, status, location_id, lat, lon, remark"
+        cur.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE _state_before AS
+            SELECT shpt_no, status, current_leg_id FROM shipment_state
+            WHERE shpt_no IN (SELECT shpt_no FROM {source})
+            """
+        )
+        cur.execute(
+            f"""
+            INSERT INTO shipment_state ({columns})
+            SELECT {columns}
+            FROM (
+                SELECT *, row_number() OVER (
+                    PARTITION BY shpt_no ORDER BY ts_epoch_us DESC NULLS LAST, event_id DESC
+                ) AS rn
+                FROM {source}
+            )
+            WHERE rn = 1
+            ON CONFLICT (shpt_no) DO UPDATE SET
+              event_id = excluded.event_id,
+              ts = excluded.ts,
+              ts_epoch_us = excluded.ts_epoch_us,
+              status = excluded.status,
+              location_id = excluded.location_id,
+              lat = excluded.lat,
+              lon = excluded.lon,
+              remark = excluded.remark
+            WHERE (COALESCE(excluded.ts_epoch_us, {_MIN_BIGINT}), excluded.event_id)
+                > (COALESCE(shipment_state.ts_epoch_us, {_MIN_BIGINT}), shipment_state.event_id)
+            """
+        )
+        cur.execute(
+            f"""
+            UPDATE shipment_state AS s SET current_leg_id = (
+                SELECT l.leg_id FROM legs AS l
+                WHERE l.shpt_no = s.shpt_no
+                  AND s.location_id IN (l.from_location_id, l.to_location_id)
+                ORDER BY
+                  CASE WHEN (s.status = 'ARRIVED') = (l.to_location_id = s.location_id)
+                       THEN 0 ELSE 1 END,
+                  l.planned_etd_epoch_us NULLS LAST,
+                  l.leg_id
+                LIMIT 1
+            )
+            WHERE s.shpt_no IN (SELECT shpt_no FROM {source})
+            """
+        )
+        self._apply_kpi_counters(cur, source, publish)
+
+    def _apply_kpi_counters(
+        self,
+        cur: duckdb.DuckDBPyConnection,
+        source: str,
+        publish: bool = True,
+    ) -> None:
+        """
+        KR: 운송 상태 변화(이전 → 이후)를 KPI 카운터 증감으로 반영합니다.
+        EN: Turn the shipment_state change for shipments in `source` (old row -1, new
+        row +1) into KPI counter deltas, overall and per vendor, priority and leg mode.
+        With `publish`, the deltas are queued for WS push once the transaction commits.
+        """
+        cur.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE _kpi_deltas AS
+            WITH changed AS (
+                SELECT shpt_no, status, current_leg_id, 1 AS delta
+                FROM shipment_state
+                WHERE shpt_no IN (SELECT shpt_no FROM {source})
+                UNION ALL
+                SELECT shpt_no, status, current_leg_id, -1 AS delta FROM _state_before
+            ),
+            sliced AS (
+                SELECT c.status, c.delta,
+                       COALESCE(s.vendor, '') AS vendor,
+                       COALESCE(s.priority, '') AS priority,
+                       COALESCE(l.mode, '') AS mode
+                FROM changed AS c
+                LEFT JOIN shipments AS s ON s.shpt_no = c.shpt_no
+                LEFT JOIN legs AS l ON l.leg_id = c.current_leg_id
+            )
+            SELECT dimension, slice, status, SUM(delta) AS delta
+            FROM (
+                SELECT 'all' AS dimension, '' AS slice, status, delta FROM sliced
+                UNION ALL SELECT 'vendor', vendor, status, delta FROM sliced
+                UNION ALL SELECT 'priority', priority, status, delta FROM sliced
+                UNION ALL SELECT 'mode', mode, status, delta FROM sliced
+            )
+            GROUP BY ALL
+            HAVING SUM(delta) <> 0
+            """
+        )
+        cur.execute(
+            """
+            INSERT INTO kpi_counters (dimension, slice, status, shipment_count)
+            SELECT dimension, slice, status, delta FROM _kpi_deltas
+            ON CONFLICT (dimension, slice, status) DO UPDATE SET
+              shipment_count = kpi_counters.shipment_count + excluded.shipment_count
+            """
+        )
+        deltas = [
+            {"dimension": dimension, "slice": slice_, "status": status, "delta": delta}
+            for dimension, slice_, status, delta in cur.execute(
+                "SELECT * FROM _kpi_deltas ORDER BY ALL"
+            ).fetchall()
+        ]
+        if publish and deltas:
+            self._on_commit.append(lambda: self._publish_kpi_deltas(deltas))
+
+    def _publish_kpi_deltas(self, deltas: Optional[List[dict]]) -> None:
+        with self._kpi_lock:
+            self.kpi_version += 1
+            if deltas is not None:
+                self._kpi_pending.append({"version": self.kpi_version, "deltas": deltas})
+
+    def drain_kpi_deltas(self) -> List[dict]:
+        """
+        KR: 커밋된 KPI 증감을 꺼내 반환합니다(한 번만 전달됨).
+        EN: Pop the KPI deltas committed since the last drain, oldest first. Each entry
+        is `{"version": n, "deltas": [...]}`; a gap in versions (e.g. after a rebuild)
+        means clients should refetch `/api/kpis`.
+        """
+        with self._kpi_lock:
+            entries = list(self._kpi_pending)
+            self._kpi_pending.clear()
+        return entries
+
+    def get_kpis(self, by: str = "all") -> tuple[int, List[KpiSlice]]:
+        """
+        KR: KPI 카운터와 버전을 반환합니다. `by`: all, vendor, priority, mode.
+        EN: Return (version, slices) of the shipment status counters for dimension `by`.
+        Read under the write lock so the version matches the counters exactly.
+        """
+        with self._write_lock, self.cursor() as cur:
+            rows = cur.execute(
+                """
+                SELECT slice, status, shipment_count FROM kpi_counters
+                WHERE dimension = ? AND shipment_count <> 0
+                ORDER BY slice, status
+                """,
+                [by],
+            ).fetchall()
+            version = self.kpi_version
+        slices: dict[str, KpiSlice] = {}
+        for slice_, status, count in rows:
+            item = slices.setdefault(slice_, KpiSlice(slice=slice_))
+            item.counts[status] = count
+            item.total += count
+        return version, list(slices.values())
+
+    def rebuild_shipment_state(self) -> None:
+        """
+        KR: 이벤트 전체(hot+cold)를 한 번 읽어 shipment_state를 다시 만듭니다.
+        EN: Rebuild shipment_state from all hot and cold events in one pass.
+        """
+        source, params = self._events_source()
+        with self.transaction() as cur:
+            cur.execute("DELETE FROM shipment_state")
+            cur.execute("DELETE FROM kpi_counters")
+            cur.execute(
+                f"""
+                CREATE OR REPLACE TEMP TABLE _all_events AS
+                SELECT {', '.join(EVENT_COLUMNS)}, ts_epoch_us FROM {source}
+                """,
+                params,
+            )
+            self._apply_shipment_state(cur, "_all_events", publish=False)
+            cur.execute("DROP TABLE _all_events")
+            # No deltas for a rebuild: the version gap tells clients to refetch.
+            self._on_commit.append(lambda: self._publish_kpi_deltas(None))
+
+    def _ensure_shipment_state(self) -> None:
+        # Startup check: one projected row per shipment seen in the event log.
+        source, params = self._events_source()
+        with self.cursor() as cur:
+            expected = cur.execute(
+                f"SELECT COUNT(DISTINCT shpt_no) FROM {source}", params
+            ).fetchone()[0]
+            projected = cur.execute("SELECT COUNT(*) FROM shipment_state").fetchone()[0]
+            counted = cur.execute(
+                "SELECT COALESCE(SUM(shipment_count), 0) FROM kpi_counters WHERE dimension = 'all'"
+            ).fetchone()[0]
+        if expected != projected or projected != counted:
+            logger.info(
+                "Rebuilding shipment state (%d shipments, %d projected)", expected, projected
+            )
+            self.rebuild_shipment_state()
+
+    def get_shipment_state_json(self) -> bytes:
+        """
+        KR: 운송별 현재 상태를 JSON 바이트로 반환합니다(운송 수에 비례).
+        EN: Return the current state of every shipment as JSON bytes; the size scales
+        with the number of shipments, not events.
+        """
+        return self._fetch_json(
+            """
+            SELECT shpt_no, event_id, ts, status, location_id, lat, lon,
+                   COALESCE(remark, '') AS remark, current_leg_id
+            FROM shipment_state
+            """,
+            SHIPMENT_STATE_COLUMNS,
+            "q.shpt_no",
+        )
+
+    def _cold_glob(self) -> str:
+        return os.path.join(self.cold_dir, "event_date=*", "*.parquet").replace("'", "''")
+
+    def _cold_files_on_disk(self) -> Iterator[tuple[str, str]]:
+        """
+        KR: 콜드 디렉터리의 (파티션, 파일명)을 나열합니다.
+        EN: Yield (partition, name) of cold files.
+        """
+        if not os.path.isdir(self.cold_dir):
+            return
+        for partition in sorted(os.listdir(self.cold_dir)):
+            partition_dir = os.path.join(self.cold_dir, partition)
+            if not partition.startswith("event_date=") or not os.path.isdir(partition_dir):
+                continue
+            for name in sorted(os.listdir(partition_dir)):
+                if name.endswith(".parquet"):
+                    yield partition, name
+
+    def _cold_scan(self, columns: str, where: str = "") -> str:
+        """
+        KR: 매니페스트에 등록된(활성) 콜드 파일만 읽는 SELECT를 만듭니다.
+        EN: SELECT over the cold tier restricted to the files `cold_files` lists as
+        active in the reader's snapshot; files on disk but not yet published (or already
+        retired by compaction) are skipped.
+        """
+        return f"""
+            SELECT {columns}
+            FROM read_parquet('{self._cold_glob()}', hive_partitioning = true, filename = true)
+            WHERE parse_filename(filename) IN (
+                SELECT name FROM cold_files WHERE retired_at IS NULL
+            ){f" AND {where}" if where else ""}
+        """
+
+    def _refresh_cold_watermark(self) -> None:
+        """KR: 콜드 티어의 최신 이벤트 시각을 갱신합니다. EN: Refresh the cold-tier high mark."""
+        cold_max: Optional[int] = None
+        with self.cursor() as cur:
+            active = cur.execute("SELECT COUNT(*) FROM cold_files WHERE retired_at IS NULL")
+            if active.fetchone()[0]:
+                try:
+                    cold_max = cur.execute(self._cold_scan("max(ts_epoch_us)")).fetchone()[0]
+                except duckdb.IOException as exc:
+                    logger.warning("Cold tier unreadable, serving hot events only: %s", exc)
+        # One assignment: concurrent readers never see a transient None.
+        self._cold_max_epoch_us: Optional[int] = cold_max
+
+    def _events_source(self, since_us: Optional[int] = None) -> tuple[str, list]:
+        """
+        KR: 조회 범위에 따라 hot 테이블 또는 hot+cold UNION ALL 소스를 반환합니다.
+        EN: Return the FROM source for event reads: the hot table alone, or hot UNION ALL
+        the Parquet cold tier when the requested range reaches archived data.
+        """
+        cold_max = self._cold_max_epoch_us
+        if cold_max is None or (since_us is not None and since_us > cold_max):
+            return "events", []
+        columns = ", ".join([*EVENT_COLUMNS, "ts_epoch_us"])
+        cold_filter = ""
+        params: list = []
+        if since_us is not None:
+            # Hive partition pruning on the event_date directory.
+            cold_filter = "event_date >= CAST(make_timestamp(?) AS DATE)"
+            params.append(since_us)
+        return (
+            f"""(
+                SELECT {columns} FROM events
+                UNION ALL
+                {self._cold_scan(columns, cold_filter)}
+            ) AS events""",
+            params,
+        )
+
+    def archive_events(self, max_age: timedelta) -> int:
+        """
+        KR: `max_age`보다 오래된 이벤트를 날짜별 Parquet 파일로 내보내고 hot 테이블에서 삭제합니다.
+        EN: Move events older than `max_age` to date-partitioned Parquet files under
+        `cold_dir` and delete them from the hot table. Returns the number of rows moved.
+
+        The files are registered in `cold_files` in the same transaction as the DELETE,
+        so readers see each row exactly once: hot before the commit, cold after it. Files
+        left behind by a failed archive are never published and are removed by
+        `_sweep_cold_files`.
+        """
+        cutoff_us = to_epoch_us(datetime.now(timezone.utc).isoformat()) - (
+            max_age // timedelta(microseconds=1)
+        )
+        columns = ", ".join([*EVENT_COLUMNS, "ts_epoch_us"])
+        staging = os.path.join(self.cold_dir, f"_staging_{uuid.uuid4().hex}")
+        with self._cold_lock:
+            os.makedirs(self.cold_dir, exist_ok=True)
+            try:
+                with self.transaction() as cur:
+                    count, batch_max = cur.execute(
+                        "SELECT COUNT(*), max(ts_epoch_us) FROM events WHERE ts_epoch_us < ?",
+                        [cutoff_us],
+                    ).fetchone()
+                    if not count:
+                        return 0
+                    cur.execute(
+                        f"""
+                        COPY (
+                            SELECT {columns},
+                                   CAST(make_timestamp(ts_epoch_us) AS DATE) AS event_date
+                            FROM events
+                            WHERE ts_epoch_us < {int(cutoff_us)}
+                        ) TO '{staging.replace("'", "''")}'
+                        (FORMAT PARQUET, PARTITION_BY (event_date),
+                         FILENAME_PATTERN 'events_{{uuid}}')
+                        """
+                    )
+                    published: list[list[str]] = []
+                    for partition in os.listdir(staging):
+                        target_dir = os.path.join(self.cold_dir, partition)
+                        os.makedirs(target_dir, exist_ok=True)
+                        for name in os.listdir(os.path.join(staging, partition)):
+                            # Unlisted in cold_files, so readers skip it until the commit.
+                            os.replace(
+                                os.path.join(staging, partition, name),
+                                os.path.join(target_dir, name),
+                            )
+                            published.append([name, partition])
+                    if published:
+                        cur.executemany("INSERT INTO cold_files VALUES (?, ?, NULL)", published)
+                    cur.execute("DELETE FROM events WHERE ts_epoch_us < ?", [cutoff_us])
+                    # Widen reads to the cold tier before the commit; until then its new
+                    # files are filtered out, so this only costs a scan.
+                    if self._cold_max_epoch_us is None or batch_max > self._cold_max_epoch_us:
+                        self._cold_max_epoch_us = batch_max
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+                self._refresh_cold_watermark()
+        logger.info("Archived %d events older than %s to %s", count, max_age, self.cold_dir)
+        return count
+
+    def compact_cold_events(self) -> int:
+        """
+        KR: 파티션마다 작은 Parquet 파일들을 하나로 병합합니다.
+        EN: Merge the Parquet files of each cold partition into one file.
+        Returns the number of partitions rewritten.
+
+        The merged file replaces its sources in `cold_files` in one transaction; the
+        sources stay on disk for `cold_retire_grace_s` so scans already reading them
+        finish, then `_sweep_cold_files` deletes them.
+        """
+        if not os.path.isdir(self.cold_dir):
+            return 0
+        compacted = 0
+        with self._cold_lock:
+            with self.cursor() as cur:
+                active = cur.execute(
+                    "SELECT partition, name FROM cold_files WHERE retired_at IS NULL ORDER BY ALL"
+                ).fetchall()
+            partitions: dict[str, list[str]] = {}
+            for partition, name in active:
+                partitions.setdefault(partition, []).append(name)
+            for partition, names in partitions.items():
+                if len(names) < 2:
+                    continue
+                partition_dir = os.path.join(self.cold_dir, partition)
+                target_name = f"events_{uuid.uuid4()}.parquet"
+                target = os.path.join(partition_dir, target_name)
+                # Write under a name the reader glob ignores, then swap it in.
+                tmp_target = f"{target}.tmp"
+                sources = ", ".join(
+                    "'" + os.path.join(partition_dir, name).replace("'", "''") + "'"
+                    for name in names
+                )
+                with self.cursor() as cur:
+                    cur.execute(
+                        f"""
+                        COPY (
+                            SELECT * FROM read_parquet([{sources}])
+                            ORDER BY ts_epoch_us, event_id
+                        ) TO '{tmp_target.replace("'", "''")}' (FORMAT PARQUET)
+                        """
+                    )
+                os.replace(tmp_target, target)
+                with self.transaction() as cur:
+                    cur.execute(
+                        """
+                        UPDATE cold_files SET retired_at = ?
+                        WHERE name IN (SELECT unnest(?::VARCHAR[]))
+                        """,
+                        [time.time(), names],
+                    )
+                    cur.execute(
+                        "INSERT INTO cold_files VALUES (?, ?, NULL)",
+                        [target_name, partition],
+                    )
+                compacted += 1
+            self._sweep_cold_files()
+        return compacted
+
+    def _sweep_cold_files(self) -> int:
+        """
+        KR: 유예 시간이 지난 retire/미등록 콜드 파일을 삭제합니다.
+        EN: Delete cold files retired (or never published) more than
+        `cold_retire_grace_s` ago. Returns the number of files removed; files that
+        cannot be removed yet (e.g. still open on Windows) are retried next time.
+        Caller holds `_cold_lock`.
+        """
+        deadline = time.time() - self.cold_retire_grace_s
+        with self.cursor() as cur:
+            rows = cur.execute("SELECT name, partition, retired_at FROM cold_files").fetchall()
+        listed = {name for name, _, _ in rows}
+        doomed = [
+            (partition, name)
+            for name, partition, retired_at in rows
+            if retired_at is not None and retired_at <= deadline
+        ]
+        for partition, name in self._cold_files_on_disk():
+            if name in listed:
+                continue
+            path = os.path.join(self.cold_dir, partition, name)
+            try:
+                if os.path.getmtime(path) <= deadline:
+                    doomed.append((partition, name))
+            except OSError:
+                continue
+        removed: list[str] = []
+        for partition, name in doomed:
+            try:
+                os.remove(os.path.join(self.cold_dir, partition, name))
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                logger.warning("Could not remove cold file %s/%s: %s", partition, name, exc)
+                continue
+            removed.append(name)
+        if removed:
+            with self.transaction() as cur:
+                cur.execute(
+                    "DELETE FROM cold_files WHERE name IN (SELECT unnest(?::VARCHAR[]))",
+                    [removed],
+                )
+        return len(removed)
+
+    def _insert_events(
+        self,
+        cur: duckdb.DuckDBPyConnection,
+        events: Sequence[Event],
+        ignore_duplicates: bool = False,
+    ) -> set[str]:
+        """
+        Insert events on `cur` (inside the caller's transaction), update the derived
+        tables from exactly the rows written, and return their event_ids.
+        """
+        cur.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS _incoming_events AS SELECT * FROM events LIMIT 0",
+        )
+        cur.execute("DELETE FROM _incoming_events")
+        # Binding one JSON document is far cheaper than binding 8 parameters per row.
+        payload = json.dumps([event.model_dump(include=set(EVENT_COLUMNS)) for event in events])
+        cur.execute(
+            f"""
+            INSERT INTO _incoming_events BY NAME
+            SELECT *, {epoch_us_sql("ts")} AS ts_epoch_us
+            FROM (
+                SELECT unnest(from_json(?, '{_EVENT_JSON_SCHEMA}'), recursive := true)
+            )
+            """,
+            [payload],
+        )
+        if ignore_duplicates:
+            cur.execute(
+                """
+                DELETE FROM _incoming_events
+                WHERE event_id IN (SELECT event_id FROM events)
+                   OR rowid NOT IN (
+                       SELECT min(rowid) FROM _incoming_events GROUP BY event_id
+                   )
+                """
+            )
+        inserted = {
+            row[0] for row in cur.execute("SELECT event_id FROM _incoming_events").fetchall()
+        }
+        if not inserted:
+            # e.g. a tail pass re-reading rows this process already wrote: nothing changed,
+            # so caches, the window and table versions stay as they are.
+            return inserted
+        cur.execute("INSERT INTO events BY NAME SELECT * FROM _incoming_events")
+        self._apply_location_metrics(cur, "_incoming_events")
+        self._apply_shipment_state(cur, "_incoming_events")
+        if self.events_window.loaded:
+            rows = self._event_window_rows(cur, "_incoming_events")
+            self._on_commit.append(lambda: self.events_window.merge(rows))
+        self._on_commit.append(lambda: self._bump_table_versions("events"))
+        return inserted
+
     def append_event(self, event: Event) -> None:
         """이벤트를 추가합니다. / Append an event."""
-        self.conn.execute(
+        self.append_events([event])
+
+    def append_events(self, events: Sequence[Event]) -> None:
+        """
+        KR: 이벤트 묶음을 하나의 트랜잭션으로 추가합니다.
+        EN: Append a batch of events in a single transaction (all-or-nothing).
+        """
+        if not events:
+            return
+        with self.transaction() as cur:
+            self._insert_events(cur, events)
+
+    def _get_checkpoint(self, source: str) -> Optional[tuple[int, str]]:
+        with self.cursor() as cur:
+            row = cur.execute(
+                "SELECT byte_offset, row_hash FROM ingest_checkpoints WHERE source = ?",
+                [source],
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _save_checkpoint(
+        self,
+        cur: duckdb.DuckDBPyConnection,
+        source: str,
+        byte_offset: int,
+        row_hash: str,
+    ) -> None:
+        cur.execute(
             """
-            INSERT INTO events (event_id, ts, shpt_no, status, location_id, lat, lon, remark)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO ingest_checkpoints (source, byte_offset, row_hash, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(source) DO UPDATE SET
+              byte_offset=excluded.byte_offset,
+              row_hash=excluded.row_hash,
+              updated_at=excluded.updated_at
             """,
             [
-                event.event_id,
-                event.ts,
-                event.shpt_no,
-                event.status,
-                event.location_id,
-                event.lat,
-                event.lon,
-                event.remark,
+                source,
+                byte_offset,
+                row_hash,
+                datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
             ],
         )
 
+    @staticmethod
+    def _row_hash(data: bytes) -> str:
+        """Hash of the last line in `data` (trailing newline ignored)."""
+        line = data.rstrip(b"\r\n").rsplit(b"\n", 1)[-1]
+        return hashlib.sha256(line.rstrip(b"\r")).hexdigest()
+
+    def _last_row_hash(self, path: str, byte_offset: int) -> str:
+        """Hash of the complete line ending right before `byte_offset`."""
+        if byte_offset <= 0:
+            return ""
+        with open(path, "rb") as f:
+            start = max(0, byte_offset - TAIL_VERIFY_WINDOW)
+            f.seek(start)
+            window = f.read(byte_offset - start)
+        return self._row_hash(window)
+
+    def _complete_prefix(self, path: str) -> tuple[int, str]:
+        """Offset just past the last newline in `path`, with the hash of that last row."""
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            start = max(0, size - TAIL_VERIFY_WINDOW)
+            f.seek(start)
+            window = f.read()
+        cut = window.rfind(b"\n")
+        if cut < 0:
+            return 0, ""
+        offset = start + cut + 1
+        return offset, self._last_row_hash(path, offset)
+
+    def ingest_events_tail(self, csv_path: Optional[str] = None) -> List[Event]:
+        """
+        KR: events.csv에 새로 추가된 행만 읽어 적재하고, 새로 저장된 이벤트를 반환합니다.
+        EN: Ingest only the rows appended to events.csv since the last checkpoint.
+
+        The checkpoint stores the byte offset after the last complete line plus a hash of
+        that line. A shrunk file or a hash mismatch means the file was rewritten, so the
+        whole file is replayed; known event_ids are skipped either way. A trailing line
+        without a newline is left for the next pass.
+        """
+        path = csv_path or os.path.join(self.data_dir, "events.csv")
+        if not os.path.exists(path):
+            return []
+        size = os.path.getsize(path)
+        checkpoint = self._get_checkpoint(path)
+        offset = 0
+        if checkpoint is not None:
+            offset, row_hash = checkpoint
+            if offset > size or self._last_row_hash(path, offset) != row_hash:
+                logger.warning("%s was rewritten since last ingest; replaying from start", path)
+                offset = 0
+        if offset == size:
+            return []
+
+        with open(path, "rb") as f:
+            header = f.readline()
+            f.seek(max(offset, len(header)))
+            chunk = f.read(size - f.tell())
+        cut = chunk.rfind(b"\n")
+        if cut < 0:
+            return []
+        chunk = chunk[: cut + 1]
+        new_offset = max(offset, len(header)) + len(chunk)
+
+        fieldnames = next(csv.reader([header.decode("utf-8-sig")]))
+        reader = csv.DictReader(io.StringIO(chunk.decode("utf-8")), fieldnames=fieldnames)
+        events: List[Event] = []
+        for row in reader:
+            try:
+                events.append(Event.model_validate(row))
+            except Exception as exc:
+                logger.warning("Skipping event row from %s: %s", path, exc)
+
+        if offset == 0 and events and self._cold_max_epoch_us is not None:
+            # Replays must not resurrect rows that were already moved to the cold tier.
+            with self.cursor() as cur:
+                archived = {
+                    row[0]
+                    for row in cur.execute(
+                        self._cold_scan("event_id", "event_id IN (SELECT unnest(?::VARCHAR[]))"),
+                        [[event.event_id for event in events]],
+                    ).fetchall()
+                }
+            events = [event for event in events if event.event_id not in archived]
+
+        with self.transaction() as cur:
+            inserted = self._insert_events(cur, events, ignore_duplicates=True) if events else set()
+            self._save_checkpoint(cur, path, new_offset, self._row_hash(chunk))
+        return [event for event in events if event.event_id in inserted]
+
     def close(self) -> None:
         """DB 연결을 닫습니다. / Close the DB connection."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
         self.conn.close()
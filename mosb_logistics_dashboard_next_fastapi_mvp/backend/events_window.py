@@ -0,0 +1,142 @@
+import threading
+from bisect import bisect_left
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from cachetools import LRUCache
+
+from cache import MIB, CachedJson, sizeof
+
+# NULL timestamps sort after every real one in `ts_epoch_us DESC NULLS LAST`.
+_NULL_TS = -(2**63)
+
+# (ts_epoch_us, event_id, JSON object of the row as returned by `/api/events`)
+EventRow = Tuple[Optional[int], str, str]
+
+
+class EventsWindow:
+    """
+    KR: 최신 이벤트를 정렬된 상태로 메모리에 유지하는 버전 관리 창입니다.
+    EN: Sorted, versioned in-memory window over the newest events, kept as pre-encoded
+    JSON objects ordered by (ts_epoch_us, event_id).
+
+    New events are merged in place (`merge`), so appends never wipe it; `since` queries
+    bisect the window (`query`). The window holds every event whose key is above
+    `floor` (None: every event), trimming the oldest rows past `max_rows`; queries that
+    reach below the floor return None and the caller falls back to DuckDB. `clear` is
+    for deletes and corrections only.
+
+    Encoded responses are memoized per `since` until the next version, at most
+    `max_body_bytes` in total; a body larger than that is served but not kept.
+    """
+
+    def __init__(self, max_rows: int = 100_000, max_body_bytes: int = 64 * MIB):
+        self.max_rows = max(1, max_rows)
+        self.version = 0
+        self.loaded = False
+        self.floor: Optional[Tuple[int, str]] = None
+        self._keys: List[Tuple[int, str]] = []
+        self._rows: List[bytes] = []
+        self._ids: set[str] = set()
+        # Encoded responses of the current version, keyed by since_us, bounded by bytes.
+        self._bodies: LRUCache = LRUCache(maxsize=max(1, max_body_bytes), getsizeof=sizeof)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def _key(ts_epoch_us: Optional[int], event_id: str) -> Tuple[int, str]:
+        return (_NULL_TS if ts_epoch_us is None else ts_epoch_us, event_id)
+
+    def load(self, rows: Sequence[EventRow]) -> None:
+        """
+        KR: 최신 행(최신순, 최대 max_rows + 1개)으로 창을 채웁니다.
+        EN: Fill the window from the newest `max_rows + 1` rows, newest first; an extra
+        row past `max_rows` becomes the floor, i.e. older events exist.
+        """
+        rows = list(rows)
+        floor = None
+        if len(rows) > self.max_rows:
+            floor = self._key(rows[self.max_rows][0], rows[self.max_rows][1])
+            rows = rows[: self.max_rows]
+        with self._lock:
+            self._keys = [self._key(ts, event_id) for ts, event_id, _ in reversed(rows)]
+            self._rows = [body.encode("utf-8") for _, _, body in reversed(rows)]
+            self._ids = {event_id for _, event_id, _ in rows}
+            self.floor = floor
+            self.loaded = True
+            self._bump()
+
+    def merge(self, rows: Iterable[EventRow]) -> int:
+        """
+        KR: 새 이벤트를 정렬 위치에 병합합니다. 추가된 행 수를 반환합니다.
+        EN: Merge committed events into place and return how many were added. Rows at or
+        below the floor, and ids already present, are skipped.
+        """
+        with self._lock:
+            if not self.loaded:
+                return 0
+            new = [
+                (self._key(ts, event_id), body.encode("utf-8"))
+                for ts, event_id, body in rows
+                if event_id not in self._ids
+            ]
+            if self.floor is not None:
+                new = [item for item in new if item[0] > self.floor]
+            if not new:
+                return 0
+            if len(new) <= 64:
+                for key, body in new:
+                    index = bisect_left(self._keys, key)
+                    self._keys.insert(index, key)
+                    self._rows.insert(index, body)
+            else:
+                merged = sorted([*zip(self._keys, self._rows), *new], key=lambda item: item[0])
+                self._keys = [key for key, _ in merged]
+                self._rows = [body for _, body in merged]
+            self._ids.update(key[1] for key, _ in new)
+            overflow = len(self._keys) - self.max_rows
+            if overflow > 0:
+                self.floor = self._keys[overflow - 1]
+                self._ids.difference_update(key[1] for key in self._keys[:overflow])
+                del self._keys[:overflow]
+                del self._rows[:overflow]
+            self._bump()
+            return len(new)
+
+    def query(self, since_us: Optional[int] = None) -> Optional[CachedJson]:
+        """
+        KR: `since` 이후 이벤트를 최신순 JSON으로 반환합니다. 창 밖이면 None.
+        EN: Return events with ts_epoch_us >= `since_us` (all events when None) as a JSON
+        array, newest first, or None when the window does not cover the range.
+        """
+        with self._lock:
+            if not self.loaded:
+                return None
+            if self.floor is not None and (since_us is None or self.floor[0] >= since_us):
+                return None
+            entry = self._bodies.get(since_us)
+            if entry is not None:
+                return entry
+            start = 0 if since_us is None else bisect_left(self._keys, (since_us, ""))
+            entry = CachedJson.from_bytes(b"[" + b",".join(reversed(self._rows[start:])) + b"]")
+            if sizeof(entry) <= self._bodies.maxsize:
+                self._bodies[since_us] = entry
+            return entry
+
+    @property
+    def body_bytes(self) -> int:
+        """KR: 보관 중인 응답 바이트 수입니다. EN: Bytes held by memoized response bodies."""
+        return self._bodies.currsize
+
+    def clear(self) -> None:
+        """KR: 창을 비웁니다(삭제/정정 시). EN: Drop the window; the next query reloads it."""
+        with self._lock:
+            self._keys, self._rows, self._ids = [], [], set()
+            self.floor = None
+            self.loaded = False
+            self._bump()
+
+    def _bump(self) -> None:
+        self.version += 1
+        self._bodies.clear()
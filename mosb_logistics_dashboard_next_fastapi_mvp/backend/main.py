@@ -1,27 +1,49 @@
 from __future__ import annotations
 
+import asyncio
 import csv
+import json
 import logging
 import os
 import uuid
-from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List, Type
-
-from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect, Depends, status
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Literal, Tuple, Type
+
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+    Depends,
+    status,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel
 
-from cache import CacheManager
-from db import Database
+from async_db import AsyncDatabase
+from cache import CachedJson, CacheManager, cache_response, encode_json
+from cache_backend import create_cache_backend
+from db import Database, LocationRegistry
 from models import (
+    CacheStats,
+    EVENT_PAGE_DEFAULT,
+    EVENT_PAGE_MAX,
     Event,
+    EventBatch,
+    EventPage,
     Leg,
     Location,
     Shipment,
+    ShipmentState,
+    KpiSnapshot,
     LocationMetric,
     LocationStatus,
+    LocationStatusBulkUpdate,
+    LocationStatusHistory,
     LocationStatusUpdate,
     derive_status_code,
 )
@@ -33,10 +55,33 @@ from auth import (
     User,
 )
 from rbac import require_role
+from writer import EventWriter
 
 DATA_DIR = os.getenv("DATA_DIR", os.path.join(os.path.dirname(__file__), "data"))
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 WS_PING_INTERVAL = int(os.getenv("WS_PING_INTERVAL", "10"))
+# Seconds between events.csv tail checks; 0 disables incremental ingestion.
+EVENTS_TAIL_INTERVAL = float(os.getenv("EVENTS_TAIL_INTERVAL", "5"))
+# Events older than this many days move to the Parquet cold tier; 0 disables tiering.
+EVENTS_HOT_RETENTION_DAYS = float(os.getenv("EVENTS_HOT_RETENTION_DAYS", "0"))
+EVENTS_TIERING_INTERVAL = float(os.getenv("EVENTS_TIERING_INTERVAL", "3600"))
+# Group commit for event appends: flush after this many rows or this many milliseconds.
+EVENT_WRITE_BATCH_SIZE = int(os.getenv("EVENT_WRITE_BATCH_SIZE", "500"))
+EVENT_WRITE_BATCH_WINDOW_MS = float(os.getenv("EVENT_WRITE_BATCH_WINDOW_MS", "5"))
+# Threads running DB calls for async handlers (0 = LOGISTICS_DB_POOL_SIZE) and the cap on
+# calls queued or running before further callers wait.
+DB_EXECUTOR_WORKERS = int(os.getenv("LOGISTICS_DB_EXECUTOR_WORKERS", "0"))
+DB_EXECUTOR_QUEUE = int(os.getenv("LOGISTICS_DB_EXECUTOR_QUEUE", "64"))
+# Seconds between location status history rollup/retention passes; 0 disables them.
+LOCATION_STATUS_ROLLUP_INTERVAL = float(os.getenv("LOCATION_STATUS_ROLLUP_INTERVAL", "60"))
+# Locations/legs/shipments caches: served stale after the soft TTL while reloading in
+# the background, dropped after the hard TTL.
+REFERENCE_CACHE_SOFT_TTL = float(os.getenv("REFERENCE_CACHE_SOFT_TTL", "300"))
+REFERENCE_CACHE_HARD_TTL = float(os.getenv("REFERENCE_CACHE_HARD_TTL", "3600"))
+# Shared cache tier + invalidation bus for multi-worker deployments, e.g.
+# "sqlite:///./data/cache.sqlite3"; empty keeps caches per process.
+CACHE_BACKEND_URL = os.getenv("CACHE_BACKEND_URL", "")
+CACHE_BUS_POLL_INTERVAL = float(os.getenv("CACHE_BUS_POLL_INTERVAL", "0.2"))
 logging.basicConfig(level=LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
@@ -50,6 +95,10 @@ def read_csv(path: str) -> List[Dict[str, Any]]:
 
 
 def append_event(event: Dict[str, Any]) -> None:
+    append_events([event])
+
+
+def append_events(events: List[Dict[str, Any]]) -> None:
     path = os.path.join(DATA_DIR, "events.csv")
     exists = os.path.exists(path)
     fieldnames = ["event_id", "ts", "shpt_no", "status", "location_id", "lat", "lon", "remark"]
@@ -57,13 +106,17 @@ def append_event(event: Dict[str, Any]) -> None:
         w = csv.DictWriter(f, fieldnames=fieldnames)
         if not exists:
             w.writeheader()
-        w.writerow({k: event.get(k, "") for k in fieldnames})
+        w.writerows({k: event.get(k, "") for k in fieldnames} for event in events)
 
 
 def iso_now() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
+def new_event_id() -> str:
+    return f"EV-{uuid.uuid4().hex[:12]}"
+
+
 def parse_iso_ts(value: str) -> Optional[datetime]:
     if not value:
         return None
@@ -76,6 +129,50 @@ def parse_iso_ts(value: str) -> Optional[datetime]:
         return None
 
 
+def cached_json_response(entry: CachedJson, etag: Optional[str] = None) -> Response:
+    """
+    KR: 캐시된 JSON 바이트를 그대로 반환합니다(검증/직렬화 없음).
+    EN: Return a cached, pre-encoded JSON body as-is, skipping `response_model`
+    validation and serialization. `etag` defaults to the content hash.
+    """
+    if etag is None:
+        return Response(
+            content=entry.body,
+            media_type="application/json",
+            headers={"ETag": f'"{entry.etag}"'},
+        )
+    return Response(content=entry.body, media_type="application/json", headers=etag_headers(etag))
+
+
+# Table versions restart at 0 with the process; the epoch keeps old ETags from matching.
+ETAG_EPOCH = uuid.uuid4().hex[:8]
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    # no-cache: browsers keep the body but revalidate with If-None-Match on every poll.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def table_etag(table: str) -> str:
+    """KR: 테이블 버전 기반 ETag입니다. EN: Weak ETag derived from the table's version."""
+    return f'W/"{ETAG_EPOCH}-{table}-{db.table_version(table)}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    KR: If-None-Match가 일치하면 304 응답을 반환합니다.
+    EN: Return a 304 response when `If-None-Match` matches `etag` (weak comparison),
+    else None. Call before touching the cache or the DB.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
+
+
 def parse_rows(rows: List[Dict[str, Any]], model: Type[BaseModel], label: str):
     parsed = []
     for row in rows:
@@ -87,7 +184,59 @@ def parse_rows(rows: List[Dict[str, Any]], model: Type[BaseModel], label: str):
 
 
 db = Database()
-cache = CacheManager()
+# Async handlers must reach DuckDB through `adb` so the event loop never blocks on a query.
+adb = AsyncDatabase(db, max_workers=DB_EXECUTOR_WORKERS, max_pending=DB_EXECUTOR_QUEUE)
+cache = CacheManager(
+    reference_soft_ttl=REFERENCE_CACHE_SOFT_TTL,
+    reference_hard_ttl=REFERENCE_CACHE_HARD_TTL,
+    backend=create_cache_backend(CACHE_BACKEND_URL, poll_interval=CACHE_BUS_POLL_INTERVAL),
+)
+# Committed writes clear the cache namespaces tagged with the written tables.
+db.on_table_write(cache.invalidate_tags)
+# Set by `events_tail_loop`: (its event loop, the event that cuts its sleep short).
+events_tail_wakeup: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = None
+
+
+def wake_events_tail(namespaces: Tuple[str, ...]) -> None:
+    """
+    KR: 다른 워커가 이벤트를 커밋하면 공유 events.csv 꼬리 읽기를 바로 깨웁니다.
+    EN: Remote invalidation listener. Every worker has its own DuckDB file, but all of
+    them append to the same events.csv; when another worker commits events, read the
+    tail now instead of at the next `EVENTS_TAIL_INTERVAL`.
+    """
+    if events_tail_wakeup is not None and "events" in namespaces:
+        loop, wakeup = events_tail_wakeup
+        loop.call_soon_threadsafe(wakeup.set)
+
+
+cache.on_remote_invalidation(wake_events_tail)
+
+
+def commit_events(events: List[Event]) -> None:
+    """
+    KR: 이벤트 묶음을 DB와 events.csv에 한 번에 기록하고 캐시를 한 번 무효화합니다.
+    EN: Persist a group of events to DuckDB and events.csv, then invalidate caches once.
+    """
+    try:
+        db.append_events(events)
+    except Exception as exc:
+        logger.warning("DB event append failed (%d events): %s", len(events), exc)
+        committed = False
+    else:
+        # The commit's `on_table_write` listener has invalidated the events caches.
+        committed = True
+    append_events([event.model_dump() for event in events])
+    if not committed:
+        # The events only reached the CSV fallback, which no table write reports.
+        cache.invalidate_tags("events")
+
+
+event_writer = EventWriter(
+    commit_events,
+    max_batch=EVENT_WRITE_BATCH_SIZE,
+    max_delay=EVENT_WRITE_BATCH_WINDOW_MS / 1000,
+    run=adb.run,
+)
 
 app = FastAPI(title="MOSB Logistics Live API", version="0.1.0")
 
@@ -110,12 +259,118 @@ app.add_middleware(
 )
 
 
+background_tasks: List[asyncio.Task] = []
+
+
+async def events_tail_loop(path: Optional[str] = None, interval: Optional[float] = None) -> None:
+    """
+    KR: events.csv 변경을 감지해 새로 추가된 행만 적재하고 브로드캐스트합니다.
+    EN: Watch events.csv (size/mtime) and ingest rows appended by external tools and
+    other workers; `wake_events_tail` cuts the wait short for the latter.
+    """
+    global events_tail_wakeup
+    path = path or os.path.join(DATA_DIR, "events.csv")
+    interval = EVENTS_TAIL_INTERVAL if interval is None else interval
+    wakeup = asyncio.Event()
+    events_tail_wakeup = (asyncio.get_running_loop(), wakeup)
+    last_signature = None
+    while True:
+        try:
+            await asyncio.wait_for(wakeup.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            # The other worker appends to events.csv just after the commit it announced.
+            await asyncio.sleep(CACHE_BUS_POLL_INTERVAL)
+        wakeup.clear()
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if signature == last_signature:
+            continue
+        try:
+            events = await adb.ingest_events_tail(path)
+        except Exception as exc:
+            logger.warning("Events tail ingest failed for %s: %s", path, exc)
+            continue
+        last_signature = signature
+        if events:
+            logger.info("Ingested %d new events from %s", len(events), path)
+            await hub.broadcast(
+                {
+                    "type": "events",
+                    "events": [event.model_dump() for event in events],
+                    **kpi_delta_fields(),
+                },
+            )
+
+
+async def events_tiering_loop() -> None:
+    """
+    KR: 오래된 이벤트를 Parquet 콜드 티어로 옮기고 작은 파일을 병합합니다.
+    EN: Periodically archive old events to the Parquet cold tier and compact partitions.
+    """
+    max_age = timedelta(days=EVENTS_HOT_RETENTION_DAYS)
+    while True:
+        try:
+            archived = await adb.archive_events(max_age)
+            compacted = await adb.compact_cold_events()
+            if archived or compacted:
+                logger.info(
+                    "Events tiering: archived=%d compacted_partitions=%d",
+                    archived,
+                    compacted,
+                )
+        except Exception as exc:
+            logger.warning("Events tiering failed: %s", exc)
+        await asyncio.sleep(EVENTS_TIERING_INTERVAL)
+
+
+async def location_status_rollup_loop(interval: Optional[float] = None) -> None:
+    """
+    KR: 위치 상태 이력을 주기적으로 집계하고 보존 기간을 적용합니다.
+    EN: Periodically roll location status history up to 1m/1h/1d and prune by retention.
+    """
+    interval = LOCATION_STATUS_ROLLUP_INTERVAL if interval is None else interval
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            rolled = await adb.rollup_location_status_history()
+            pruned = await adb.prune_location_status_history()
+            if rolled or pruned:
+                logger.info("Location status history: rolled_up=%d pruned=%d", rolled, pruned)
+        except Exception as exc:
+            logger.warning("Location status rollup failed: %s", exc)
+
+
 @app.on_event("startup")
 async def startup_log() -> None:
     """KR: 앱 시작 로그를 남깁니다. EN: Log application startup."""
     logger.info("MOSB Logistics API startup")
 
 
+@app.on_event("startup")
+async def warm_caches() -> None:
+    """KR: 준비 완료 전에 참조 캐시를 채웁니다. EN: Warm reference caches before serving."""
+    try:
+        await warm_reference_caches()
+    except Exception as exc:
+        logger.warning("Reference cache warm-up failed: %s", exc)
+
+
+@app.on_event("startup")
+async def start_background_tasks() -> None:
+    """KR: 백그라운드 작업을 시작합니다. EN: Start background jobs."""
+    if EVENTS_TAIL_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(events_tail_loop()))
+    if EVENTS_HOT_RETENTION_DAYS > 0:
+        background_tasks.append(asyncio.create_task(events_tiering_loop()))
+    if LOCATION_STATUS_ROLLUP_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(location_status_rollup_loop()))
+
+
 @app.on_event("shutdown")
 async def shutdown_cleanup() -> None:
     """
@@ -129,8 +384,16 @@ async def shutdown_cleanup() -> None:
     - Clear cache
     - Close DB connection
     """
+    global events_tail_wakeup
     logger.info("MOSB Logistics API shutdown initiated")
 
+    # 0. 백그라운드 작업 중지
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
+    events_tail_wakeup = None
+    await event_writer.close()
+
     # 1. WebSocket 클라이언트 연결 종료
     try:
         if hub.clients:
@@ -150,12 +413,14 @@ async def shutdown_cleanup() -> None:
     # 2. 캐시 정리
     try:
         cache.invalidate_all()
+        cache.close()
         logger.debug("Cache cleared on shutdown")
     except Exception as exc:
         logger.warning("Cache cleanup failed on shutdown: %s", exc)
 
     # 3. DB 연결 종료
     try:
+        adb.close()
         db.close()
         logger.info("Database connection closed")
     except Exception as exc:
@@ -202,58 +467,227 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 
 
 @app.get("/api/locations", response_model=list[Location])
-def get_locations(current_user: User = Depends(get_current_user)):
-    cached = cache.get_cached_locations()
-    if cached is not None:
-        return cached
-    try:
-        locations = db.get_locations()
-    except Exception as exc:
-        logger.warning("DB locations fetch failed: %s", exc)
-        rows = read_csv(os.path.join(DATA_DIR, "locations.csv"))
-        locations = parse_rows(rows, Location, "location")
-    cache.set_cached_locations("all", locations)
-    return locations
+def get_locations(request: Request, current_user: User = Depends(get_current_user)):
+    """
+    KR: 메모리 위치 레지스트리에서 응답합니다. 캐시 키에 레지스트리 버전을 포함합니다.
+    EN: Serve from the in-memory location registry; the cache key carries its version,
+    so a registry refresh retires the cached list without an explicit invalidation.
+    A matching `If-None-Match` gets 304.
+    """
+    etag = table_etag("locations")
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+    return cached_json_response(locations_body(db.locations), etag)
 
 
-@app.get("/api/legs", response_model=list[Leg])
-def get_legs(current_user: User = Depends(get_current_user)):
-    cached = cache.get_cached_legs()
-    if cached is not None:
-        return cached
+@cache_response(cache, "legs")
+def load_legs(etag: str) -> CachedJson:
+    """KR: 구간 목록을 ETag별로 캐시합니다. EN: Encoded legs, cached per table ETag."""
     try:
         legs = db.get_legs()
     except Exception as exc:
         logger.warning("DB legs fetch failed: %s", exc)
         rows = read_csv(os.path.join(DATA_DIR, "legs.csv"))
         legs = parse_rows(rows, Leg, "leg")
-    cache.set_cached_legs("all", legs)
-    return legs
+    return CachedJson.encode(legs)
 
 
-@app.get("/api/shipments", response_model=list[Shipment])
-def get_shipments(current_user: User = Depends(require_role(["OPS", "FINANCE", "ADMIN"]))):
-    cached = cache.get_cached_shipments()
-    if cached is not None:
-        return cached
+@cache_response(cache, "shipments")
+def load_shipments(etag: str) -> CachedJson:
+    """KR: 운송 목록을 ETag별로 캐시합니다. EN: Encoded shipments, cached per table ETag."""
     try:
         shipments = db.get_shipments()
     except Exception as exc:
         logger.warning("DB shipments fetch failed: %s", exc)
         rows = read_csv(os.path.join(DATA_DIR, "shipments.csv"))
         shipments = parse_rows(rows, Shipment, "shipment")
-    cache.set_cached_shipments("all", shipments)
-    return shipments
+    return CachedJson.encode(shipments)
+
+
+@cache_response(cache, "locations", key=lambda registry: registry.version)
+def locations_body(registry: LocationRegistry) -> CachedJson:
+    """KR: 위치 레지스트리 버전별 캐시입니다. EN: Encoded registry, cached per registry version."""
+    return CachedJson.encode(registry.values())
+
+
+async def warm_reference_caches() -> None:
+    """
+    KR: 참조 데이터 캐시(위치/구간/운송)를 미리 채웁니다.
+    EN: Preload the locations, legs and shipments caches, under the keys the endpoints
+    use, so the first requests after startup are cache hits.
+    """
+    start = asyncio.get_running_loop().time()
+    await adb.run(locations_body, db.locations)
+    await adb.run(load_legs, table_etag("legs"))
+    await adb.run(load_shipments, table_etag("shipments"))
+    logger.info(
+        "Warmed reference caches in %.0f ms",
+        (asyncio.get_running_loop().time() - start) * 1000,
+    )
+
+
+@app.get("/api/legs", response_model=list[Leg])
+def get_legs(request: Request, current_user: User = Depends(get_current_user)):
+    # Keyed by the version read before the data: a racing write can only leave an
+    # older ETag on newer data, never the reverse.
+    etag = table_etag("legs")
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+    return cached_json_response(load_legs(etag), etag)
+
+
+@app.get("/api/shipments", response_model=list[Shipment])
+def get_shipments(
+    request: Request,
+    current_user: User = Depends(require_role(["OPS", "FINANCE", "ADMIN"])),
+):
+    etag = table_etag("shipments")
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+    return cached_json_response(load_shipments(etag), etag)
+
+
+@app.get("/api/shipments/state", response_model=list[ShipmentState])
+def get_shipment_state(current_user: User = Depends(get_current_user)):
+    """
+    KR: 운송별 현재 상태(최신 이벤트, 현재 구간, 마지막 위치)를 반환합니다.
+    EN: Return each shipment's latest event, current leg and last location, so clients
+    do not download and reduce the whole event log.
+    """
+    return cached_json_response(shipment_state_body(table_etag("events")))
+
+
+# Events loaders are keyed by the events version read before the query: a load racing
+# a commit caches the old rows under the old key, which no request asks for again.
+# Stored with the events cache so every event append also clears them.
+@cache_response(cache, "events")
+def shipment_state_body(etag: str) -> CachedJson:
+    try:
+        body = db.get_shipment_state_json()
+    except Exception as exc:
+        logger.warning("DB shipment state fetch failed: %s", exc)
+        body = b"[]"
+    return CachedJson.from_bytes(body)
+
+
+@app.get("/api/shipments/{shpt_no}/legs", response_model=list[Leg])
+def get_shipment_legs(shpt_no: str, current_user: User = Depends(get_current_user)):
+    """KR: 한 운송의 구간 목록을 반환합니다. EN: Return the legs of one shipment."""
+    return cached_json_response(shipment_legs_body(table_etag("legs"), shpt_no))
 
 
-@app.get("/api/events", response_model=list[Event])
-def get_events(since: Optional[str] = None, current_user: User = Depends(get_current_user)):
-    cache_key = f"events:{since or 'all'}"
-    cached = cache.get_cached_events(cache_key)
-    if cached is not None:
-        return cached
+@cache_response(cache, "legs")
+def shipment_legs_body(etag: str, shpt_no: str) -> CachedJson:
     try:
-        events = db.get_events(since)
+        legs = db.get_shipment_legs(shpt_no)
+    except Exception as exc:
+        logger.warning("DB shipment legs fetch failed: %s", exc)
+        rows = read_csv(os.path.join(DATA_DIR, "legs.csv"))
+        legs = parse_rows([r for r in rows if r.get("shpt_no") == shpt_no], Leg, "leg")
+    return CachedJson.encode(legs)
+
+
+def csv_events_for(column: str, value: str, since: Optional[str]) -> List[Event]:
+    """KR: DB 장애 시 events.csv에서 조회합니다. EN: CSV fallback for per-key event lookups."""
+    since_dt = parse_iso_ts(since) if since else None
+    out = []
+    for r in read_csv(os.path.join(DATA_DIR, "events.csv")):
+        if r.get(column) != value:
+            continue
+        ts = parse_iso_ts(r.get("ts", ""))
+        if since_dt and not (ts and ts >= since_dt):
+            continue
+        out.append(r)
+    return parse_rows(out, Event, "event")
+
+
+@app.get("/api/shipments/{shpt_no}/events", response_model=list[Event])
+def get_shipment_events(
+    shpt_no: str,
+    since: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    KR: 한 운송의 이벤트를 최신순으로 반환합니다.
+    EN: Return one shipment's events, newest first.
+    """
+    return cached_json_response(shipment_events_body(table_etag("events"), shpt_no, since))
+
+
+@cache_response(cache, "events")
+def shipment_events_body(etag: str, shpt_no: str, since: Optional[str]) -> CachedJson:
+    try:
+        body = db.get_shipment_events_json(shpt_no, since)
+    except Exception as exc:
+        logger.warning("DB shipment events fetch failed: %s", exc)
+        body = encode_json(csv_events_for("shpt_no", shpt_no, since))
+    return CachedJson.from_bytes(body)
+
+
+@app.get("/api/locations/{location_id}/events", response_model=list[Event])
+def get_location_events(
+    location_id: str,
+    since: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=EVENT_PAGE_MAX),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    KR: 한 위치의 이벤트를 최신순으로 반환합니다. `limit`으로 개수를 제한합니다.
+    EN: Return one location's events, newest first; `limit` keeps only the latest rows.
+    """
+    return cached_json_response(
+        location_events_body(table_etag("events"), location_id, since, limit)
+    )
+
+
+@cache_response(cache, "events")
+def location_events_body(
+    etag: str, location_id: str, since: Optional[str], limit: Optional[int]
+) -> CachedJson:
+    try:
+        body = db.get_location_events_json(location_id, since, limit)
+    except Exception as exc:
+        logger.warning("DB location events fetch failed: %s", exc)
+        events = csv_events_for("location_id", location_id, since)
+        if limit is not None:
+            # The CSV is append-only, so the latest rows are at the end.
+            events = events[-limit:]
+        body = encode_json(events)
+    return CachedJson.from_bytes(body)
+
+
+@app.get("/api/events", response_model=list[Event] | EventPage)
+def get_events(
+    since: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=EVENT_PAGE_MAX),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    KR: 이벤트 목록을 반환합니다. `limit`/`cursor`를 주면 키셋 페이지로 응답합니다.
+    EN: Return events. With `limit` or `cursor`, respond with a keyset page
+    `{"events": [...], "next_cursor": ...}`; without them, the full list as before.
+    """
+    if limit is not None or cursor:
+        return get_events_page(since, limit or EVENT_PAGE_DEFAULT, cursor)
+    try:
+        # The events window absorbs appends, so polling survives a steady trickle.
+        entry = db.get_events_window_json(since)
+    except Exception as exc:
+        logger.warning("Events window read failed: %s", exc)
+        entry = None
+    if entry is not None:
+        return cached_json_response(entry)
+    return cached_json_response(events_body(table_etag("events"), since))
+
+
+@cache_response(cache, "events")
+def events_body(etag: str, since: Optional[str]) -> CachedJson:
+    try:
+        body = db.get_events_json(since)
     except Exception as exc:
         logger.warning("DB events fetch failed: %s", exc)
         rows = read_csv(os.path.join(DATA_DIR, "events.csv"))
@@ -270,8 +704,52 @@ def get_events(since: Optional[str] = None, current_user: User = Depends(get_cur
                     if ts and ts >= since_dt:
                         out.append(r)
                 events = parse_rows(out, Event, "event")
-    cache.set_cached_events(cache_key, events)
-    return events
+        body = encode_json(events)
+    return CachedJson.from_bytes(body)
+
+
+def get_events_page(since: Optional[str], limit: int, cursor: Optional[str]) -> Response:
+    return cached_json_response(events_page_body(table_etag("events"), since, limit, cursor))
+
+
+@cache_response(cache, "events")
+def events_page_body(
+    etag: str, since: Optional[str], limit: int, cursor: Optional[str]
+) -> CachedJson:
+    try:
+        events_body, next_cursor = db.get_events_page_json(since, limit, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    cursor_body = json.dumps(next_cursor).encode()
+    return CachedJson.from_bytes(
+        b'{"events":' + events_body + b',"next_cursor":' + cursor_body + b"}"
+    )
+
+
+@app.get("/api/kpis", response_model=KpiSnapshot)
+def get_kpis(
+    by: Literal["all", "vendor", "priority", "mode"] = "all",
+    current_user: User = Depends(get_current_user),
+):
+    """
+    KR: 운송 최신 상태별 KPI 카운터를 반환합니다. `by`로 벤더/우선순위/구간 모드별 분할.
+    EN: Return shipment counts by latest status (Planned / In Transit / Arrived /
+    Delayed ...), optionally sliced by shipment vendor or priority, or current leg mode.
+    Counters are maintained on every event append; `kpi_deltas` WS frames with a
+    higher `version` keep a client copy current.
+    """
+    version, slices = db.get_kpis(by)
+    return KpiSnapshot(version=version, by=by, slices=slices)
+
+
+@app.get("/api/admin/cache/stats", response_model=CacheStats)
+def get_cache_stats(current_user: User = Depends(require_role(["ADMIN"]))):
+    """
+    KR: 네임스페이스별 캐시 설정과 적중/미스/축출/로드 시간/메모리 통계(ADMIN 전용).
+    EN: Per-namespace cache configuration with hit, miss, eviction, load-time and byte
+    counters since startup, plus loads in flight (ADMIN only).
+    """
+    return CacheStats(namespaces=cache.stats(), in_flight=len(cache.flights))
 
 
 # Location metrics endpoints
@@ -283,74 +761,141 @@ def get_location_metrics_api(
     current_user: User = Depends(get_current_user),
 ):
     """KR: 위치 지표를 반환합니다. EN: Return location metrics."""
-    cache_key = f"location_metrics:{since or 'all'}"
-    cached = cache.get_cached_location_metrics(cache_key)
-    if cached is not None:
-        return cached
+    return cached_json_response(
+        location_metrics_body(table_etag("events"), table_etag("location_status"), since)
+    )
+
+
+# Counted from events, listed per location status: keyed by both versions.
+@cache_response(cache, "location_metrics")
+def location_metrics_body(events_etag: str, status_etag: str, since: Optional[str]) -> CachedJson:
     try:
         metrics = db.get_location_metrics(since)
     except Exception as exc:
         logger.warning("DB location metrics fetch failed: %s", exc)
         metrics = []
-    cache.set_cached_location_metrics(cache_key, metrics)
-    return metrics
+    return CachedJson.encode(metrics)
 
 
 # Location status endpoints
 
 
 @app.get("/api/location-status", response_model=list[LocationStatus])
-def get_location_status_api(current_user: User = Depends(get_current_user)):
+def get_location_status_api(request: Request, current_user: User = Depends(get_current_user)):
     """
     Return the latest status for all locations.
+    A matching `If-None-Match` gets 304 without touching the cache or the DB.
     """
-    cached = cache.get_cached_location_status()
-    if cached is not None:
-        return cached
+    etag = table_etag("location_status")
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+    return cached_json_response(location_status_body(etag), etag)
+
+
+@cache_response(cache, "location_status")
+def location_status_body(etag: str) -> CachedJson:
+    """KR: 위치 상태 목록을 ETag별로 캐시합니다. EN: Encoded statuses, cached per table ETag."""
     try:
         status_list = db.get_location_status()
     except Exception as exc:
         logger.warning("DB location status fetch failed: %s", exc)
         status_list = []
-    cache.set_cached_location_status("all", status_list)
-    return status_list
+    return CachedJson.encode(status_list)
 
 
-@app.post("/api/location-status/update")
-async def update_location_status_api(
-    update: LocationStatusUpdate, current_user: User = Depends(require_role(["OPS", "ADMIN"]))
-) -> dict[str, bool]:
+@app.get("/api/location-status/{location_id}/history", response_model=LocationStatusHistory)
+def get_location_status_history_api(
+    location_id: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    resolution: Literal["auto", "raw", "1m", "1h", "1d"] = "auto",
+    current_user: User = Depends(get_current_user),
+):
     """
-    Update or insert a location status record.
-    If status_code is omitted, it will be auto-derived from occupancy_rate.
+    KR: 위치 점유율 이력을 반환합니다. 기본 범위는 최근 24시간입니다.
+    EN: Return a location's occupancy history (min/avg/max per bucket) for
+    [since, until), default the last 24 hours. `resolution=auto` reads the rollup
+    table that fits the range, so long ranges are served from 1h/1d buckets.
+    Rollups trail live updates by up to LOCATION_STATUS_ROLLUP_INTERVAL seconds.
     """
+    if location_id not in db.locations:
+        raise HTTPException(status_code=404, detail=f"Unknown location_id: {location_id}")
+    now = datetime.now(timezone.utc)
+    until_dt = parse_iso_ts(until) if until else now
+    since_dt = parse_iso_ts(since) if since else (until_dt or now) - timedelta(days=1)
+    if since_dt is None or until_dt is None or since_dt >= until_dt:
+        raise HTTPException(
+            status_code=400, detail="since/until must be ISO8601 with since < until"
+        )
+    since_us = int(since_dt.timestamp() * 1_000_000)
+    until_us = int(until_dt.timestamp() * 1_000_000)
+    if resolution == "auto":
+        resolution = db.pick_status_resolution(since_us, until_us, int(now.timestamp() * 1_000_000))
     try:
-        location_ids = {loc.location_id for loc in db.get_locations()}
+        points = db.get_location_status_history(location_id, since_us, until_us, resolution)
     except Exception as exc:
-        logger.warning("Location validation failed: %s", exc)
-        raise HTTPException(status_code=400, detail="Location validation failed") from exc
-    if update.location_id not in location_ids:
-        raise HTTPException(status_code=400, detail=f"Unknown location_id: {update.location_id}")
+        logger.warning("DB location status history fetch failed: %s", exc)
+        points = []
+    return LocationStatusHistory(location_id=location_id, resolution=resolution, points=points)
+
 
+def to_location_status(update: LocationStatusUpdate) -> LocationStatus:
+    """KR: 입력을 출력 모델로 변환합니다. EN: Build the output model, deriving status_code."""
     # Ensure status_code is always set (auto-derive if None)
     status_code = update.status_code if update.status_code is not None else derive_status_code(update.occupancy_rate)
 
     # Create LocationStatus (output model) with guaranteed non-null status_code
-    status = LocationStatus(
+    return LocationStatus(
         location_id=update.location_id,
         occupancy_rate=update.occupancy_rate,
         status_code=status_code,
         last_updated=update.last_updated,
     )
 
-    db.upsert_location_status(status)
-    cache.invalidate_location_status()
-    cache.invalidate_location_metrics()
+
+@app.post("/api/location-status/update")
+async def update_location_status_api(
+    update: LocationStatusUpdate, current_user: User = Depends(require_role(["OPS", "ADMIN"]))
+) -> dict[str, bool]:
+    """
+    Update or insert a location status record.
+    If status_code is omitted, it will be auto-derived from occupancy_rate.
+    """
+    # Validated against the in-memory registry: no DB read on the hot path.
+    if update.location_id not in db.locations:
+        raise HTTPException(status_code=400, detail=f"Unknown location_id: {update.location_id}")
+
+    status = to_location_status(update)
+    await adb.upsert_location_status(status)
     # broadcast update to websocket clients (always non-null status_code)
     await hub.broadcast({"type": "location_status", "payload": status.model_dump()})
     return {"ok": True}
 
 
+@app.post("/api/location-status/bulk")
+async def bulk_update_location_status_api(
+    bulk: LocationStatusBulkUpdate,
+    current_user: User = Depends(require_role(["OPS", "ADMIN"])),
+) -> dict[str, Any]:
+    """
+    KR: 위치 상태 스냅샷을 한 트랜잭션으로 저장하고 WS 프레임 하나로 브로드캐스트합니다.
+    EN: Apply an occupancy feed snapshot: validate every entry, upsert all of them in one
+    transaction, invalidate caches once and broadcast one `location_statuses` frame.
+    A repeated location_id keeps its last entry.
+    """
+    unknown = sorted({u.location_id for u in bulk.updates if u.location_id not in db.locations})
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown location_id: {', '.join(unknown)}")
+    statuses = list({s.location_id: s for s in map(to_location_status, bulk.updates)}.values())
+
+    await adb.upsert_location_statuses(statuses)
+    await hub.broadcast(
+        {"type": "location_statuses", "statuses": [s.model_dump() for s in statuses]},
+    )
+    return {"ok": True, "count": len(statuses)}
+
+
 # Simple websocket broadcaster
 class Hub:
     def __init__(self):
@@ -380,6 +925,17 @@ class Hub:
 hub = Hub()
 
 
+def kpi_delta_fields() -> dict:
+    """
+    KR: 커밋된 KPI 카운터 증감을 이벤트 WS 프레임에 함께 실어 보냅니다.
+    EN: Drain committed KPI counter deltas for the event frame that caused them, as
+    `{"kpi_deltas": [{"version", "deltas"}, ...]}` (empty dict when nothing changed).
+    Draining is one-shot, so concurrent writers never send the same delta twice.
+    """
+    entries = db.drain_kpi_deltas()
+    return {"kpi_deltas": entries} if entries else {}
+
+
 @app.websocket("/ws/events")
 async def ws_events(ws: WebSocket):
     await hub.connect(ws)
@@ -407,23 +963,37 @@ async def post_demo_event(current_user: User = Depends(require_role(["OPS", "ADM
     Demo endpoint: appends a synthetic IN_TRANSIT update and broadcasts to WS clients.
     Replace with real integrations (WMS/ERP/Email/OCR/GPS).
     """
+    location = db.locations.get("MOSB_ESNAAD")
     event = Event(
-        event_id=f"EV-{uuid.uuid4().hex[:8]}",
+        event_id=new_event_id(),
         ts=iso_now(),
         shpt_no="SHPT-AGI-0001",
         status="IN_TRANSIT",
         location_id="MOSB_ESNAAD",
-        lat=24.328853,
-        lon=54.458570,
+        lat=location.lat if location else 24.328853,
+        lon=location.lon if location else 54.458570,
         remark="Demo tick",
     )
     payload = event.model_dump()
-    try:
-        db.append_event(event)
-    except Exception as exc:
-        logger.warning("DB event append failed: %s", exc)
-    append_event(payload)
-    cache.invalidate_events()
-    cache.invalidate_location_metrics()
-    await hub.broadcast({"type": "event", "payload": payload})
+    await event_writer.submit(event)
+    await hub.broadcast({"type": "event", "payload": payload, **kpi_delta_fields()})
     return {"ok": True, "event": event}
+
+
+@app.post("/api/events/batch")
+async def post_event_batch(
+    batch: EventBatch,
+    current_user: User = Depends(require_role(["OPS", "ADMIN"])),
+):
+    """
+    KR: 이벤트 묶음을 한 트랜잭션으로 저장하고 WS로 한 번에 브로드캐스트합니다.
+    EN: Ingest a burst of events (GPS/WMS feeds) in one transaction and broadcast one WS frame.
+    """
+    ts = iso_now()
+    events = [
+        Event(event_id=new_event_id(), ts=ts, **item.model_dump()) for item in batch.events
+    ]
+    payloads = [event.model_dump() for event in events]
+    await adb.run(commit_events, events)
+    await hub.broadcast({"type": "events", "events": payloads, **kpi_delta_fields()})
+    return {"ok": True, "count": len(events), "event_ids": [event.event_id for event in events]}
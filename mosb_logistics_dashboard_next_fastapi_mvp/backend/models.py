@@ -44,6 +44,94 @@ class Event(EventCreate):
     ts: str
 
 
+class ShipmentState(BaseModel):
+    """
+    KR: 운송별 현재 상태(최신 이벤트, 현재 구간, 마지막 위치)입니다.
+    EN: Current state of one shipment: its latest event, current leg and last location.
+    """
+
+    shpt_no: str
+    event_id: str
+    ts: str
+    status: Literal["PLANNED", "IN_TRANSIT", "ARRIVED", "DELAYED", "HOLD"]
+    location_id: str
+    lat: float
+    lon: float
+    remark: str = ""
+    current_leg_id: Optional[str] = None
+
+
+class KpiSlice(BaseModel):
+    """KR: KPI 카운터 한 조각입니다. EN: Shipment counts by latest status for one slice."""
+
+    slice: str = ""
+    counts: dict[str, int] = Field(default_factory=dict)
+    total: int = 0
+
+
+class KpiSnapshot(BaseModel):
+    """
+    KR: KPI 카운터 응답입니다. `version`은 WS `kpi_deltas` 프레임과 맞춰 사용합니다.
+    EN: KPI counters response; apply WS `kpi_deltas` frames with a higher `version`.
+    """
+
+    version: int
+    by: Literal["all", "vendor", "priority", "mode"]
+    slices: list[KpiSlice]
+
+
+class CacheNamespaceStats(BaseModel):
+    """
+    KR: 캐시 네임스페이스 하나의 설정과 통계입니다.
+    EN: Configuration and counters of one cache namespace.
+    """
+
+    ttl: float
+    soft_ttl: Optional[float] = None
+    maxsize: int
+    max_bytes: Optional[int] = None
+    policy: Literal["lru", "fifo"]
+    tags: list[str] = Field(default_factory=list)
+    hits: int = 0
+    misses: int = 0
+    hit_ratio: float = 0.0
+    sets: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    rejected: int = 0
+    entries: int = 0
+    bytes: int = 0
+    loads: int = 0
+    load_errors: int = 0
+    load_time_total_ms: float = 0.0
+    load_time_max_ms: float = 0.0
+
+
+class CacheStats(BaseModel):
+    """KR: API 캐시 통계 응답입니다. EN: API cache statistics by namespace."""
+
+    namespaces: dict[str, CacheNamespaceStats]
+    in_flight: int = 0
+
+
+EVENT_BATCH_MAX = 10_000
+EVENT_PAGE_DEFAULT = 500
+EVENT_PAGE_MAX = 5_000
+
+
+class EventPage(BaseModel):
+    """KR: 키셋 페이지네이션 응답입니다. EN: Keyset-paginated events response."""
+
+    events: list[Event]
+    next_cursor: Optional[str] = None
+
+
+class EventBatch(BaseModel):
+    """KR: 일괄 이벤트 수집 요청입니다. EN: Bulk event ingestion request body."""
+
+    events: list[EventCreate] = Field(..., min_length=1, max_length=EVENT_BATCH_MAX)
+
+
 class LocationStatusUpdate(BaseModel):
     """
     Input model for updating location status.
@@ -99,6 +187,35 @@ class LocationStatus(BaseModel):
         return value
 
 
+LOCATION_STATUS_BULK_MAX = 1_000
+
+
+class LocationStatusBulkUpdate(BaseModel):
+    """KR: 위치 상태 일괄 갱신 요청입니다. EN: Bulk location status update (one feed snapshot)."""
+
+    updates: list[LocationStatusUpdate] = Field(
+        ..., min_length=1, max_length=LOCATION_STATUS_BULK_MAX
+    )
+
+
+class LocationStatusHistoryPoint(BaseModel):
+    """KR: 점유율 이력 한 구간입니다. EN: One occupancy history bucket (or raw sample)."""
+
+    ts: str
+    samples: int = Field(..., ge=1)
+    occupancy_min: float
+    occupancy_avg: float
+    occupancy_max: float
+
+
+class LocationStatusHistory(BaseModel):
+    """KR: 위치 점유율 이력 응답입니다. EN: Location occupancy history response."""
+
+    location_id: str
+    resolution: Literal["raw", "1m", "1h", "1d"]
+    points: list[LocationStatusHistoryPoint]
+
+
 class LocationMetric(BaseModel):
     """KR: 위치별 이벤트/상태 지표입니다. EN: Aggregated event/status metrics per location."""
 
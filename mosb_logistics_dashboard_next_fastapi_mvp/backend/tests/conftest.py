@@ -1,4 +1,5 @@
 import os
+import shutil
 import sys
 from pathlib import Path
 from typing import Callable
@@ -12,7 +13,8 @@ if str(backend_dir) not in sys.path:
 
 os.environ.setdefault("LOGISTICS_DB_PATH", ":memory:")
 
-from main import app, cache, db
+import main  # noqa: E402
+from main import app, cache, db  # noqa: E402
 
 
 @pytest.fixture()
@@ -41,8 +43,27 @@ def reset_location_status() -> None:
     """KR: 위치 상태 테이블을 초기화합니다. EN: Reset location status table."""
     # Clear location_status table before each test
     db.conn.execute("DELETE FROM location_status")
-    cache.invalidate_location_status()
+    db.bump_table_versions("location_status")
+    cache.invalidate("location_status")
     yield
     # Cleanup after test
     db.conn.execute("DELETE FROM location_status")
-    cache.invalidate_location_status()
+    db.bump_table_versions("location_status")
+    cache.invalidate("location_status")
+
+
+@pytest.fixture(autouse=True)
+def isolate_data_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """
+    KR: CSV 데이터를 임시 폴더로 복사해 테스트가 저장소 데이터를 바꾸지 않게 합니다.
+    EN: Point the API's CSV files (event appends, CSV fallbacks) at a per-test copy, so
+    posting events never modifies the tracked data/ files.
+    """
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in os.listdir(main.DATA_DIR):
+        if name.endswith(".csv"):
+            shutil.copy(os.path.join(main.DATA_DIR, name), data_dir / name)
+    monkeypatch.setattr(main, "DATA_DIR", str(data_dir))
+    monkeypatch.setattr(db, "data_dir", str(data_dir))
+    return data_dir
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from async_db import AsyncDatabase
+from db import Database
+from models import Event
+
+LOOP_LAG_THRESHOLD = 0.25
+
+
+def make_events(prefix: str, count: int) -> list[Event]:
+    return [
+        Event(
+            event_id=f"{prefix}-{i}",
+            ts=f"2026-01-08T{i % 24:02d}:00:00Z",
+            shpt_no=f"SHPT-{i % 50}",
+            status="IN_TRANSIT",
+            location_id=f"LOC-{i % 5}",
+            lat=24.0,
+            lon=54.0,
+        )
+        for i in range(count)
+    ]
+
+
+def test_async_db_keeps_event_loop_responsive_during_heavy_writes():
+    db = Database(":memory:", load_csv=False)
+    adb = AsyncDatabase(db, max_workers=2)
+    # Each batch blocks a caller's thread for well over the threshold when run inline.
+    batches = [make_events(f"EV-{n}", 10_000) for n in range(4)]
+
+    async def run() -> float:
+        stop = asyncio.Event()
+        max_lag = 0.0
+
+        async def ticker() -> None:
+            nonlocal max_lag
+            loop = asyncio.get_running_loop()
+            while not stop.is_set():
+                start = loop.time()
+                await asyncio.sleep(0.01)
+                max_lag = max(max_lag, loop.time() - start - 0.01)
+
+        tick = asyncio.create_task(ticker())
+        await asyncio.gather(
+            *(adb.append_events(batch) for batch in batches),
+            *(adb.get_location_metrics() for _ in range(10)),
+        )
+        stop.set()
+        await tick
+        return max_lag
+
+    max_lag = asyncio.run(run())
+    assert db.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 40_000
+    assert max_lag < LOOP_LAG_THRESHOLD
+    adb.close()
+    db.close()
+
+
+def test_async_db_bounds_concurrent_calls():
+    db = Database(":memory:", load_csv=False)
+    adb = AsyncDatabase(db, max_workers=2, max_pending=3)
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def slow_call() -> str:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return threading.current_thread().name
+
+    async def run() -> list[str]:
+        return await asyncio.gather(*(adb.run(slow_call) for _ in range(12)))
+
+    names = asyncio.run(run())
+    assert peak == 2
+    assert all(name.startswith("duckdb") for name in names)
+    assert adb.max_pending == 3
+    adb.close()
+    db.close()
+
+
+def test_async_db_proxies_attributes_and_errors():
+    db = Database(":memory:", load_csv=False)
+    adb = AsyncDatabase(db)
+    assert adb.max_workers == db.pool_size
+    assert adb.pool_size == db.pool_size
+
+    async def run():
+        assert await adb.get_locations() == []
+        with pytest.raises(ValueError):
+            await adb.get_events_page_json(cursor="not-a-cursor")
+
+    asyncio.run(run())
+    adb.close()
+    db.close()
@@ -1,35 +1,325 @@
+import asyncio
+import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-from cache import CacheManager
-from cachetools import TTLCache
+import pytest
+
+from cache import (
+    MIB,
+    CachedJson,
+    CacheManager,
+    NamespaceConfig,
+    SingleFlight,
+    StripedTTLCache,
+    cache_response,
+)
+from models import Location
 
 
 def test_cache_hit():
     cache = CacheManager()
     test_data = [{"id": 1, "name": "test"}]
-    cache.set_cached_locations("all", test_data)
-    cached = cache.get_cached_locations("all")
+    cache.set("locations", "all", test_data)
+    cached = cache.get("locations", "all")
     assert cached == test_data
 
 
 def test_cache_miss():
     cache = CacheManager()
-    cached = cache.get_cached_locations("missing")
+    cached = cache.get("locations", "missing")
     assert cached is None
 
 
 def test_cache_ttl():
-    cache = CacheManager()
-    cache.locations_cache = TTLCache(maxsize=100, ttl=1)
+    cache = CacheManager(namespaces={"locations": NamespaceConfig(ttl=1)})
     test_data = [{"id": 1}]
-    cache.set_cached_locations("all", test_data)
-    assert cache.get_cached_locations("all") == test_data
+    cache.set("locations", "all", test_data)
+    assert cache.get("locations", "all") == test_data
     time.sleep(2)
-    assert cache.get_cached_locations("all") is None
+    assert cache.get("locations", "all") is None
 
 
 def test_cache_invalidation():
     cache = CacheManager()
-    cache.set_cached_locations("all", [{"id": 1}])
-    cache.invalidate_locations()
-    assert cache.get_cached_locations("all") is None
+    cache.set("locations", "all", [{"id": 1}])
+    cache.invalidate("locations")
+    assert cache.get("locations", "all") is None
+
+
+def test_cached_json_encodes_models():
+    locations = [
+        Location(location_id="MOSB", name="MOSB", lat=24.3, lon=54.4, type="MOSB"),
+    ]
+    entry = CachedJson.encode(locations)
+    assert json.loads(entry.body) == [locations[0].model_dump()]
+    assert entry == CachedJson.from_bytes(entry.body)
+    assert entry.etag != CachedJson.encode([]).etag
+
+
+def test_single_flight_coalesces_threads_and_shares_errors():
+    flights = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return len(calls)
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        futures = [pool.submit(flights.do, "key", loader) for _ in range(20)]
+        while not calls:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        release.set()
+        assert [f.result() for f in futures] == [1] * 20
+    assert len(flights) == 0
+
+    def broken():
+        raise RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        flights.do("key", broken)
+    # Failures are not remembered: the next caller loads again.
+    assert flights.do("key", lambda: "ok") == "ok"
+
+
+def test_cache_get_or_load_async_coalesces_with_sync_callers():
+    cache = CacheManager()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return ["async"]
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        tasks = asyncio.gather(
+            *(cache.get_or_load_async("location_metrics", "all", loader) for _ in range(200))
+        )
+        await asyncio.sleep(0.01)
+        # A sync caller on a worker thread joins the in-flight async load.
+        sync_result = loop.run_in_executor(
+            None, cache.get_or_load, "location_metrics", "all", lambda: calls.append(1)
+        )
+        return await tasks, await sync_result
+
+    results, sync_result = asyncio.run(run())
+    assert calls == [1]
+    assert results == [["async"]] * 200
+    assert sync_result == ["async"]
+    assert cache.get("location_metrics", "all") == ["async"]
+
+
+def test_reference_cache_serves_stale_while_revalidating():
+    cache = CacheManager(reference_soft_ttl=0.05, reference_hard_ttl=60)
+    assert cache.get_or_load("legs", "all", lambda: "v1") == "v1"
+    time.sleep(0.1)
+
+    calls = []
+    release = threading.Event()
+
+    def slow_reload():
+        calls.append(1)
+        release.wait(5)
+        return "v2"
+
+    # Past the soft TTL: every caller gets the stale value at once, one reload runs.
+    start = time.perf_counter()
+    assert [cache.get_or_load("legs", "all", slow_reload) for _ in range(10)] == ["v1"] * 10
+    assert time.perf_counter() - start < 1
+    release.set()
+    for _ in range(500):
+        if cache.get("legs", "all") == "v2":
+            break
+        time.sleep(0.01)
+    assert cache.get("legs", "all") == "v2"
+    assert calls == [1]
+
+    # A failed reload keeps the stale value and lets the next hit retry.
+    time.sleep(0.1)
+
+    def broken():
+        raise RuntimeError("db down")
+
+    assert cache.get_or_load("legs", "all", broken) == "v2"
+    for _ in range(500):
+        if cache._claim_refresh("legs", "all"):
+            break
+        time.sleep(0.01)
+    else:
+        pytest.fail("failed refresh was not released")
+
+    # Other namespaces keep plain TTL semantics.
+    assert cache.get_or_load("events", "all", lambda: "e1") == "e1"
+    assert not cache._claim_refresh("events", "all")
+    cache.close()
+
+
+def test_striped_cache_bounds_entries_and_bytes():
+    now = [0.0]
+    cache = StripedTTLCache(maxsize=8, ttl=10, max_bytes=4096, stripes=2, timer=lambda: now[0])
+    for i in range(20):
+        cache[f"k{i}"] = CachedJson.from_bytes(b"x" * 100)
+    assert len(cache) <= 8
+    assert "k19" in cache
+    # A value larger than the whole byte budget is not cached at all.
+    cache["huge"] = CachedJson.from_bytes(b"x" * 4096)
+    assert cache.get("huge") is None
+    assert not cache.add("k19", CachedJson.from_bytes(b"y"))
+    assert cache.add("new", CachedJson.from_bytes(b"y"))
+
+    now[0] = 11.0
+    assert cache.get("k19") is None
+    stats = cache.stats()
+    assert stats["rejected"] == 1
+    assert stats["evictions"] >= 12
+    assert stats["expirations"] >= 1
+    assert stats["bytes"] <= 4096
+
+
+def test_striped_cache_byte_budget_spans_stripes():
+    cache = StripedTTLCache(maxsize=100, ttl=60, max_bytes=128 * MIB)
+    for i in range(60):
+        cache[i] = CachedJson.from_bytes(bytes([i]) * (2 * MIB))
+    # Far more than one stripe's eighth of the budget fits in a single entry.
+    large = CachedJson.from_bytes(b"x" * (20 * MIB))
+    cache["large"] = large
+    assert cache.get("large") is large
+    stats = cache.stats()
+    assert stats["bytes"] <= 128 * MIB
+    assert stats["evictions"] > 0
+    assert stats["rejected"] == 0
+
+    cache["oversized"] = CachedJson.from_bytes(b"x" * (128 * MIB))
+    assert cache.get("oversized") is None
+    assert cache.get("large") is large
+    assert cache.stats()["rejected"] == 1
+
+
+def test_striped_cache_survives_concurrent_mixed_operations():
+    cache = StripedTTLCache(maxsize=64, ttl=60, max_bytes=64 * 1024)
+    manager = CacheManager()
+    gets = [0] * 8
+
+    def worker(seed):
+        for i in range(2000):
+            key = f"k{(seed * 7919 + i * 31) % 200}"
+            op = i % 4
+            if op == 3:
+                cache.pop(key, None)
+                manager.invalidate("events")
+            elif op == 2:
+                cache[key] = key.encode() * 10
+                manager.set("events", key, [seed, i])
+            else:
+                gets[seed] += 1
+                value = cache.get(key)
+                assert value is None or value == key.encode() * 10
+                manager.get("events", key)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(worker, range(8)))
+
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == sum(gets)
+    assert stats["entries"] == len(cache) <= 64
+    assert stats["bytes"] <= 64 * 1024
+    assert manager.stats()["events"]["sets"] == 8 * 500
+    manager.close()
+
+
+def test_cache_namespace_config_policy_and_load_stats():
+    lru = StripedTTLCache(maxsize=2, ttl=60, stripes=1)
+    fifo = StripedTTLCache(maxsize=2, ttl=60, stripes=1, policy="fifo")
+    for cache in (lru, fifo):
+        cache["a"], cache["b"] = 1, 2
+        cache.get("a")
+        cache["c"] = 3
+    assert "a" in lru and "b" not in lru
+    assert "a" not in fifo and "b" in fifo
+    with pytest.raises(ValueError):
+        StripedTTLCache(maxsize=2, ttl=60, policy="random")
+
+    cache = CacheManager(namespaces={"reports": NamespaceConfig(ttl=60, maxsize=10, policy="fifo")})
+    assert "reports" in cache.namespaces and "events" in cache.namespaces
+
+    def slow():
+        time.sleep(0.02)
+        return "r1"
+
+    def broken():
+        raise RuntimeError("db down")
+
+    assert cache.get_or_load("reports", "a", slow) == "r1"
+    assert cache.get_or_load("reports", "a", broken) == "r1"
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("reports", "b", broken)
+    stats = cache.stats()["reports"]
+    assert stats["policy"] == "fifo" and stats["ttl"] == 60 and stats["soft_ttl"] is None
+    assert (stats["hits"], stats["loads"], stats["load_errors"], stats["entries"]) == (1, 2, 1, 1)
+    assert stats["load_time_max_ms"] >= 20
+    assert stats["bytes"] > 0
+
+    cache.invalidate("reports")
+    assert cache.get("reports", "a") is None
+    with pytest.raises(KeyError):
+        cache.get("unknown", "a")
+    cache.close()
+
+
+def test_cache_response_memoizes_by_structure_with_tags():
+    cache = CacheManager()
+    calls = []
+
+    @cache_response(cache, "events")
+    def body(location_id: str, since=None, fields=("ts",)):
+        calls.append((location_id, since))
+        return [location_id, since]
+
+    @cache_response(cache, "location_status", key=lambda etag, rows: etag, tags=("legs",))
+    def by_etag(etag, rows):
+        calls.append(etag)
+        return rows
+
+    assert body("MOSB") == body("MOSB", None) == body(location_id="MOSB", fields=["ts"])
+    assert body("MOSB", "2026-01-01") == ["MOSB", "2026-01-01"]
+    assert by_etag("v1", [1]) == by_etag("v1", [2]) == [1]
+    assert calls == [("MOSB", None), ("MOSB", "2026-01-01"), "v1"]
+    assert body.cache_info() == {"namespace": "events", "calls": 4, "loads": 2}
+    assert body.__wrapped__("X") == ["X", None]
+
+    # Table writes clear every namespace tagged with the table.
+    cache.invalidate_tags("legs")
+    assert by_etag("v1", [3]) == [3]
+    cache.invalidate_tags("shipments")
+    assert body("MOSB") == ["MOSB", None]
+    assert body.cache_info()["loads"] == 2
+    cache.invalidate_tags("events")
+    body("MOSB")
+    assert body.cache_info()["loads"] == 3
+    assert cache.stats()["location_metrics"]["tags"] == ["events", "location_status"]
+    cache.close()
+
+
+def test_cache_response_single_flights_coroutines():
+    cache = CacheManager()
+    calls = []
+
+    @cache_response(cache, "location_metrics")
+    async def metrics(since=None):
+        calls.append(since)
+        await asyncio.sleep(0.05)
+        return [since]
+
+    async def run():
+        return await asyncio.gather(*(metrics() for _ in range(50)), metrics("a"))
+
+    results = asyncio.run(run())
+    assert results == [[None]] * 50 + [["a"]]
+    assert calls == [None, "a"]
+    assert metrics.cache_info()["loads"] == 2
+    cache.close()
@@ -0,0 +1,209 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from cache import CachedJson, CacheManager
+from cache_backend import CacheBackend, SQLiteCacheBackend, create_cache_backend
+
+POLL_INTERVAL = 0.02
+
+
+def cache_worker(path: str, commands, results) -> None:
+    """
+    KR: 별도 프로세스에서 무효화 백엔드를 쓰는 CacheManager를 실행합니다.
+    EN: Run a CacheManager on the invalidation backend in a worker process, driven by
+    (op, namespace, arg) commands; replies with the body it saw (or None).
+    """
+    cache = CacheManager(backend=SQLiteCacheBackend(path, poll_interval=POLL_INTERVAL))
+    results.put("ready")
+    for op, namespace, arg in iter(commands.get, None):
+        if op == "load":
+            value = cache.get_or_load(namespace, "all", lambda: CachedJson.from_bytes(arg))
+            results.put(value.body)
+        elif op == "get":
+            value = cache.get(namespace, "all")
+            results.put(None if value is None else value.body)
+        elif op == "invalidate_tags":
+            cache.invalidate_tags(arg)
+            results.put(None)
+    cache.close()
+
+
+def api_worker(env: dict, commands, results) -> None:
+    """
+    KR: 별도 프로세스에서 자체 DuckDB 파일로 API 앱 전체를 실행합니다.
+    EN: Run the whole API app in a worker process, on its own DuckDB file and the
+    shared data dir and bus. Commands: ("get", path, etag) -> (status, etag, json or
+    None); ("post", path, body) -> (status, json).
+    """
+    os.environ.update(env)
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as client:
+        login = client.post("/api/auth/login", data={"username": "admin", "password": "admin123"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        results.put("ready")
+        for op, path, arg in iter(commands.get, None):
+            if op == "get":
+                extra = {"If-None-Match": arg} if arg else {}
+                response = client.get(path, headers={**headers, **extra})
+                body = response.json() if response.status_code == 200 else None
+                results.put((response.status_code, response.headers.get("etag"), body))
+            elif op == "post":
+                response = client.post(path, headers=headers, json=arg)
+                results.put((response.status_code, response.json()))
+
+
+class WorkerPool:
+    """KR: 캐시 워커 프로세스 묶음입니다. EN: Spawned cache worker processes on one SQLite file."""
+
+    def __init__(self, args, size: int, target=cache_worker):
+        context = multiprocessing.get_context("spawn")
+        self.workers = []
+        for index in range(size):
+            commands, results = context.Queue(), context.Queue()
+            worker_args = args(index) if callable(args) else args
+            process = context.Process(target=target, args=(worker_args, commands, results))
+            process.start()
+            self.workers.append((process, commands, results))
+        for _, _, results in self.workers:
+            assert results.get(timeout=60) == "ready"
+
+    def call(self, index: int, op: str, namespace: str, arg=None):
+        _, commands, results = self.workers[index]
+        commands.put((op, namespace, arg))
+        return results.get(timeout=10)
+
+    def wait_for(self, index: int, namespace: str, expected, timeout: float = 5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            body = self.call(index, "get", namespace)
+            if body == expected:
+                return body
+            time.sleep(POLL_INTERVAL)
+        pytest.fail(f"worker {index} still sees {body!r} in {namespace}")
+
+    def close(self) -> None:
+        for _, commands, _ in self.workers:
+            commands.put(None)
+        for process, _, _ in self.workers:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.kill()
+
+
+def test_workers_share_invalidations_not_entries(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = CacheManager(backend=SQLiteCacheBackend(path, poll_interval=POLL_INTERVAL))
+    pool = WorkerPool(path, 3)
+    try:
+        # Every worker loads its own body: values describe that worker's data.
+        assert pool.call(0, "load", "legs", b'["w0"]') == b'["w0"]'
+        assert pool.call(1, "load", "legs", b'["w1"]') == b'["w1"]'
+        assert pool.call(2, "load", "legs", b'["w2"]') == b'["w2"]'
+        assert cache.get_or_load("legs", "all", lambda: CachedJson.from_bytes(b"[]")).body == b"[]"
+
+        # A write in this process clears the namespace in every worker.
+        cache.invalidate_tags("legs")
+        for index in range(3):
+            pool.wait_for(index, "legs", None)
+        assert pool.call(1, "load", "legs", b'["w1"]') == b'["w1"]'
+
+        # And a write in a worker clears this process, other namespaces untouched.
+        assert cache.get_or_load("legs", "all", lambda: CachedJson.from_bytes(b"[]")).body == b"[]"
+        remote = []
+        cache.on_remote_invalidation(remote.append)
+        cache.set("events", "all", CachedJson.from_bytes(b"[1]"))
+        pool.call(2, "invalidate_tags", "legs", "legs")
+        deadline = time.monotonic() + 5
+        while cache.get("legs", "all") is not None and time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+        assert cache.get("legs", "all") is None
+        assert cache.get("events", "all").body == b"[1]"
+        assert remote == [("legs",)]
+        pool.wait_for(1, "legs", None)
+    finally:
+        pool.close()
+        cache.close()
+
+
+def test_api_workers_keep_their_data_and_share_events_csv(tmp_path, isolate_data_dir):
+    def env(index: int) -> dict:
+        # DuckDB allows one read-write process per file: each worker owns one, and the
+        # store they share is the data dir's events.csv.
+        return {
+            "CACHE_BACKEND_URL": f"sqlite:///{tmp_path / 'cache.sqlite3'}",
+            "CACHE_BUS_POLL_INTERVAL": str(POLL_INTERVAL),
+            "LOGISTICS_DB_PATH": str(tmp_path / f"worker{index}.duckdb"),
+            "DATA_DIR": str(isolate_data_dir),
+            # Far longer than the test: only the bus can make worker 1 read the tail.
+            "EVENTS_TAIL_INTERVAL": "600",
+        }
+
+    def occupancy(body: list) -> dict:
+        return {row["location_id"]: row["occupancy_rate"] for row in body}
+
+    pool = WorkerPool(env, 2, target=api_worker)
+    try:
+        update = {
+            "location_id": "MOSB_ESNAAD",
+            "occupancy_rate": 0.37,
+            "last_updated": "2026-01-01T00:00:00Z",
+        }
+        assert pool.call(0, "post", "/api/location-status/update", update)[0] == 200
+        status, etag0, body = pool.call(0, "get", "/api/location-status")
+        assert status == 200 and occupancy(body)["MOSB_ESNAAD"] == 0.37
+
+        # Worker 1 serves its own store under its own ETag: no 304 for worker 0's ETag,
+        # and nothing it loads reaches worker 0.
+        status, etag1, body = pool.call(1, "get", "/api/location-status", etag0)
+        assert status == 200 and etag1 != etag0
+        assert occupancy(body).get("MOSB_ESNAAD") != 0.37
+        status, _, body = pool.call(0, "get", "/api/location-status")
+        assert occupancy(body)["MOSB_ESNAAD"] == 0.37
+        assert pool.call(0, "get", "/api/location-status", etag0)[0] == 304
+
+        # An event committed by worker 0 goes to the shared events.csv; the bus wakes
+        # worker 1's tail reader, which ingests it into worker 1's store.
+        assert pool.call(1, "get", "/api/events")[0] == 200
+        status, posted = pool.call(0, "post", "/api/events/demo", None)
+        assert status == 200
+        event_id = posted["event"]["event_id"]
+        deadline = time.monotonic() + 5
+        while event_id not in {row["event_id"] for row in pool.call(1, "get", "/api/events")[2]}:
+            assert time.monotonic() < deadline, "worker 1 never served the new event"
+            time.sleep(POLL_INTERVAL)
+    finally:
+        pool.close()
+
+
+def test_sqlite_backend_skips_own_messages(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = SQLiteCacheBackend(path)
+    second = create_cache_backend(f"sqlite:///{path}")
+
+    first.publish(["legs", "events"])
+    first.publish([])
+    assert first.poll() == []
+    assert second.poll() == [("events", "legs")]
+    assert second.poll() == []
+
+    first.prune()
+    assert create_cache_backend("local") is None
+    with pytest.raises(ValueError):
+        create_cache_backend("memcached://localhost")
+    first.close()
+    second.close()
+
+
+def test_cache_backend_requires_publish_and_subscribe():
+    class PublishOnly(CacheBackend):
+        def publish(self, namespaces):
+            pass
+
+    with pytest.raises(TypeError):
+        PublishOnly()
@@ -1,8 +1,15 @@
+import json
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
-from db import Database
-from models import Event, Location
+import duckdb
+import pytest
+
+import db as db_module
+from db import Database, to_epoch_us
+from models import Event, Location, LocationStatus
 
 
 def test_db_connection():
@@ -32,10 +39,13 @@ def test_db_get_events_with_since():
     db = Database(":memory:", load_csv=False)
     db.conn.execute(
         """
-        INSERT INTO events (event_id, ts, shpt_no, status, location_id, lat, lon, remark)
+        INSERT INTO events
+            (event_id, ts, shpt_no, status, location_id, lat, lon, remark, ts_epoch_us)
         VALUES
-        ('EV-001', '2026-01-01T00:00:00', 'SHPT-001', 'PLANNED', 'LOC-001', 24.0, 54.0, 'test'),
-        ('EV-002', '2026-01-02T00:00:00', 'SHPT-001', 'IN_TRANSIT', 'LOC-002', 24.1, 54.1, 'test')
+        ('EV-001', '2026-01-01T00:00:00', 'SHPT-001', 'PLANNED', 'LOC-001', 24.0, 54.0, 'test',
+         1767225600000000),
+        ('EV-002', '2026-01-02T00:00:00', 'SHPT-001', 'IN_TRANSIT', 'LOC-002', 24.1, 54.1, 'test',
+         1767312000000000)
         """
     )
     events = db.get_events(since="2026-01-01T12:00:00")
@@ -61,3 +71,762 @@ def test_db_append_event():
     assert len(events) == 1
     assert events[0].event_id == "EV-TEST"
     db.close()
+
+
+def test_db_normalizes_mixed_timestamp_formats():
+    db = Database(":memory:", load_csv=False)
+    for event_id, ts in [
+        ("EV-NAIVE", "2026-01-08T09:00:00"),
+        ("EV-UTC", "2026-01-08T10:00:00+00:00"),
+        ("EV-Z", "2026-01-08T11:00:00Z"),
+        ("EV-GST", "2026-01-08T12:30:00+04:00"),
+    ]:
+        db.append_event(
+            Event(
+                event_id=event_id,
+                ts=ts,
+                shpt_no="SHPT-001",
+                status="IN_TRANSIT",
+                location_id="LOC-001",
+                lat=24.0,
+                lon=54.0,
+            )
+        )
+    events = db.get_events()
+    assert [e.event_id for e in events] == ["EV-Z", "EV-UTC", "EV-NAIVE", "EV-GST"]
+    assert events[0].ts == "2026-01-08T11:00:00Z"
+    since = db.get_events(since="2026-01-08T12:00:00+02:00")
+    assert [e.event_id for e in since] == ["EV-Z", "EV-UTC"]
+    db.close()
+
+
+def test_db_migrates_legacy_varchar_timestamps():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "legacy.db")
+        legacy = duckdb.connect(db_path)
+        legacy.execute(
+            """
+            CREATE TABLE events (
+                event_id VARCHAR PRIMARY KEY, ts VARCHAR NOT NULL, shpt_no VARCHAR NOT NULL,
+                status VARCHAR NOT NULL, location_id VARCHAR NOT NULL,
+                lat DOUBLE NOT NULL, lon DOUBLE NOT NULL, remark VARCHAR
+            )
+            """
+        )
+        legacy.execute(
+            """
+            INSERT INTO events VALUES
+            ('EV-1', '2026-01-08T19:25:10+00:00', 'S', 'PLANNED', 'L', 24.0, 54.0, ''),
+            ('EV-2', '2026-01-08T20:00:00', 'S', 'ARRIVED', 'L', 24.0, 54.0, ''),
+            ('EV-3', '2026-01-01T00:00:00-05', 'S', 'ARRIVED', 'L', 24.0, 54.0, ''),
+            ('EV-4', '2026-01-05', 'S', 'ARRIVED', 'L', 24.0, 54.0, '')
+            """
+        )
+        legacy.close()
+
+        db = Database(db_path, load_csv=False)
+        rows = db.conn.execute(
+            "SELECT event_id, ts_epoch_us FROM events ORDER BY event_id"
+        ).fetchall()
+        assert rows == [
+            ("EV-1", to_epoch_us("2026-01-08T19:25:10+00:00")),
+            ("EV-2", to_epoch_us("2026-01-08T20:00:00")),
+            ("EV-3", to_epoch_us("2026-01-01T00:00:00-05")),
+            ("EV-4", to_epoch_us("2026-01-05")),
+        ]
+        assert [e.event_id for e in db.get_events(since="2026-01-08T19:30:00Z")] == ["EV-2"]
+        db.close()
+
+
+def test_db_cursor_pool_is_bounded():
+    db = Database(":memory:", load_csv=False, pool_size=2)
+    db.pool_timeout = 0.05
+    with db.cursor() as first, db.cursor() as second:
+        assert first is not second
+        with pytest.raises(TimeoutError):
+            with db.cursor():
+                pass
+    with db.cursor() as reused:
+        assert reused in (first, second)
+    db.close()
+
+
+def test_db_concurrent_reads_use_pooled_cursors():
+    db = Database(":memory:", load_csv=False, pool_size=4)
+    db.conn.execute(
+        """
+        INSERT INTO events
+            (event_id, ts, shpt_no, status, location_id, lat, lon, remark, ts_epoch_us)
+        SELECT 'EV-' || i, '2026-01-01T00:00:00', 'SHPT-001', 'PLANNED', 'LOC-001', 24.0, 54.0, '',
+               1767225600000000
+        FROM range(100) t(i)
+        """
+    )
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        counts = list(executor.map(lambda _: len(db.get_events()), range(32)))
+    assert counts == [100] * 32
+    assert db._pool_created <= 4
+    db.close()
+
+
+def test_db_append_events_is_atomic():
+    db = Database(":memory:", load_csv=False)
+    events = [
+        Event(
+            event_id=f"EV-{i}",
+            ts="2026-01-01T00:00:00Z",
+            shpt_no="SHPT-TEST",
+            status="IN_TRANSIT",
+            location_id="LOC-TEST",
+            lat=24.0,
+            lon=54.0,
+        )
+        for i in range(1000)
+    ]
+    db.append_events(events)
+    assert len(db.get_events()) == 1000
+
+    duplicate_batch = [events[0].model_copy(update={"event_id": "EV-NEW"}), events[1]]
+    with pytest.raises(duckdb.ConstraintException):
+        db.append_events(duplicate_batch)
+    assert len(db.get_events()) == 1000
+    db.close()
+
+
+def test_db_get_events_json_matches_models():
+    db = Database(":memory:", load_csv=False)
+    assert db.get_events_json() == b"[]"
+    db.append_events(
+        [
+            Event(
+                event_id=f"EV-{i}",
+                ts=f"2026-01-0{i + 1}T00:00:00+00:00",
+                shpt_no="SHPT-TEST",
+                status="IN_TRANSIT",
+                location_id="LOC-TEST",
+                lat=24.328853,
+                lon=54.45857,
+                remark='quote " and ünïcode',
+            )
+            for i in range(3)
+        ]
+    )
+    expected = [event.model_dump() for event in db.get_events(since="2026-01-02T00:00:00Z")]
+    assert json.loads(db.get_events_json(since="2026-01-02T00:00:00Z")) == expected
+    assert [e["event_id"] for e in expected] == ["EV-2", "EV-1"]
+    db.close()
+
+
+def test_db_events_page_cursor_covers_all_rows():
+    db = Database(":memory:", load_csv=False)
+    db.append_events(
+        [
+            Event(
+                event_id=f"EV-{i:02d}",
+                ts="not-a-timestamp" if i == 4 else f"2026-01-01T00:00:0{i % 3}Z",
+                shpt_no="SHPT-TEST",
+                status="PLANNED",
+                location_id="LOC-TEST",
+                lat=24.0,
+                lon=54.0,
+            )
+            for i in range(8)
+        ]
+    )
+    pages = []
+    cursor = None
+    while True:
+        body, cursor = db.get_events_page_json(limit=3, cursor=cursor)
+        pages.append([e["event_id"] for e in json.loads(body)])
+        if cursor is None:
+            break
+    assert [len(page) for page in pages] == [3, 3, 2]
+    assert sum(pages, []) == [e.event_id for e in db.get_events()]
+    assert pages[-1][-1] == "EV-04"
+    with pytest.raises(ValueError):
+        db.get_events_page_json(cursor="%%%")
+    db.close()
+
+
+def test_db_ingest_events_tail_reads_only_new_rows():
+    header = "event_id,ts,shpt_no,status,location_id,lat,lon,remark\n"
+
+    def row(event_id: str) -> str:
+        return f"{event_id},2026-01-08T09:00:00,SHPT-001,IN_TRANSIT,LOC-001,24.0,54.0,tail\n"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "events.csv")
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write(header + row("EV-1") + row("EV-2"))
+        db = Database(":memory:", load_csv=False)
+
+        assert [e.event_id for e in db.ingest_events_tail(csv_path)] == ["EV-1", "EV-2"]
+        assert db.ingest_events_tail(csv_path) == []
+
+        # A half-written trailing line waits for its newline.
+        with open(csv_path, "a", encoding="utf-8") as f:
+            f.write(row("EV-3") + row("EV-4")[:20])
+        assert [e.event_id for e in db.ingest_events_tail(csv_path)] == ["EV-3"]
+        with open(csv_path, "a", encoding="utf-8") as f:
+            f.write(row("EV-4")[20:])
+        assert [e.event_id for e in db.ingest_events_tail(csv_path)] == ["EV-4"]
+
+        # Rows also written through append_event are not duplicated.
+        db.append_event(
+            Event(
+                event_id="EV-5",
+                ts="2026-01-08T09:00:00",
+                shpt_no="SHPT-001",
+                status="IN_TRANSIT",
+                location_id="LOC-001",
+                lat=24.0,
+                lon=54.0,
+            )
+        )
+        with open(csv_path, "a", encoding="utf-8") as f:
+            f.write(row("EV-5") + row("EV-6"))
+        assert [e.event_id for e in db.ingest_events_tail(csv_path)] == ["EV-6"]
+
+        # A rewritten file is detected by the row hash and replayed.
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write(header + row("EV-1") + row("EV-7") + row("EV-8") + row("EV-9"))
+        assert [e.event_id for e in db.ingest_events_tail(csv_path)] == ["EV-7", "EV-8", "EV-9"]
+        assert len(db.get_events()) == 9
+        db.close()
+
+
+def test_db_archive_events_to_cold_tier_and_compact():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, "tier.db"), load_csv=False)
+        db.cold_dir = os.path.join(tmp_dir, "cold", "events")
+        db._refresh_cold_watermark()
+        assert db.archive_events(timedelta(days=30)) == 0
+
+        def make(event_id: str, ts: str) -> Event:
+            return Event(
+                event_id=event_id,
+                ts=ts,
+                shpt_no="SHPT-001",
+                status="IN_TRANSIT",
+                location_id="LOC-001",
+                lat=24.0,
+                lon=54.0,
+            )
+
+        recent = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+        db.append_events(
+            [
+                make("EV-OLD-1", "2025-01-01T08:00:00Z"),
+                make("EV-OLD-2", "2025-01-02T08:00:00Z"),
+                make("EV-NEW", recent),
+            ]
+        )
+        before = [e.model_dump() for e in db.get_events()]
+
+        assert db.archive_events(timedelta(days=30)) == 2
+        assert db.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 1
+        assert [e.model_dump() for e in db.get_events()] == before
+        assert json.loads(db.get_events_json()) == before
+        assert [e.event_id for e in db.get_events(since="2025-01-02T00:00:00Z")] == [
+            "EV-NEW",
+            "EV-OLD-2",
+        ]
+        db.conn.execute(
+            "INSERT INTO locations VALUES ('LOC-001', 'WH', 'Test WH', 24.0, 54.0)",
+        )
+        metrics = {m.location_id: m.event_count for m in db.get_location_metrics()}
+        assert metrics == {"LOC-001": 3}
+
+        # A second archive into the same day creates another file; compaction merges them.
+        db.append_event(make("EV-OLD-3", "2025-01-01T09:00:00Z"))
+        assert db.archive_events(timedelta(days=30)) == 1
+        partition = os.path.join(db.cold_dir, "event_date=2025-01-01")
+        assert len(os.listdir(partition)) == 2
+        assert db.compact_cold_events() == 1
+        # The merged-away files stay for in-flight scans but are no longer read.
+        assert len(os.listdir(partition)) == 3
+        assert len(db.get_events()) == 4
+        db.cold_retire_grace_s = 0
+        assert db.compact_cold_events() == 0
+        assert len(os.listdir(partition)) == 1
+        assert len(db.get_events()) == 4
+        db.close()
+
+
+def test_db_archive_publishes_cold_files_with_the_delete(tmp_path, monkeypatch):
+    db = Database(str(tmp_path / "tier.db"), load_csv=False)
+    db.cold_dir = str(tmp_path / "cold" / "events")
+    events = [
+        Event(
+            event_id=f"EV-{day}",
+            ts=f"2025-01-0{day}T08:00:00Z",
+            shpt_no="SHPT-001",
+            status="IN_TRANSIT",
+            location_id="LOC-001",
+            lat=24.0,
+            lon=54.0,
+        )
+        for day in (1, 2, 3)
+    ]
+    db.append_events(events[:1])
+    assert db.archive_events(timedelta(days=30)) == 1
+    db.append_events(events[1:])
+
+    # Readers during the archive see each row once: hot until the commit, cold after.
+    seen = []
+    replace = os.replace
+
+    def replace_and_read(src, dst):
+        replace(src, dst)
+        seen.append(sorted(e.event_id for e in db.get_events()))
+
+    monkeypatch.setattr(db_module.os, "replace", replace_and_read)
+    assert db.archive_events(timedelta(days=30)) == 2
+    assert seen == [["EV-1", "EV-2", "EV-3"]] * 2
+
+    # A failed archive leaves only unpublished files behind: no duplicates, swept later.
+    db.append_event(events[0].model_copy(update={"event_id": "EV-4"}))
+
+    def replace_and_fail(src, dst):
+        replace(src, dst)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(db_module.os, "replace", replace_and_fail)
+    with pytest.raises(OSError):
+        db.archive_events(timedelta(days=30))
+    monkeypatch.setattr(db_module.os, "replace", replace)
+    assert sorted(e.event_id for e in db.get_events()) == ["EV-1", "EV-2", "EV-3", "EV-4"]
+    assert db.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 1
+    partition = os.path.join(db.cold_dir, "event_date=2025-01-01")
+    assert len(os.listdir(partition)) == 2
+    db.cold_retire_grace_s = 0
+    with db._cold_lock:
+        assert db._sweep_cold_files() == 1
+    assert len(os.listdir(partition)) == 1
+    db.close()
+
+
+def test_db_location_metrics_served_from_counters():
+    db = Database(":memory:", load_csv=False)
+    db.conn.execute(
+        """
+        INSERT INTO locations VALUES
+        ('LOC-A', 'WH', 'A', 24.0, 54.0),
+        ('LOC-B', 'SITE', 'B', 24.1, 54.1),
+        ('LOC-C', 'PORT', 'C', 24.2, 54.2)
+        """
+    )
+    events = [
+        Event(
+            event_id=f"EV-{i}",
+            ts=f"2026-01-0{1 + i % 3}T{i % 24:02d}:{(i * 7) % 60:02d}:00Z",
+            shpt_no="SHPT-001",
+            status="IN_TRANSIT",
+            location_id="LOC-A" if i % 4 else "LOC-B",
+            lat=24.0,
+            lon=54.0,
+        )
+        for i in range(60)
+    ]
+    db.append_events(events[:40])
+    for event in events[40:]:
+        db.append_event(event)
+
+    def brute_force(since):
+        since_us = to_epoch_us(since)
+        counts = {"LOC-A": 0, "LOC-B": 0, "LOC-C": 0}
+        for event in events:
+            if since_us is None or to_epoch_us(event.ts) >= since_us:
+                counts[event.location_id] += 1
+        return counts
+
+    for since in [None, "2026-01-02T00:00:00Z", "2026-01-02T10:30:00Z", "2026-01-03T23:59:00Z"]:
+        metrics = {m.location_id: m.event_count for m in db.get_location_metrics(since)}
+        assert metrics == brute_force(since), since
+
+    # Raw inserts bypass the counters until a rebuild.
+    db.conn.execute("DELETE FROM location_metrics_mv")
+    db.rebuild_location_metrics()
+    metrics = {m.location_id: m.event_count for m in db.get_location_metrics()}
+    assert metrics == brute_force(None)
+    db.close()
+
+
+def test_db_point_lookups_by_shipment_and_location(tmp_path):
+    db = Database(":memory:", load_csv=False)
+    db.cold_dir = str(tmp_path / "cold")
+    indexes = {
+        row[0]
+        for row in db.conn.execute("SELECT index_name FROM duckdb_indexes()").fetchall()
+    }
+    assert {"idx_events_shpt_no", "idx_events_location_id", "idx_legs_shpt_no"} <= indexes
+
+    db.conn.execute(
+        """
+        INSERT INTO legs (leg_id, shpt_no, from_location_id, to_location_id, mode,
+                          planned_etd, planned_eta, planned_etd_epoch_us)
+        VALUES
+        ('LEG-2', 'SHPT-A', 'LOC-B', 'LOC-C', 'SEA', '2026-01-02T00:00:00Z', '', 2),
+        ('LEG-1', 'SHPT-A', 'LOC-A', 'LOC-B', 'ROAD', '2026-01-01T00:00:00Z', '', 1),
+        ('LEG-3', 'SHPT-B', 'LOC-A', 'LOC-C', 'ROAD', '', '', NULL)
+        """
+    )
+    assert [leg.leg_id for leg in db.get_shipment_legs("SHPT-A")] == ["LEG-1", "LEG-2"]
+    assert db.get_shipment_legs("SHPT-MISSING") == []
+
+    now = datetime.now(timezone.utc)
+    events = [
+        Event(
+            event_id=f"EV-{i:02d}",
+            ts=(now - timedelta(days=40 - i)).isoformat(),
+            shpt_no="SHPT-A" if i % 2 else "SHPT-B",
+            status="IN_TRANSIT",
+            location_id=f"LOC-{'ABC'[i % 3]}",
+            lat=24.0,
+            lon=54.0,
+        )
+        for i in range(30)
+    ]
+    db.append_events(events)
+    # Lookups must also reach events archived to the cold tier.
+    assert db.archive_events(timedelta(days=20)) > 0
+
+    def ids(body: bytes) -> list[str]:
+        return [row["event_id"] for row in json.loads(body)]
+
+    expected = sorted((e.event_id for e in events if e.shpt_no == "SHPT-A"), reverse=True)
+    assert ids(db.get_shipment_events_json("SHPT-A")) == expected
+    since = (now - timedelta(days=15)).isoformat()
+    assert ids(db.get_shipment_events_json("SHPT-A", since)) == [
+        e.event_id
+        for e in reversed(events)
+        if e.shpt_no == "SHPT-A" and to_epoch_us(e.ts) >= to_epoch_us(since)
+    ]
+
+    loc_b = sorted((e.event_id for e in events if e.location_id == "LOC-B"), reverse=True)
+    assert ids(db.get_location_events_json("LOC-B")) == loc_b
+    assert ids(db.get_location_events_json("LOC-B", limit=3)) == loc_b[:3]
+    assert db.get_location_events_json("LOC-MISSING") == b"[]"
+    db.close()
+
+
+def test_db_location_registry_is_versioned():
+    db = Database(":memory:", load_csv=False)
+    registry = db.locations
+    assert registry.version == 1 and len(registry) == 0
+
+    db.upsert_locations(
+        [
+            Location(location_id="LOC-A", type="WH", name="A", lat=24.0, lon=54.0),
+            Location(location_id="LOC-B", type="PORT", name="B", lat=24.5, lon=54.5),
+        ]
+    )
+    assert db.locations.version == 2
+    assert "LOC-A" in db.locations and "LOC-Z" not in db.locations
+    assert (db.locations.get("LOC-B").lat, db.locations.get("LOC-B").lon) == (24.5, 54.5)
+    # Earlier snapshots are immutable.
+    assert len(registry) == 0
+
+    db.upsert_locations([Location(location_id="LOC-A", type="SITE", name="A2", lat=1.0, lon=2.0)])
+    assert db.locations.version == 3
+    assert db.locations.get("LOC-A").type == "SITE"
+    assert sorted(loc.location_id for loc in db.locations.values()) == ["LOC-A", "LOC-B"]
+    db.close()
+
+
+def test_db_location_status_history_rollups_and_retention():
+    from db import DAY_US, HOUR_US
+    from models import LocationStatus
+
+    db = Database(":memory:", load_csv=False)
+    base = datetime(2026, 1, 5, 10, 0, tzinfo=timezone.utc)
+    samples = [
+        (base + timedelta(minutes=m, seconds=s), rate)
+        for m, s, rate in [(0, 5, 0.2), (0, 40, 0.6), (1, 0, 0.4), (75, 0, 0.9), (60 * 26, 0, 0.1)]
+    ]
+    for ts, rate in samples:
+        db.upsert_location_status(
+            LocationStatus(
+                location_id="LOC-A",
+                occupancy_rate=rate,
+                status_code="OK",
+                last_updated=ts.isoformat(),
+            )
+        )
+    # The latest-status table keeps one row; history keeps every sample.
+    assert len(db.get_location_status()) == 1
+    assert db.conn.execute("SELECT COUNT(*) FROM location_status_history").fetchone()[0] == 5
+
+    assert db.rollup_location_status_history() == 5
+    assert db.rollup_location_status_history() == 0
+
+    since_us = to_epoch_us(base.isoformat())
+    until_us = since_us + 2 * DAY_US
+    minutes = db.get_location_status_history("LOC-A", since_us, until_us, "1m")
+    first = minutes[0]
+    assert first.ts == "2026-01-05T10:00:00Z"
+    assert (first.samples, first.occupancy_min, first.occupancy_max) == (2, 0.2, 0.6)
+    assert first.occupancy_avg == pytest.approx(0.4)
+    hours = db.get_location_status_history("LOC-A", since_us, until_us, "1h")
+    assert [(p.ts, p.samples) for p in hours] == [
+        ("2026-01-05T10:00:00Z", 3),
+        ("2026-01-05T11:00:00Z", 1),
+        ("2026-01-06T12:00:00Z", 1),
+    ]
+    days = db.get_location_status_history("LOC-A", since_us, until_us, "1d")
+    assert [(p.samples, p.occupancy_max) for p in days] == [(4, 0.9), (1, 0.1)]
+    raw = db.get_location_status_history("LOC-A", since_us, since_us + HOUR_US, "raw")
+    assert [p.occupancy_avg for p in raw] == [0.2, 0.6, 0.4]
+
+    # A late sample for an old bucket merges into existing rollups.
+    db.upsert_location_status(
+        LocationStatus(
+            location_id="LOC-A",
+            occupancy_rate=1.0,
+            status_code="CRITICAL",
+            last_updated=(base + timedelta(seconds=50)).isoformat(),
+        )
+    )
+    db.rollup_location_status_history()
+    first = db.get_location_status_history("LOC-A", since_us, until_us, "1m")[0]
+    assert (first.samples, first.occupancy_max) == (3, 1.0)
+
+    # Auto resolution: short ranges stay fine, long ranges use coarser tables.
+    now_us = since_us + DAY_US
+    assert db.pick_status_resolution(now_us - HOUR_US, now_us, now_us) == "1m"
+    assert db.pick_status_resolution(now_us - 7 * DAY_US, now_us, now_us) == "1h"
+    assert db.pick_status_resolution(now_us - 400 * DAY_US, now_us, now_us) == "1d"
+
+    # Retention: raw rows older than 7 days go, 1m older than 30 days go, 1h/1d stay.
+    pruned = db.prune_location_status_history(now=base + timedelta(days=32))
+    assert pruned > 0
+    assert db.conn.execute("SELECT COUNT(*) FROM location_status_history").fetchone()[0] == 0
+    assert db.get_location_status_history("LOC-A", since_us, until_us, "1m") == []
+    assert len(db.get_location_status_history("LOC-A", since_us, until_us, "1h")) == 3
+    db.close()
+
+
+def test_db_shipment_state_projection():
+    db = Database(":memory:", load_csv=False)
+    db.conn.execute(
+        """
+        INSERT INTO legs (leg_id, shpt_no, from_location_id, to_location_id, mode,
+                          planned_etd, planned_eta, planned_etd_epoch_us)
+        VALUES
+        ('LEG-1', 'SHPT-A', 'WH', 'MOSB', 'ROAD', '2026-01-01T00:00:00Z', '', 1),
+        ('LEG-2', 'SHPT-A', 'MOSB', 'PORT', 'ROAD', '2026-01-02T00:00:00Z', '', 2)
+        """
+    )
+
+    def event(event_id, ts, shpt_no, status, location_id):
+        return Event(
+            event_id=event_id,
+            ts=ts,
+            shpt_no=shpt_no,
+            status=status,
+            location_id=location_id,
+            lat=24.0,
+            lon=54.0,
+        )
+
+    def state():
+        return {row["shpt_no"]: row for row in json.loads(db.get_shipment_state_json())}
+
+    db.append_events(
+        [
+            event("EV-1", "2026-01-01T08:00:00Z", "SHPT-A", "IN_TRANSIT", "WH"),
+            event("EV-2", "2026-01-01T10:00:00Z", "SHPT-A", "ARRIVED", "MOSB"),
+            event("EV-3", "2026-01-01T09:00:00Z", "SHPT-B", "PLANNED", "WH"),
+        ]
+    )
+    current = state()
+    assert current["SHPT-A"]["event_id"] == "EV-2"
+    # Arrived at MOSB: the leg ending there.
+    assert current["SHPT-A"]["current_leg_id"] == "LEG-1"
+    assert current["SHPT-B"]["current_leg_id"] is None
+
+    # Departing MOSB moves to the next leg; an out-of-order older event changes nothing.
+    db.append_event(event("EV-4", "2026-01-02T01:00:00+04:00", "SHPT-A", "IN_TRANSIT", "MOSB"))
+    db.append_event(event("EV-0", "2025-12-31T00:00:00Z", "SHPT-A", "PLANNED", "WH"))
+    current = state()
+    assert current["SHPT-A"]["event_id"] == "EV-4"
+    assert current["SHPT-A"]["status"] == "IN_TRANSIT"
+    assert current["SHPT-A"]["current_leg_id"] == "LEG-2"
+    assert len(current) == 2
+
+    # The one-pass rebuild matches the incrementally maintained projection.
+    db.rebuild_shipment_state()
+    assert state() == current
+    db.conn.execute("DELETE FROM shipment_state")
+    db._ensure_shipment_state()
+    assert state() == current
+    db.close()
+
+
+def test_db_kpi_counters_track_status_transitions():
+    db = Database(":memory:", load_csv=False)
+    db.conn.execute(
+        """
+        INSERT INTO shipments (shpt_no, priority, vendor)
+        VALUES ('SHPT-A', 'HIGH', 'HITACHI'), ('SHPT-B', 'LOW', 'SIEMENS')
+        """
+    )
+    db.conn.execute(
+        """
+        INSERT INTO legs (leg_id, shpt_no, from_location_id, to_location_id, mode,
+                          planned_etd, planned_eta, planned_etd_epoch_us)
+        VALUES ('LEG-1', 'SHPT-A', 'WH', 'MOSB', 'SEA', '2026-01-01T00:00:00Z', '', 1)
+        """
+    )
+
+    def event(event_id, ts, shpt_no, status, location_id="WH"):
+        return Event(
+            event_id=event_id,
+            ts=ts,
+            shpt_no=shpt_no,
+            status=status,
+            location_id=location_id,
+            lat=24.0,
+            lon=54.0,
+        )
+
+    def counts(by="all"):
+        return {s.slice: s.counts for s in db.get_kpis(by)[1]}
+
+    db.append_events(
+        [
+            event("EV-1", "2026-01-01T08:00:00Z", "SHPT-A", "PLANNED"),
+            event("EV-2", "2026-01-01T09:00:00Z", "SHPT-B", "PLANNED"),
+        ]
+    )
+    assert counts() == {"": {"PLANNED": 2}}
+    first = db.drain_kpi_deltas()
+    assert len(first) == 1
+    assert {"dimension": "all", "slice": "", "status": "PLANNED", "delta": 2} in first[0]["deltas"]
+
+    db.append_event(event("EV-3", "2026-01-01T10:00:00Z", "SHPT-A", "IN_TRANSIT"))
+    assert counts() == {"": {"PLANNED": 1, "IN_TRANSIT": 1}}
+    assert counts("vendor") == {"HITACHI": {"IN_TRANSIT": 1}, "SIEMENS": {"PLANNED": 1}}
+    assert counts("priority") == {"HIGH": {"IN_TRANSIT": 1}, "LOW": {"PLANNED": 1}}
+    assert counts("mode") == {"SEA": {"IN_TRANSIT": 1}, "": {"PLANNED": 1}}
+    (second,) = db.drain_kpi_deltas()
+    assert second["version"] > first[0]["version"]
+    overall = {d["status"]: d["delta"] for d in second["deltas"] if d["dimension"] == "all"}
+    assert overall == {"PLANNED": -1, "IN_TRANSIT": 1}
+
+    # An older event or a rolled-back write publishes nothing.
+    db.append_event(event("EV-0", "2025-12-31T00:00:00Z", "SHPT-A", "DELAYED"))
+    with pytest.raises(duckdb.Error):
+        db.append_events([event("EV-9", "2026-01-02T00:00:00Z", "SHPT-B", "ARRIVED")] * 2)
+    assert db.drain_kpi_deltas() == []
+    assert counts() == {"": {"PLANNED": 1, "IN_TRANSIT": 1}}
+
+    # A rebuild keeps the counters and bumps the version without a delta entry.
+    version = db.get_kpis()[0]
+    db.rebuild_shipment_state()
+    assert db.get_kpis()[0] == version + 1
+    assert db.drain_kpi_deltas() == []
+    assert counts("vendor") == {"HITACHI": {"IN_TRANSIT": 1}, "SIEMENS": {"PLANNED": 1}}
+    db.close()
+
+
+def test_db_table_versions_bump_on_committed_writes():
+    db = Database(":memory:", load_csv=False)
+    before = dict(db.table_versions)
+    db.upsert_locations(
+        [Location(location_id="MOSB", type="MOSB", name="MOSB", lat=24.3, lon=54.4)]
+    )
+    assert db.table_version("locations") == before["locations"] + 1
+
+    status = LocationStatus(
+        location_id="MOSB",
+        occupancy_rate=0.5,
+        status_code="OK",
+        last_updated="2026-01-01T00:00:00Z",
+    )
+    db.upsert_location_statuses([status])
+    assert db.table_version("location_status") == before["location_status"] + 1
+
+    # An empty write commits nothing and leaves the version alone.
+    db.upsert_location_statuses([])
+    assert db.table_version("location_status") == before["location_status"] + 1
+    assert db.table_version("legs") == before["legs"]
+    db.close()
+
+
+def test_db_on_table_write_reports_committed_tables(tmp_path):
+    db = Database(":memory:", load_csv=False)
+    written = []
+    lock_free = []
+
+    def listener(*tables):
+        # Listeners may block (cache bus publish), so no writer may be holding the lock.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            acquired = pool.submit(db._write_lock.acquire, timeout=1).result()
+            if acquired:
+                pool.submit(db._write_lock.release).result()
+        lock_free.append(acquired)
+        written.append(tables)
+
+    db.on_table_write(listener)
+    event = Event(
+        event_id="EV-LISTEN",
+        ts="2026-01-01T00:00:00Z",
+        shpt_no="SHPT-1",
+        status="IN_TRANSIT",
+        location_id="MOSB",
+        lat=24.3,
+        lon=54.4,
+    )
+    db.append_event(event)
+    assert written == [("events",)]
+    with pytest.raises(duckdb.Error):
+        db.append_events([event])
+    assert written == [("events",)]
+
+    # A tail pass over rows that are all stored already changes nothing.
+    csv_path = tmp_path / "events.csv"
+    csv_path.write_text(
+        "event_id,ts,shpt_no,status,location_id,lat,lon,remark\n"
+        "EV-LISTEN,2026-01-01T00:00:00Z,SHPT-1,IN_TRANSIT,MOSB,24.3,54.4,\n"
+    )
+    version = db.table_version("events")
+    assert db.ingest_events_tail(str(csv_path)) == []
+    assert written == [("events",)]
+    assert db.table_version("events") == version
+
+    db.refresh_locations()
+    assert written == [("events",), ("locations",)]
+    assert lock_free == [True, True]
+    db.close()
+
+
+def test_db_bulk_load_checkpoints_without_tail_replay(tmp_path, monkeypatch):
+    csv_path = tmp_path / "events.csv"
+    csv_path.write_text(
+        "event_id,ts,shpt_no,status,location_id,lat,lon,remark\n"
+        + "".join(
+            f"EV-{i},2026-01-01T00:00:0{i}Z,SHPT-1,IN_TRANSIT,MOSB,24.3,54.4,\n" for i in range(5)
+        )
+    )
+
+    def no_replay(self, *args, **kwargs):
+        raise AssertionError("a fresh bulk load must not replay the file")
+
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(Database, "ingest_events_tail", no_replay)
+    db = Database(":memory:")
+    assert db.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 5
+    assert db._get_checkpoint(str(csv_path)) == db._complete_prefix(str(csv_path))
+    db.close()
+
+
+def test_db_drops_unused_keyset_index():
+    db = Database(":memory:", load_csv=False)
+    db.conn.execute("CREATE INDEX idx_events_ts_event ON events (ts_epoch_us, event_id)")
+    db._init_schema()
+    rows = db.conn.execute("SELECT index_name FROM duckdb_indexes()").fetchall()
+    indexes = {row[0] for row in rows}
+    assert "idx_events_ts_event" not in indexes
+    assert "idx_events_shpt_no" in indexes
+    db.close()
@@ -0,0 +1,101 @@
+import duckdb
+import pytest
+
+from db import Database
+from events_window import EventsWindow
+from models import Event
+
+SINCES = [None, "2026-01-01T05:00:00Z", "2026-01-01T05:30:00+04:00", "2026-01-02T00:00:00Z"]
+
+
+def make_event(event_id: str, ts: str) -> Event:
+    return Event(
+        event_id=event_id,
+        ts=ts,
+        shpt_no="SHPT-1",
+        status="IN_TRANSIT",
+        location_id="LOC-1",
+        lat=24.0,
+        lon=54.0,
+    )
+
+
+def seed(db: Database) -> None:
+    db.append_events(
+        [make_event(f"EV-{i:03d}", f"2026-01-01T{i % 10:02d}:00:00Z") for i in range(30)]
+        + [make_event("EV-NOTS", "not-a-timestamp")]
+    )
+
+
+def test_events_window_matches_duckdb_and_merges_appends(monkeypatch):
+    db = Database(":memory:", load_csv=False)
+    seed(db)
+    for since in SINCES:
+        assert db.get_events_window_json(since).body == db.get_events_json(since)
+    version = db.events_window.version
+
+    def no_reload(*args, **kwargs):
+        raise AssertionError("appends must merge into the window, not reload it")
+
+    monkeypatch.setattr(db.events_window, "load", no_reload)
+    # A small append and a large one (sorted merge), both out of timestamp order.
+    db.append_event(make_event("EV-LATE", "2026-01-01T04:30:00Z"))
+    db.append_events(
+        [make_event(f"EV-B{i:03d}", f"2026-01-01T0{i % 9}:15:00Z") for i in range(100)]
+    )
+    assert db.events_window.version == version + 2
+    for since in SINCES:
+        assert db.get_events_window_json(since).body == db.get_events_json(since)
+
+    # Hits of one version reuse the encoded body; a failed write merges nothing.
+    entry = db.get_events_window_json(SINCES[1])
+    assert db.get_events_window_json(SINCES[1]) is entry
+    with pytest.raises(duckdb.Error):
+        db.append_events([make_event("EV-DUP", "2026-01-03T00:00:00Z")] * 2)
+    assert db.get_events_window_json(SINCES[1]) is entry
+    db.close()
+
+
+def test_events_window_floor_falls_back_below_max_rows():
+    db = Database(":memory:", load_csv=False)
+    db.events_window.max_rows = 10
+    seed(db)
+    assert db.get_events_window_json(None) is None
+    assert db.get_events_window_json("2026-01-01T05:00:00Z") is None
+    # The 10 newest rows are 07:00-09:00 (3 each); 06:00 is partially cut off.
+    entry = db.get_events_window_json("2026-01-01T07:00:00Z")
+    assert entry.body == db.get_events_json("2026-01-01T07:00:00Z")
+
+    # Newer events push the floor up; older ones below it are not kept.
+    db.append_events(
+        [make_event(f"EV-N{i}", f"2026-01-01T10:{i:02d}:00Z") for i in range(4)]
+        + [make_event("EV-OLD", "2025-12-31T00:00:00Z")]
+    )
+    assert len(db.events_window) == 10
+    assert db.get_events_window_json("2026-01-01T07:00:00Z") is None
+    since = "2026-01-01T08:00:00Z"
+    assert db.get_events_window_json(since).body == db.get_events_json(since)
+
+    db.events_window.clear()
+    assert not db.events_window.loaded
+    assert db.get_events_window_json(since).body == db.get_events_json(since)
+    db.close()
+
+
+def test_events_window_bounds_memoized_bodies_by_bytes():
+    window = EventsWindow(max_rows=100, max_body_bytes=600)
+    rows = [(i * 1_000_000, f"EV-{i:02d}", f'{{"event_id":"EV-{i:02d}"}}') for i in range(20)]
+    window.load(rows[::-1])
+    full = window.query(None)
+    assert len(full.body) > 300
+    assert window.query(None) is full
+    # A second large body evicts the first instead of growing past the budget.
+    assert window.query(1_000_000) is not None
+    assert window.body_bytes <= 600
+    assert window.query(None) is not full
+
+    # A body over the whole budget is served but not kept.
+    small = EventsWindow(max_rows=100, max_body_bytes=100)
+    small.load([(1, "EV-1", '{"remark":"' + "x" * 200 + '"}')])
+    assert len(small.query(None).body) > 200
+    assert small.body_bytes == 0
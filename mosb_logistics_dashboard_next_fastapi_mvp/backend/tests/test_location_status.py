@@ -82,6 +82,33 @@ def test_update_location_status_unknown_location():
     assert response.status_code == 400
 
 
+def test_update_location_status_validates_without_db_read(monkeypatch):
+    token = get_token()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("status update must not read locations from the DB")
+
+    monkeypatch.setattr(db, "get_locations", fail)
+    monkeypatch.setattr(db, "_fetch_models", fail)
+    payload = {
+        "location_id": "MOSB_ESNAAD",
+        "occupancy_rate": 0.4,
+        "last_updated": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+    }
+    response = client.post(
+        "/api/location-status/update",
+        headers={"Authorization": f"Bearer {token}"},
+        json=payload,
+    )
+    assert response.status_code == 200
+    response = client.post(
+        "/api/location-status/update",
+        headers={"Authorization": f"Bearer {token}"},
+        json={**payload, "location_id": "NOT_A_LOCATION"},
+    )
+    assert response.status_code == 400
+
+
 def test_update_location_status_requires_authentication():
     payload = {
         "location_id": "MOSB_ESNAAD",
@@ -469,6 +496,44 @@ def test_get_location_status_caching():
     assert mosb_status["occupancy_rate"] == 0.8  # 업데이트된 값 반영
 
 
+def test_get_location_status_etag_not_modified(monkeypatch):
+    import main
+
+    token = get_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get("/api/location-status", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("304 must not touch the cache or the DB")
+
+    with monkeypatch.context() as m:
+        m.setattr(main.db, "get_location_status", fail)
+        m.setattr(main.cache, "get_or_load", fail)
+        response = client.get(
+            "/api/location-status",
+            headers={**headers, "If-None-Match": f'"other", {etag}'},
+        )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    client.post(
+        "/api/location-status/update",
+        headers=headers,
+        json={
+            "location_id": "MOSB_ESNAAD",
+            "occupancy_rate": 0.3,
+            "last_updated": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+        },
+    )
+    response = client.get("/api/location-status", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [r["location_id"] for r in response.json()] == ["MOSB_ESNAAD"]
+
+
 def test_update_location_status_negative_occupancy_rate():
     """음수 occupancy_rate 거부"""
     token = get_token()
@@ -557,3 +622,169 @@ def test_update_location_status_boundary_values():
     rows = response.json()
     status = next((r for r in rows if r["location_id"] == "MOSB_ESNAAD"), None)
     assert status["status_code"] == "CRITICAL"
+
+
+def test_bulk_update_location_status_single_transaction_and_frame(monkeypatch):
+    """스냅샷 일괄 갱신: 한 번의 upsert와 하나의 WS 프레임"""
+    import main
+
+    frames = []
+    calls = []
+
+    async def fake_broadcast(msg):
+        frames.append(msg)
+
+    original = db.upsert_location_statuses
+
+    def counting_upsert(statuses):
+        calls.append(len(statuses))
+        original(statuses)
+
+    monkeypatch.setattr(main.hub, "broadcast", fake_broadcast)
+    monkeypatch.setattr(db, "upsert_location_statuses", counting_upsert)
+    token = get_token()
+    now = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    updates = [
+        {"location_id": "MOSB_ESNAAD", "occupancy_rate": 0.2, "last_updated": now},
+        {"location_id": "DSV_M19", "occupancy_rate": 0.8, "last_updated": now},
+        {
+            "location_id": "BERTH_MZ",
+            "occupancy_rate": 0.95,
+            "status_code": "WARNING",
+            "last_updated": now,
+        },
+        # Repeated id: last entry wins.
+        {"location_id": "MOSB_ESNAAD", "occupancy_rate": 0.3, "last_updated": now},
+    ]
+    response = client.post(
+        "/api/location-status/bulk",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"updates": updates},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"ok": True, "count": 3}
+    assert calls == [3]
+    assert len(frames) == 1
+    assert frames[0]["type"] == "location_statuses"
+    broadcast = {s["location_id"] for s in frames[0]["statuses"]}
+    assert broadcast == {"MOSB_ESNAAD", "DSV_M19", "BERTH_MZ"}
+
+    response = client.get(
+        "/api/location-status",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    rows = {r["location_id"]: r for r in response.json()}
+    assert rows["MOSB_ESNAAD"]["occupancy_rate"] == 0.3
+    assert rows["MOSB_ESNAAD"]["status_code"] == "OK"
+    assert rows["DSV_M19"]["status_code"] == "WARNING"
+    assert rows["BERTH_MZ"]["status_code"] == "WARNING"
+
+
+def test_bulk_update_location_status_rejects_unknown_without_writing():
+    token = get_token()
+    now = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    response = client.post(
+        "/api/location-status/bulk",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "updates": [
+                {"location_id": "MOSB_ESNAAD", "occupancy_rate": 0.2, "last_updated": now},
+                {"location_id": "NOWHERE", "occupancy_rate": 0.2, "last_updated": now},
+            ]
+        },
+    )
+    assert response.status_code == 400
+    assert "NOWHERE" in response.json()["error"]
+    assert db.get_location_status() == []
+
+
+def test_bulk_update_location_status_validation_and_roles():
+    now = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    token = get_token()
+    response = client.post(
+        "/api/location-status/bulk",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"updates": []},
+    )
+    assert response.status_code == 422
+    response = client.post(
+        "/api/location-status/bulk",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "updates": [{"location_id": "MOSB_ESNAAD", "occupancy_rate": 1.5, "last_updated": now}]
+        },
+    )
+    assert response.status_code == 422
+
+    finance_token = get_token("finance_user", "finance123")
+    response = client.post(
+        "/api/location-status/bulk",
+        headers={"Authorization": f"Bearer {finance_token}"},
+        json={
+            "updates": [{"location_id": "MOSB_ESNAAD", "occupancy_rate": 0.5, "last_updated": now}]
+        },
+    )
+    assert response.status_code == 403
+
+
+def test_location_status_history_endpoint():
+    token = get_token()
+    db.conn.execute("DELETE FROM location_status_history")
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    for minutes_ago, rate in [(50, 0.3), (20, 0.7), (5, 0.5)]:
+        response = client.post(
+            "/api/location-status/update",
+            headers={"Authorization": f"Bearer {token}"},
+            json={
+                "location_id": "BERTH_MZ",
+                "occupancy_rate": rate,
+                "last_updated": (now - timedelta(minutes=minutes_ago)).isoformat(),
+            },
+        )
+        assert response.status_code == 200
+    db.rollup_location_status_history()
+
+    response = client.get(
+        "/api/location-status/BERTH_MZ/history",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    # The default 24h range is served from the 1h rollup.
+    assert data["resolution"] == "1h"
+    assert sum(p["samples"] for p in data["points"]) == 3
+    assert min(p["occupancy_min"] for p in data["points"]) == 0.3
+    assert max(p["occupancy_max"] for p in data["points"]) == 0.7
+
+    since = (now - timedelta(hours=1)).isoformat()
+    response = client.get(
+        "/api/location-status/BERTH_MZ/history",
+        params={"since": since, "resolution": "raw"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert [p["occupancy_avg"] for p in response.json()["points"]] == [0.3, 0.7, 0.5]
+
+    response = client.get(
+        "/api/location-status/BERTH_MZ/history",
+        params={"since": since},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.json()["resolution"] == "1m"
+
+    response = client.get(
+        "/api/location-status/NOWHERE/history",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 404
+    response = client.get(
+        "/api/location-status/BERTH_MZ/history",
+        params={"since": "garbage"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 400
+    response = client.get(
+        "/api/location-status/BERTH_MZ/history",
+        params={"resolution": "5m"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 422
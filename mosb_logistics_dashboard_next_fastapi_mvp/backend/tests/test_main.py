@@ -1,4 +1,5 @@
 import os
+import uuid
 
 from fastapi.testclient import TestClient
 
@@ -32,6 +33,95 @@ def test_get_locations():
         assert "type" in data[0]
 
 
+def test_cache_hits_return_pre_encoded_json(monkeypatch):
+    import main
+
+    token = get_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    main.cache.invalidate("legs")
+    first = client.get("/api/legs", headers=headers)
+    assert first.status_code == 200
+    assert first.headers["etag"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache hit must not touch the DB")
+
+    monkeypatch.setattr(main.db, "get_legs", fail)
+    second = client.get("/api/legs", headers=headers)
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["content-type"] == "application/json"
+
+
+def test_table_etags_return_not_modified():
+    token = get_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    for path in ("/api/locations", "/api/legs", "/api/shipments"):
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert etag.startswith('W/"')
+        response = client.get(path, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        # Authorization still applies to conditional requests.
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 401
+
+
+def test_expired_cache_key_loads_once_for_concurrent_requests(monkeypatch):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    import main
+    from cache import StripedTTLCache
+
+    token = get_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    now = [0.0]
+    monkeypatch.setitem(
+        main.cache._caches,
+        "location_metrics",
+        StripedTTLCache(maxsize=100, ttl=30, timer=lambda: now[0]),
+    )
+    main.location_metrics_body(main.table_etag("events"), main.table_etag("location_status"), None)
+    now[0] = 31.0  # the 30s TTL has expired
+
+    calls = []
+
+    def slow_metrics(since=None):
+        calls.append(since)
+        time.sleep(0.2)
+        return []
+
+    monkeypatch.setattr(main.db, "get_location_metrics", slow_metrics)
+    with ThreadPoolExecutor(max_workers=200) as pool:
+        responses = list(
+            pool.map(lambda _: client.get("/api/location-metrics", headers=headers), range(200))
+        )
+    assert all(r.status_code == 200 and r.json() == [] for r in responses)
+    assert calls == [None]
+
+
+def test_warm_reference_caches_preloads_endpoints(monkeypatch):
+    import asyncio
+
+    import main
+
+    main.cache.invalidate_all()
+    asyncio.run(main.warm_reference_caches())
+
+    def fail(*args, **kwargs):
+        raise AssertionError("warmed caches must not touch the DB")
+
+    monkeypatch.setattr(main.db, "get_legs", fail)
+    monkeypatch.setattr(main.db, "get_shipments", fail)
+    token = get_token()
+    for path in ("/api/locations", "/api/legs", "/api/shipments"):
+        response = client.get(path, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        assert response.json()
+
+
 def test_get_shipments():
     token = get_token()
     response = client.get(
@@ -72,6 +162,103 @@ def test_get_events_with_since():
     assert isinstance(response.json(), list)
 
 
+def test_get_shipment_and_location_lookups():
+    token = get_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get("/api/shipments/SHPT-AGI-0001/legs", headers=headers)
+    assert response.status_code == 200
+    legs = response.json()
+    assert legs and all(leg["shpt_no"] == "SHPT-AGI-0001" for leg in legs)
+
+    response = client.get("/api/shipments/SHPT-AGI-0001/events", headers=headers)
+    assert response.status_code == 200
+    events = response.json()
+    assert events and all(event["shpt_no"] == "SHPT-AGI-0001" for event in events)
+
+    response = client.get("/api/locations/MOSB_ESNAAD/events?limit=1", headers=headers)
+    assert response.status_code == 200
+    events = response.json()
+    assert len(events) == 1 and events[0]["location_id"] == "MOSB_ESNAAD"
+
+    response = client.get("/api/shipments/SHPT-UNKNOWN/events", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_get_shipment_state():
+    token = get_token()
+    response = client.get(
+        "/api/shipments/state",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    states = response.json()
+    shipments = [s["shpt_no"] for s in states]
+    assert len(shipments) == len(set(shipments))
+    agi = next(s for s in states if s["shpt_no"] == "SHPT-AGI-0001")
+    assert {"event_id", "status", "location_id", "lat", "lon", "current_leg_id"} <= set(agi)
+
+    response = client.post(
+        "/api/events/demo",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    event_id = response.json()["event"]["event_id"]
+    response = client.get(
+        "/api/shipments/state",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    agi = next(s for s in response.json() if s["shpt_no"] == "SHPT-AGI-0001")
+    assert agi["event_id"] == event_id
+    assert agi["location_id"] == "MOSB_ESNAAD"
+
+
+def test_get_kpis_and_kpi_deltas_frame(monkeypatch):
+    import main
+
+    frames = []
+
+    async def fake_broadcast(msg):
+        frames.append(msg)
+
+    monkeypatch.setattr(main.hub, "broadcast", fake_broadcast)
+    token = get_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get("/api/kpis", headers=headers)
+    assert response.status_code == 200
+    before = response.json()
+    assert before["by"] == "all"
+    states = client.get("/api/shipments/state", headers=headers).json()
+    assert before["slices"][0]["total"] == len(states)
+
+    response = client.get("/api/kpis?by=vendor", headers=headers)
+    assert response.status_code == 200
+    assert sum(s["total"] for s in response.json()["slices"]) == len(states)
+    assert client.get("/api/kpis?by=colour", headers=headers).status_code == 422
+
+    client.post(
+        "/api/events/batch",
+        headers=headers,
+        json={
+            "events": [
+                {
+                    "shpt_no": f"SHPT-KPI-{uuid.uuid4().hex[:8]}",
+                    "status": "DELAYED",
+                    "location_id": "MOSB_ESNAAD",
+                    "lat": 24.3,
+                    "lon": 54.4,
+                }
+            ]
+        },
+    )
+    (entry,) = frames[-1]["kpi_deltas"]
+    assert entry["version"] > before["version"]
+    assert {"dimension": "all", "slice": "", "status": "DELAYED", "delta": 1} in entry["deltas"]
+    after = client.get("/api/kpis", headers=headers).json()
+    assert after["version"] == entry["version"]
+    delayed_before = before["slices"][0]["counts"].get("DELAYED", 0)
+    assert after["slices"][0]["counts"]["DELAYED"] == delayed_before + 1
+
+
 def test_post_demo_event():
     token = get_token()
     response = client.post(
@@ -85,3 +272,245 @@ def test_post_demo_event():
     assert data["event"]["shpt_no"] == "SHPT-AGI-0001"
     assert "event_id" in data["event"]
     assert "ts" in data["event"]
+
+
+def test_post_event_batch(monkeypatch):
+    import main
+
+    frames = []
+
+    async def fake_broadcast(msg):
+        frames.append(msg)
+
+    monkeypatch.setattr(main.hub, "broadcast", fake_broadcast)
+    token = get_token()
+    items = [
+        {
+            "shpt_no": "SHPT-BATCH-0001",
+            "status": "IN_TRANSIT",
+            "location_id": "MOSB_ESNAAD",
+            "lat": 24.328853,
+            "lon": 54.45857,
+            "remark": f"GPS ping {i}",
+        }
+        for i in range(250)
+    ]
+    response = client.post(
+        "/api/events/batch",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"events": items},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ok"] is True
+    assert data["count"] == 250
+    assert len(set(data["event_ids"])) == 250
+
+    assert len(frames) == 1
+    assert frames[0]["type"] == "events"
+    assert [e["event_id"] for e in frames[0]["events"]] == data["event_ids"]
+
+    response = client.get("/api/events", headers={"Authorization": f"Bearer {token}"})
+    stored = {e["event_id"] for e in response.json()}
+    assert set(data["event_ids"]) <= stored
+
+
+def test_post_event_batch_rejects_invalid_items():
+    token = get_token()
+    response = client.post(
+        "/api/events/batch",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "events": [
+                {
+                    "shpt_no": "SHPT-BATCH-0001",
+                    "status": "TELEPORTED",
+                    "location_id": "MOSB_ESNAAD",
+                    "lat": 24.3,
+                    "lon": 54.4,
+                }
+            ]
+        },
+    )
+    assert response.status_code == 422
+
+
+def test_post_event_batch_requires_ops_role():
+    token = get_token("finance_user", "finance123")
+    response = client.post(
+        "/api/events/batch",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"events": []},
+    )
+    assert response.status_code == 403
+
+
+def test_get_events_keyset_pagination():
+    token = get_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    full = client.get("/api/events", headers=headers).json()
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 7}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/events", headers=headers, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["events"]) <= 7
+        seen.extend(e["event_id"] for e in page["events"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [e["event_id"] for e in full]
+
+
+def test_get_events_invalid_cursor():
+    token = get_token()
+    response = client.get(
+        "/api/events?limit=5&cursor=not-a-cursor",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 400
+
+
+def test_get_events_limit_out_of_range():
+    token = get_token()
+    response = client.get(
+        "/api/events?limit=0",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 422
+
+
+def test_events_tail_loop_ingests_and_broadcasts(tmp_path, monkeypatch):
+    import asyncio
+
+    import main
+
+    frames = []
+
+    async def fake_broadcast(msg):
+        frames.append(msg)
+
+    monkeypatch.setattr(main.hub, "broadcast", fake_broadcast)
+    csv_path = tmp_path / "events.csv"
+    csv_path.write_text(
+        "event_id,ts,shpt_no,status,location_id,lat,lon,remark\n"
+        "EV-TAIL-0001,2026-01-08T09:00:00,SHPT-AGI-0001,ARRIVED,MOSB_ESNAAD,24.3,54.4,ext\n",
+        encoding="utf-8",
+    )
+
+    async def run():
+        task = asyncio.create_task(main.events_tail_loop(str(csv_path), interval=0.01))
+        for _ in range(300):
+            await asyncio.sleep(0.01)
+            if frames:
+                break
+        task.cancel()
+
+    asyncio.run(run())
+    assert frames and frames[0]["type"] == "events"
+    assert [e["event_id"] for e in frames[0]["events"]] == ["EV-TAIL-0001"]
+
+
+def test_admin_cache_stats_reports_namespaces():
+    ops_headers = {"Authorization": f"Bearer {get_token()}"}
+    assert client.get("/api/admin/cache/stats", headers=ops_headers).status_code == 403
+
+    import main
+
+    main.cache.invalidate("legs")
+    assert client.get("/api/legs", headers=ops_headers).status_code == 200
+    assert client.get("/api/legs", headers=ops_headers).status_code == 200
+
+    admin_headers = {"Authorization": f"Bearer {get_token('admin', 'admin123')}"}
+    response = client.get("/api/admin/cache/stats", headers=admin_headers)
+    assert response.status_code == 200
+    stats = response.json()["namespaces"]
+    assert set(stats) >= {
+        "locations",
+        "legs",
+        "shipments",
+        "events",
+        "location_status",
+        "location_metrics",
+    }
+    legs = stats["legs"]
+    assert legs["soft_ttl"] is not None and legs["policy"] == "lru"
+    assert legs["loads"] >= 1 and legs["hits"] >= 1 and legs["bytes"] > 0
+    assert 0.0 < legs["hit_ratio"] <= 1.0
+
+
+def test_commit_events_invalidates_events_once(monkeypatch):
+    import main
+    from models import Event
+
+    cleared = []
+    invalidate_local = main.cache._invalidate_local
+
+    def record(namespaces):
+        cleared.append(set(namespaces))
+        invalidate_local(namespaces)
+
+    monkeypatch.setattr(main.cache, "_invalidate_local", record)
+
+    def make_event() -> Event:
+        return Event(
+            event_id=f"EV-{uuid.uuid4().hex[:8]}",
+            ts="2026-01-01T00:00:00Z",
+            shpt_no="SHPT-AGI-0001",
+            status="IN_TRANSIT",
+            location_id="MOSB_ESNAAD",
+            lat=24.3,
+            lon=54.4,
+        )
+
+    # A committed append is invalidated by the table write listener alone.
+    main.commit_events([make_event()])
+    assert sum("events" in namespaces for namespaces in cleared) == 1
+
+    # A failed one only reaches the CSV, so commit_events invalidates itself.
+    def fail(events):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(main.db, "append_events", fail)
+    main.commit_events([make_event()])
+    assert sum("events" in namespaces for namespaces in cleared) == 2
+
+
+def test_event_loaders_do_not_keep_rows_from_before_a_racing_commit(monkeypatch):
+    import main
+    from models import Event
+
+    headers = {"Authorization": f"Bearer {get_token()}"}
+    main.cache.invalidate("location_metrics")
+    get_location_metrics = main.db.get_location_metrics
+
+    def racing(since=None):
+        metrics = get_location_metrics(since)
+        # A commit lands (and invalidates) while this load is still running.
+        main.commit_events(
+            [
+                Event(
+                    event_id=f"EV-{uuid.uuid4().hex[:8]}",
+                    ts="2026-01-01T00:00:00Z",
+                    shpt_no="SHPT-AGI-0001",
+                    status="IN_TRANSIT",
+                    location_id="MOSB_ESNAAD",
+                    lat=24.3,
+                    lon=54.4,
+                )
+            ]
+        )
+        return metrics
+
+    def total(response) -> int:
+        return sum(metric["event_count"] for metric in response.json())
+
+    monkeypatch.setattr(main.db, "get_location_metrics", racing)
+    before = total(client.get("/api/location-metrics", headers=headers))
+    monkeypatch.setattr(main.db, "get_location_metrics", get_location_metrics)
+    assert total(client.get("/api/location-metrics", headers=headers)) == before + 1
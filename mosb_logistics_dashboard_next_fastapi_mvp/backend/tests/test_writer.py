@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+
+from models import Event
+from writer import EventWriter
+
+
+def make_event(i: int) -> Event:
+    return Event(
+        event_id=f"EV-W-{i}",
+        ts="2026-01-08T09:00:00Z",
+        shpt_no="SHPT-001",
+        status="IN_TRANSIT",
+        location_id="LOC-001",
+        lat=24.0,
+        lon=54.0,
+    )
+
+
+def test_writer_groups_concurrent_submits():
+    batches = []
+    writer = EventWriter(batches.append, max_batch=40, max_delay=0.05)
+
+    async def run():
+        await asyncio.gather(*(writer.submit(make_event(i)) for i in range(100)))
+        await writer.close()
+
+    asyncio.run(run())
+    assert sum(len(batch) for batch in batches) == 100
+    assert len(batches) == 3
+    assert max(len(batch) for batch in batches) == 40
+
+
+def test_writer_flushes_after_window():
+    batches = []
+    writer = EventWriter(batches.append, max_batch=1000, max_delay=0.01)
+
+    async def run():
+        start = time.perf_counter()
+        await writer.submit(make_event(1))
+        elapsed = time.perf_counter() - start
+        await writer.close()
+        return elapsed
+
+    elapsed = asyncio.run(run())
+    assert batches == [[make_event(1)]]
+    assert elapsed < 1.0
+
+
+def test_writer_propagates_commit_failure_to_every_caller():
+    def failing_commit(events):
+        raise RuntimeError("disk full")
+
+    writer = EventWriter(failing_commit, max_batch=10, max_delay=0.05)
+
+    async def run():
+        results = await asyncio.gather(
+            *(writer.submit(make_event(i)) for i in range(5)),
+            return_exceptions=True,
+        )
+        await writer.close()
+        return results
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_writer_restarts_on_new_event_loop():
+    batches = []
+    writer = EventWriter(batches.append, max_batch=10, max_delay=0.001)
+    asyncio.run(writer.submit(make_event(1)))
+    asyncio.run(writer.submit(make_event(2)))
+    assert [len(batch) for batch in batches] == [1, 1]
+
+
+@pytest.mark.parametrize("max_batch", [0, -5])
+def test_writer_clamps_batch_size(max_batch):
+    assert EventWriter(lambda events: None, max_batch=max_batch).max_batch == 1
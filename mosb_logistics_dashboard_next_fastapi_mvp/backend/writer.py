@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from models import Event
+
+logger = logging.getLogger(__name__)
+
+
+class EventWriter:
+    """
+    KR: 이벤트 추가 요청을 짧은 시간 모아 한 번에 커밋하는 그룹 커밋 작성기입니다.
+    EN: Group-commit writer: collects event appends for up to `max_delay` seconds or
+    `max_batch` rows, commits them with one `commit(events)` call in a worker thread,
+    then resolves every caller's future with the outcome of that commit.
+
+    `run` executes the blocking commit off the loop; it defaults to `asyncio.to_thread`
+    and main.py passes `AsyncDatabase.run` so commits share the DB executor.
+    """
+
+    def __init__(
+        self,
+        commit: Callable[[List[Event]], None],
+        max_batch: int = 500,
+        max_delay: float = 0.005,
+        run: Optional[Callable[..., Awaitable[Any]]] = None,
+    ):
+        self.commit = commit
+        self.run = run or asyncio.to_thread
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max(0.0, max_delay)
+        self._queue: Optional[asyncio.Queue[Tuple[Event, asyncio.Future]]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        # The worker is bound to the loop that started it; restart on a new loop.
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def submit(self, event: Event) -> None:
+        """KR: 이벤트가 커밋될 때까지 기다립니다. EN: Wait until `event` is committed."""
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((event, future))
+        await future
+
+    async def _collect(self, queue: asyncio.Queue) -> List[Tuple[Event, asyncio.Future]]:
+        batch = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch = await self._collect(queue)
+            events = [event for event, _ in batch]
+            try:
+                await self.run(self.commit, events)
+            except Exception as exc:
+                logger.warning("Group commit of %d events failed: %s", len(events), exc)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            else:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+
+    async def close(self) -> None:
+        """KR: 작성기 작업을 중지합니다. EN: Stop the worker task."""
+        if (
+            self._task is not None
+            and not self._task.done()
+            and self._loop is asyncio.get_running_loop()
+        ):
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
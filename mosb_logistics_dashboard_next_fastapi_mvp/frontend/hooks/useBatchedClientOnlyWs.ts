@@ -79,6 +79,17 @@ export function useBatchedClientOnlyWs(opts: Options) {
               }
               return;
             }
+            // Bulk snapshots arrive as one { type: "location_statuses", statuses: [...] } frame
+            if (data?.type === "location_statuses" && Array.isArray(data.statuses)) {
+              if (onLocationStatusRef.current) {
+                for (const status of data.statuses as LocationStatus[]) {
+                  if (status?.location_id && typeof status.occupancy_rate === "number") {
+                    onLocationStatusRef.current(status);
+                  }
+                }
+              }
+              return;
+            }
           } catch {
             // Fall through to parseWsMessage for other message types
           }
@@ -116,6 +116,14 @@ export function useWebSocket(
               }
               return;
             }
+            if (data?.type === "location_statuses" && Array.isArray(data.statuses)) {
+              if (onLocationStatusRef.current) {
+                for (const status of data.statuses as LocationStatus[]) {
+                  onLocationStatusRef.current(status);
+                }
+              }
+              return;
+            }
           } catch {
             // Ignore parse errors to avoid crashing the UI.
           }
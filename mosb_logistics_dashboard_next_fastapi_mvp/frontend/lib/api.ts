@@ -1,4 +1,4 @@
-import type { Location, Shipment, Leg, Event, LocationStatus } from "../types/logistics";
+import type { Location, Shipment, ShipmentState, KpiDimension, KpiSnapshot, Leg, Event, EventPage, LocationStatus } from "../types/logistics";
 import { AuthService } from "./auth";
 
 const API_BASE = process.env.NEXT_PUBLIC_API_BASE || "http://localhost:8000";
@@ -40,6 +40,34 @@ export class LogisticsAPI {
     return res.json();
   }
 
+  static async getShipmentState(): Promise<ShipmentState[]> {
+    const res = await fetch(`${API_BASE}/api/shipments/state`, {
+      headers: getAuthHeaders(),
+    });
+    if (!res.ok) {
+      if (res.status === 401) {
+        AuthService.logout();
+        throw new Error("Authentication required");
+      }
+      throw new Error(`Failed to fetch shipment state: ${res.statusText}`);
+    }
+    return res.json();
+  }
+
+  static async getKpis(by: KpiDimension = "all"): Promise<KpiSnapshot> {
+    const res = await fetch(`${API_BASE}/api/kpis?by=${by}`, {
+      headers: getAuthHeaders(),
+    });
+    if (!res.ok) {
+      if (res.status === 401) {
+        AuthService.logout();
+        throw new Error("Authentication required");
+      }
+      throw new Error(`Failed to fetch KPIs: ${res.statusText}`);
+    }
+    return res.json();
+  }
+
   static async getLegs(): Promise<Leg[]> {
     const res = await fetch(`${API_BASE}/api/legs`, {
       headers: getAuthHeaders(),
@@ -71,6 +99,23 @@ export class LogisticsAPI {
     return res.json();
   }
 
+  static async getEventsPage(limit: number, cursor?: string | null, since?: string): Promise<EventPage> {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (cursor) params.set("cursor", cursor);
+    if (since) params.set("since", since);
+    const res = await fetch(`${API_BASE}/api/events?${params.toString()}`, {
+      headers: getAuthHeaders(),
+    });
+    if (!res.ok) {
+      if (res.status === 401) {
+        AuthService.logout();
+        throw new Error("Authentication required");
+      }
+      throw new Error(`Failed to fetch events page: ${res.statusText}`);
+    }
+    return res.json();
+  }
+
   static async getLocationStatus(): Promise<LocationStatus[]> {
     const res = await fetch(`${API_BASE}/api/location-status`, {
       headers: getAuthHeaders(),
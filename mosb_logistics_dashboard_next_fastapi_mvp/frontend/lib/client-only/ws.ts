@@ -44,8 +44,14 @@ export function parseWsMessage(raw: string): WsParsed {
     return { kind: msg.type };
   }
 
-  const events = asArray<LiveEvent>(msg?.events);
-  if (events) return { kind: "events", events };
+  const events = asArray<any>(msg?.events);
+  if (events) {
+    // Backend batch frames ({ type: "events", events: Event[] }) carry raw events.
+    const liveEvents = events
+      .map((e) => (e?.event_id ? convertEventToLiveEvent(e) : (e as LiveEvent)))
+      .filter((e): e is LiveEvent => e !== null);
+    return { kind: "events", events: liveEvents };
+  }
 
   const shipments = asArray<ClientShipment>(msg?.shipments);
   if (shipments) return { kind: "shipments", shipments };
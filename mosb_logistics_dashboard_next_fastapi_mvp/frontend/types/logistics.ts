@@ -40,6 +40,48 @@ export interface Event {
   remark: string;
 }
 
+export interface EventPage {
+  events: Event[];
+  /** Opaque keyset cursor for the next page; null on the last page. */
+  next_cursor: string | null;
+}
+
+/** Latest event, current leg and last location of one shipment (GET /api/shipments/state). */
+export interface ShipmentState {
+  shpt_no: string;
+  event_id: string;
+  ts: string;
+  status: ShipmentStatus;
+  location_id: string;
+  lat: number;
+  lon: number;
+  remark: string;
+  current_leg_id: string | null;
+}
+
+export type KpiDimension = "all" | "vendor" | "priority" | "mode";
+
+/** Shipment counts by latest status for one vendor / priority / leg mode ("" for all). */
+export interface KpiSlice {
+  slice: string;
+  counts: Partial<Record<ShipmentStatus, number>>;
+  total: number;
+}
+
+/** GET /api/kpis; `version` matches the `kpi_deltas` entries pushed on event frames. */
+export interface KpiSnapshot {
+  version: number;
+  by: KpiDimension;
+  slices: KpiSlice[];
+}
+
+export interface KpiDelta {
+  dimension: KpiDimension;
+  slice: string;
+  status: ShipmentStatus;
+  delta: number;
+}
+
 export interface LocationStatus {
   /**
    * The ID of the location that this status applies to.